@@ -1,7 +1,13 @@
 """Execution agent assets."""
 
 from .agent import ExecutionAgent
-from .batch_manager import ExecutionBatchManager, ExecutionResult, PendingExecution
+from .batch_manager import (
+    ExecutionBatchManager,
+    ExecutionResult,
+    PendingExecution,
+    get_execution_batch_manager,
+)
+from .pool import ExecutionPool, ExecutionRejected
 from .runtime import ExecutionAgentRuntime
 from .tools import get_tool_schemas as get_execution_tool_schemas, get_tool_registry as get_execution_tool_registry
 
@@ -9,8 +15,11 @@ __all__ = [
     "ExecutionBatchManager",
     "ExecutionAgent",
     "ExecutionAgentRuntime",
+    "ExecutionPool",
+    "ExecutionRejected",
     "ExecutionResult",
     "PendingExecution",
+    "get_execution_batch_manager",
     "get_execution_tool_schemas",
     "get_execution_tool_registry",
 ]
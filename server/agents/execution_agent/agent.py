@@ -3,6 +3,9 @@
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+from ...config import get_settings
+from ...llm.budget import fit_history
+from ...llm.tokens import estimate_tokens
 from ...services.execution import get_execution_agent_logs
 from ...logging_config import logger
 
@@ -59,55 +62,56 @@ class ExecutionAgent:
             agent_purpose=agent_purpose
         )
 
-    # Combine base system prompt with conversation history, applying conversation limits
-    def build_system_prompt_with_history(self) -> str:
+    # Load the agent's history transcript, applying conversation limits
+    def build_history_transcript(self) -> str:
         """
-        Build system prompt including agent history.
+        Load this agent's execution history.
+
+        With execution-log summarization on, the agent's rolling summary
+        replaces the requests it covers, and once it covers any the rest is
+        limited to the ``conversation_limit`` most recent requests. Without a
+        summary nothing would stand in for dropped requests, so the whole log
+        is loaded.
 
         Returns:
-            System prompt with embedded history transcript
+            Transcript of the agent's history
         """
-        base_prompt = self.build_system_prompt()
-
-        # Load history transcript
-        transcript = self._log_store.load_transcript(self.name)
+        if get_settings().execution_summary_threshold > 0:
+            return self._log_store.load_history(self.name, max_requests=self.conversation_limit)
+        return self._log_store.load_transcript(self.name)
 
-        if transcript:
-            # Apply conversation limit if needed
-            if self.conversation_limit and self.conversation_limit > 0:
-                # Parse entries and limit them
-                lines = transcript.split('\n')
-                request_count = sum(1 for line in lines if '<agent_request' in line)
-
-                if request_count > self.conversation_limit:
-                    # Find where to cut
-                    kept_requests = 0
-                    cutoff_index = len(lines)
-                    for i in range(len(lines) - 1, -1, -1):
-                        if '<agent_request' in lines[i]:
-                            kept_requests += 1
-                            if kept_requests == self.conversation_limit:
-                                cutoff_index = i
-                                break
-                    transcript = '\n'.join(lines[cutoff_index:])
-
-            return f"{base_prompt}\n\n# Execution History\n\n{transcript}"
-
-        return base_prompt
-
-    # Format current instruction as user message for LLM consumption
-    def build_messages_for_llm(self, current_instruction: str) -> List[Dict[str, str]]:
+    # Format history and current instruction as the user message for LLM consumption
+    def build_messages_for_llm(
+        self,
+        current_instruction: str,
+        token_budget: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
         """
         Build message array for LLM call.
 
+        History travels in the first user message rather than the system
+        prompt so the system prompt stays static and cacheable.
+
         Args:
             current_instruction: Current instruction from interaction agent
+            token_budget: Optional token budget for the message; history is trimmed to fit
 
         Returns:
             List of messages in OpenRouter format
         """
+        transcript = self.build_history_transcript()
+        if token_budget is not None:
+            history_budget = token_budget - estimate_tokens(current_instruction)
+            transcript = fit_history(transcript, history_budget, source=f"execution_agent:{self.name}")
+        if transcript:
+            content = (
+                f"# Execution History\n\n{transcript}\n\n"
+                f"# Current Instruction\n\n{current_instruction}"
+            )
+        else:
+            content = current_instruction
         return [
-            {"role": "user", "content": current_instruction}
+            {"role": "user", "content": content}
         ]
 
     # Log the agent's final response to the execution log store
@@ -118,6 +122,6 @@ class ExecutionAgent:
     # Log tool invocation and results with truncated content for readability
     def record_tool_execution(self, tool_name: str, arguments: str, result: str) -> None:
         """Record tool execution details."""
-        self._log_store.record_action(self.name, f"Calling {tool_name} with: {arguments[:200]}")
-        # Record the tool response
-        self._log_store.record_tool_response(self.name, tool_name, result[:500])
+        self._log_store.record_tool_execution(
+            self.name, tool_name, f"Calling {tool_name} with: {arguments[:200]}", result[:500]
+        )
@@ -6,10 +6,23 @@ import asyncio
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
+from .pool import ExecutionPool, ExecutionRejected
 from .runtime import ExecutionAgentRuntime, ExecutionResult
+from ...config import get_settings
+from ...llm import Priority, deadline_scope
 from ...logging_config import logger
+from ...services.execution.queue_store import (
+    COMPLETED,
+    QUEUED,
+    ExecutionJob,
+    ExecutionQueueStore,
+    get_execution_queue,
+)
+
+# Extra time past the deadline before a run that ignored it is cancelled outright
+_HARD_STOP_GRACE_SECONDS = 5
 
 
 @dataclass
@@ -20,6 +33,7 @@ class PendingExecution:
     agent_name: str
     instructions: str
     batch_id: str
+    priority: Priority = Priority.EXECUTION
     created_at: datetime = field(default_factory=datetime.now)
 
 
@@ -30,18 +44,74 @@ class _BatchState:
     batch_id: str
     created_at: datetime = field(default_factory=datetime.now)
     pending: int = 0
+    # Results not yet delivered to the interaction agent, with their request ids
     results: List[ExecutionResult] = field(default_factory=list)
+    request_ids: List[str] = field(default_factory=list)
+    flush_task: Optional["asyncio.Task[None]"] = None
 
 
 class ExecutionBatchManager:
-    """Run execution agents and deliver their combined outcome."""
+    """Run execution agents and deliver their combined outcome.
+
+    Executions are grouped by ``batch_key`` (the originating interaction turn,
+    or one key per trigger fire), so unrelated work never shares a batch. By
+    default a batch is delivered once all of its executions finish; with
+    ``stream_results`` each result is delivered as it completes, coalescing
+    results that land within ``coalesce_seconds`` of each other.
+
+    Runs go through a bounded :class:`ExecutionPool`; under overload trigger
+    work is shed first and is handed back to the caller as
+    :class:`ExecutionRejected` so it can be retried later.
+
+    With a durable ``queue`` every request and result is persisted. Running
+    jobs hold a lease renewed by a heartbeat; :meth:`start` resumes jobs a
+    previous process left queued or whose lease lapsed and re-sends results
+    that were never delivered.
+
+    :meth:`cancel` stops queued or running executions by request id, agent
+    name or batch; a cancelled run reports what it finished as a failed
+    result.
+    """
 
     # Initialize batch manager with timeout and coordination state for execution agents
-    def __init__(self, timeout_seconds: int = 90) -> None:
+    def __init__(
+        self,
+        timeout_seconds: Optional[int] = None,
+        stream_results: Optional[bool] = None,
+        coalesce_seconds: Optional[float] = None,
+        pool: Optional[ExecutionPool] = None,
+        queue: Optional[ExecutionQueueStore] = None,
+    ) -> None:
+        settings = get_settings()
+        if timeout_seconds is None:
+            timeout_seconds = settings.execution_timeout_seconds
+        if stream_results is None:
+            stream_results = settings.execution_result_streaming
+        if coalesce_seconds is None:
+            coalesce_seconds = settings.execution_result_coalesce_seconds
+        if queue is None and settings.execution_queue_durable:
+            queue = get_execution_queue()
         self.timeout_seconds = timeout_seconds
+        self.stream_results = stream_results
+        self.coalesce_seconds = max(coalesce_seconds, 0.0)
+        self.lease_seconds = max(settings.execution_queue_lease_seconds, 1)
+        self.max_attempts = max(settings.execution_queue_max_attempts, 1)
         self._pending: Dict[str, PendingExecution] = {}
         self._batch_lock = asyncio.Lock()
-        self._batch_state: Optional[_BatchState] = None
+        self._batches: Dict[str, _BatchState] = {}
+        self._pool = pool or ExecutionPool(
+            max_concurrency=settings.execution_max_concurrency,
+            queue_limit=settings.execution_queue_limit,
+        )
+        self._queue = queue
+        self._worker_id = uuid.uuid4().hex
+        # Jobs this process holds a lease on, and results it is still delivering
+        self._claimed: Set[str] = set()
+        self._local_results: Set[str] = set()
+        self._heartbeat_task: Optional["asyncio.Task[None]"] = None
+        # Task driving each pending execution, and why a cancelled one was stopped
+        self._tasks: Dict[str, "asyncio.Task[Any]"] = {}
+        self._cancel_reasons: Dict[str, str] = {}
 
     # Run execution agent with timeout handling and batch coordination for interaction agent
     async def execute_agent(
@@ -49,23 +119,98 @@ class ExecutionBatchManager:
         agent_name: str,
         instructions: str,
         request_id: Optional[str] = None,
+        priority: Priority = Priority.EXECUTION,
+        batch_key: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> ExecutionResult:
-        """Execute an agent asynchronously and buffer the result for batch dispatch."""
+        """Execute an agent asynchronously and buffer the result for batch dispatch.
+
+        Executions sharing ``batch_key`` are delivered together; without one the
+        execution is its own batch. Trigger-priority work the pool rejects or
+        sheds is withdrawn from its batch and re-raised as
+        :class:`ExecutionRejected`; other rejections are reported as a failed
+        result.
+
+        A repeated ``idempotency_key`` returns the stored result when the first
+        run finished, adopts the job when it was left queued, and otherwise
+        does not start a second run.
+        """
 
         if not request_id:
             request_id = str(uuid.uuid4())
+        batch_id = batch_key or str(uuid.uuid4())
 
-        batch_id = await self._register_pending_execution(agent_name, instructions, request_id)
-
-        try:
-            logger.info(f"[{agent_name}] Execution started")
-            runtime = ExecutionAgentRuntime(agent_name=agent_name)
-            result = await asyncio.wait_for(
-                runtime.execute(instructions),
-                timeout=self.timeout_seconds,
+        if self._queue is not None:
+            job, created = await asyncio.to_thread(
+                self._queue.enqueue,
+                agent_name=agent_name,
+                instructions=instructions,
+                batch_id=batch_id,
+                priority=priority,
+                request_id=request_id,
+                idempotency_key=idempotency_key,
             )
+            if not created:
+                if job.finished:
+                    logger.info(f"[{agent_name}] Returning stored result for repeated request")
+                    return self._job_result(job)
+                if job.status != QUEUED or job.request_id in self._pending:
+                    logger.info(f"[{agent_name}] Identical execution already in progress")
+                    duplicate = ExecutionRejected("An identical execution is already in progress")
+                    if priority >= Priority.TRIGGER:
+                        raise duplicate
+                    return ExecutionResult(
+                        agent_name=agent_name,
+                        success=False,
+                        response=f"Not started: {duplicate}",
+                        error="Duplicate",
+                    )
+                # Left queued by a restart or a deferral: run it under its original id and batch
+                request_id, batch_id = job.request_id, job.batch_id
+
+        self._register_pending_execution(agent_name, instructions, request_id, batch_id, priority)
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks[request_id] = task
+
+        rejection: Optional[ExecutionRejected] = None
+        runtime: Optional[ExecutionAgentRuntime] = None
+        try:
+            async with self._pool.slot(request_id, agent_name, priority) as waited:
+                await self._claim(request_id)
+                logger.info(f"[{agent_name}] Execution started", extra={"queue_wait": round(waited, 3)})
+                runtime = ExecutionAgentRuntime(agent_name=agent_name, priority=priority)
+                # LLM and tool calls inside the run shrink their timeouts to this deadline
+                with deadline_scope(self.timeout_seconds):
+                    result = await asyncio.wait_for(
+                        runtime.execute(instructions),
+                        timeout=self.timeout_seconds + _HARD_STOP_GRACE_SECONDS,
+                    )
             status = "SUCCESS" if result.success else "FAILED"
             logger.info(f"[{agent_name}] Execution finished: {status}")
+        except ExecutionRejected as exc:
+            logger.warning(f"[{agent_name}] Execution not started: {exc}")
+            rejection = exc
+            result = ExecutionResult(
+                agent_name=agent_name,
+                success=False,
+                response=f"Not started: {exc}. The system is busy; try again shortly.",
+                error="Rejected",
+            )
+        except asyncio.CancelledError:
+            reason = self._cancel_reasons.pop(request_id, None)
+            if reason is None or task is None:
+                raise
+            # Our own cancel: absorb it so the caller gets a result instead
+            task.uncancel()
+            progress = runtime.partial_response if runtime and runtime.partial_response else None
+            logger.info(f"[{agent_name}] Execution cancelled: {reason}")
+            result = ExecutionResult(
+                agent_name=agent_name,
+                success=False,
+                response=f"Cancelled ({reason}). {progress or 'Stopped before it started.'}",
+                error="Cancelled",
+            )
         except asyncio.TimeoutError:
             logger.error(f"[{agent_name}] Execution timed out after {self.timeout_seconds}s")
             result = ExecutionResult(
@@ -84,35 +229,125 @@ class ExecutionBatchManager:
             )
         finally:
             self._pending.pop(request_id, None)
-
-        await self._complete_execution(batch_id, result, agent_name)
+            self._claimed.discard(request_id)
+            self._tasks.pop(request_id, None)
+            self._cancel_reasons.pop(request_id, None)
+
+        if rejection is not None and priority >= Priority.TRIGGER:
+            # The job stays queued so the next fire of the trigger adopts it
+            await self._withdraw_execution(batch_id)
+            raise rejection
+
+        if self._queue is not None:
+            await asyncio.to_thread(
+                self._queue.complete, request_id, self._worker_id, result.success, result.response, result.error
+            )
+            self._local_results.add(request_id)
+        await self._complete_execution(batch_id, result, agent_name, request_id)
         return result
 
-    # Add execution request to current batch or create new batch if none exists
-    async def _register_pending_execution(
+    # Stop queued or running executions matching every given filter
+    def cancel(
+        self,
+        *,
+        request_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        reason: str = "cancelled by request",
+    ) -> List[Dict[str, str]]:
+        """Cancel pending executions by request id, agent name and/or batch.
+
+        Returns the executions a cancellation was sent to. Each one still
+        completes through its batch with a failed ``Cancelled`` result that
+        describes the work done before it stopped.
+        """
+
+        if request_id is None and agent_name is None and batch_id is None:
+            raise ValueError("Specify a request_id, agent_name or batch_id to cancel")
+
+        cancelled: List[Dict[str, str]] = []
+        for pending in list(self._pending.values()):
+            if request_id is not None and pending.request_id != request_id:
+                continue
+            if agent_name is not None and pending.agent_name.casefold() != agent_name.casefold():
+                continue
+            if batch_id is not None and pending.batch_id != batch_id:
+                continue
+            task = self._tasks.get(pending.request_id)
+            if task is None or task.done() or pending.request_id in self._cancel_reasons:
+                continue
+            self._cancel_reasons[pending.request_id] = reason
+            task.cancel()
+            cancelled.append(
+                {
+                    "request_id": pending.request_id,
+                    "agent_name": pending.agent_name,
+                    "batch_id": pending.batch_id,
+                }
+            )
+
+        if cancelled:
+            logger.info(
+                "Cancelling executions",
+                extra={"count": len(cancelled), "reason": reason},
+            )
+        return cancelled
+
+    # Whether a new execution of this priority would currently be accepted
+    def can_accept(self, priority: Priority = Priority.EXECUTION) -> bool:
+        """Cheap admission check for callers that can defer or refuse work up front."""
+
+        return self._pool.can_admit(priority)
+
+    # Take the durable lease on a job before it runs
+    async def _claim(self, request_id: str) -> None:
+        if self._queue is None:
+            return
+        if not await asyncio.to_thread(self._queue.claim, request_id, self._worker_id, self.lease_seconds):
+            raise ExecutionRejected("Execution was already claimed by another worker")
+        self._claimed.add(request_id)
+
+    # Rebuild an execution result from a finished durable job
+    @staticmethod
+    def _job_result(job: ExecutionJob) -> ExecutionResult:
+        return ExecutionResult(
+            agent_name=job.agent_name,
+            success=bool(job.success),
+            response=job.response or "",
+            error=job.error,
+        )
+
+    # Add execution request to its turn's batch, opening the batch when required
+    def _register_pending_execution(
         self,
         agent_name: str,
         instructions: str,
         request_id: str,
+        batch_id: str,
+        priority: Priority = Priority.EXECUTION,
     ) -> str:
-        """Attach a new execution to the active batch, opening one when required."""
+        """Attach a new execution to the batch ``batch_id``, opening one when required.
 
-        async with self._batch_lock:
-            if self._batch_state is None:
-                batch_id = str(uuid.uuid4())
-                self._batch_state = _BatchState(batch_id=batch_id)
-            else:
-                batch_id = self._batch_state.batch_id
-
-            self._batch_state.pending += 1
-            self._pending[request_id] = PendingExecution(
-                request_id=request_id,
-                agent_name=agent_name,
-                instructions=instructions,
-                batch_id=batch_id,
-            )
+        Synchronous so the request is visible in ``_pending`` before the caller
+        yields; the locked sections never await, so this cannot interleave
+        with them.
+        """
+
+        state = self._batches.get(batch_id)
+        if state is None:
+            state = _BatchState(batch_id=batch_id)
+            self._batches[batch_id] = state
 
-            return batch_id
+        state.pending += 1
+        self._pending[request_id] = PendingExecution(
+            request_id=request_id,
+            agent_name=agent_name,
+            instructions=instructions,
+            batch_id=batch_id,
+            priority=priority,
+        )
+
+        return batch_id
 
     # Store execution result and send combined batch to interaction agent when complete
     async def _complete_execution(
@@ -120,54 +355,187 @@ class ExecutionBatchManager:
         batch_id: str,
         result: ExecutionResult,
         agent_name: str,
+        request_id: str,
     ) -> None:
-        """Record the execution result and dispatch when the batch drains."""
+        """Record the execution result and dispatch when the batch drains (or the window closes)."""
 
-        dispatch_payload: Optional[str] = None
+        dispatch: Optional[Tuple[str, List[str]]] = None
 
         async with self._batch_lock:
-            state = self._batch_state
-            if state is None or state.batch_id != batch_id:
+            state = self._batches.get(batch_id)
+            if state is None:
                 logger.warning(f"[{agent_name}] Dropping result for unknown batch")
                 return
 
             state.results.append(result)
+            state.request_ids.append(request_id)
             state.pending -= 1
 
             if state.pending == 0:
-                dispatch_payload = self._format_batch_payload(state.results)
-                agent_names = [entry.agent_name for entry in state.results]
-                logger.info(f"Execution batch completed: {', '.join(agent_names)}")
-                self._batch_state = None
+                if state.flush_task is not None:
+                    state.flush_task.cancel()
+                dispatch = self._take_payload(state)
+                logger.info(f"Execution batch completed: {batch_id}")
+                del self._batches[batch_id]
+            elif self.stream_results and state.flush_task is None:
+                state.flush_task = asyncio.create_task(self._flush_after_window(batch_id))
+
+        if dispatch:
+            await self._dispatch_to_interaction_agent(*dispatch)
+
+    # Drop an execution that never ran from its batch without reporting it
+    async def _withdraw_execution(self, batch_id: str) -> None:
+        dispatch: Optional[Tuple[str, List[str]]] = None
+
+        async with self._batch_lock:
+            state = self._batches.get(batch_id)
+            if state is None:
+                return
+            state.pending -= 1
+            if state.pending == 0:
+                if state.flush_task is not None:
+                    state.flush_task.cancel()
+                if state.results:
+                    dispatch = self._take_payload(state)
+                del self._batches[batch_id]
+
+        if dispatch:
+            await self._dispatch_to_interaction_agent(*dispatch)
 
-        if dispatch_payload:
-            await self._dispatch_to_interaction_agent(dispatch_payload)
+    # Deliver results gathered during the coalescing window while other agents keep running
+    async def _flush_after_window(self, batch_id: str) -> None:
+        """Dispatch a partial batch once the coalescing window closes."""
+
+        await asyncio.sleep(self.coalesce_seconds)
+        async with self._batch_lock:
+            state = self._batches.get(batch_id)
+            if state is None or not state.results:
+                return
+            state.flush_task = None
+            still_running = [
+                pending.agent_name for pending in self._pending.values() if pending.batch_id == batch_id
+            ]
+            dispatch = self._take_payload(state, still_running)
+            logger.info(f"Execution batch partial results delivered: {batch_id}")
+
+        await self._dispatch_to_interaction_agent(*dispatch)
+
+    # Render and clear a batch's undelivered results
+    def _take_payload(self, state: _BatchState, still_running: Sequence[str] = ()) -> Tuple[str, List[str]]:
+        payload = self._format_batch_payload(state.results, still_running)
+        request_ids = state.request_ids
+        state.results = []
+        state.request_ids = []
+        return payload, request_ids
 
     # Return list of currently pending execution requests for monitoring purposes
-    def get_pending_executions(self) -> List[Dict[str, str]]:
-        """Expose pending executions for observability."""
+    def get_pending_executions(self) -> List[Dict[str, Any]]:
+        """Expose pending executions, queued or running, for observability."""
 
+        queued = self._pool.queued_request_ids()
         return [
             {
                 "request_id": pending.request_id,
                 "agent_name": pending.agent_name,
                 "batch_id": pending.batch_id,
+                "priority": pending.priority.name.lower(),
+                "state": "queued" if pending.request_id in queued else "running",
+                "queue_wait_seconds": round(queued.get(pending.request_id, 0.0), 3),
                 "created_at": pending.created_at.isoformat(),
                 "elapsed_seconds": (datetime.now() - pending.created_at).total_seconds(),
             }
             for pending in self._pending.values()
         ]
 
+    # Return worker pool usage, queue depth and wait-time counters
+    def get_pool_metrics(self) -> Dict[str, object]:
+        """Expose worker pool metrics for observability."""
+
+        return self._pool.metrics()
+
+    # Recover durable work left by a previous process and start renewing leases
+    async def start(self) -> None:
+        """Resume queued jobs, re-send undelivered results and start the lease heartbeat."""
+
+        if self._queue is None or self._heartbeat_task is not None:
+            return
+        await asyncio.to_thread(self._queue.prune)
+        await asyncio.to_thread(self._queue.release_expired, self.max_attempts)
+        await self._redeliver_completed()
+        await self._resume_queued()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(), name="execution-heartbeat")
+
+    # Renew leases on running jobs and reclaim jobs whose owner stopped heartbeating
+    async def _heartbeat_loop(self) -> None:
+        interval = max(self.lease_seconds / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(
+                    self._queue.heartbeat, self._worker_id, list(self._claimed), self.lease_seconds
+                )
+                requeued, abandoned = await asyncio.to_thread(self._queue.release_expired, self.max_attempts)
+                if abandoned:
+                    await self._redeliver_completed()
+                if requeued:
+                    await self._resume_queued()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.error("Execution heartbeat failed", extra={"error": str(exc)})
+
+    # Start queued non-trigger jobs nobody in this process is running (triggers re-fire themselves)
+    async def _resume_queued(self) -> None:
+        for job in await asyncio.to_thread(self._queue.list_by_status, QUEUED):
+            if job.request_id in self._pending or job.priority >= Priority.TRIGGER:
+                continue
+            logger.info(f"[{job.agent_name}] Resuming queued execution", extra={"request_id": job.request_id})
+            asyncio.create_task(
+                self.execute_agent(
+                    job.agent_name,
+                    job.instructions,
+                    request_id=job.request_id,
+                    priority=Priority(job.priority),
+                    batch_key=job.batch_id,
+                    idempotency_key=job.idempotency_key,
+                )
+            )
+
+    # Send finished results that never reached the interaction agent, one message per batch
+    async def _redeliver_completed(self) -> None:
+        batches: Dict[str, List[ExecutionJob]] = {}
+        for job in await asyncio.to_thread(self._queue.list_by_status, COMPLETED):
+            if job.request_id in self._local_results:
+                continue
+            batches.setdefault(job.batch_id, []).append(job)
+        for batch_id, jobs in batches.items():
+            logger.info("Re-sending undelivered execution results", extra={"batch_id": batch_id, "jobs": len(jobs)})
+            payload = self._format_batch_payload([self._job_result(job) for job in jobs])
+            await self._dispatch_to_interaction_agent(payload, [job.request_id for job in jobs])
+
     # Clean up all pending executions and batch state on shutdown
     async def shutdown(self) -> None:
-        """Clear pending bookkeeping (no background work remains)."""
+        """Stop the heartbeat and clear in-memory bookkeeping.
 
+        Durable jobs still running keep their rows; their leases lapse and the
+        next process resumes them.
+        """
+
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
         self._pending.clear()
+        self._claimed.clear()
         async with self._batch_lock:
-            self._batch_state = None
+            for state in self._batches.values():
+                if state.flush_task is not None:
+                    state.flush_task.cancel()
+            self._batches.clear()
 
     # Format multiple execution results into single message for interaction agent
-    def _format_batch_payload(self, results: List[ExecutionResult]) -> str:
+    def _format_batch_payload(
+        self,
+        results: List[ExecutionResult],
+        still_running: Sequence[str] = (),
+    ) -> str:
         """Render execution results into the interaction-agent format."""
 
         entries: List[str] = []
@@ -175,19 +543,45 @@ class ExecutionBatchManager:
             status = "SUCCESS" if result.success else "FAILED"
             response_text = (result.response or "(no response provided)").strip()
             entries.append(f"[{status}] {result.agent_name}: {response_text}")
+        if still_running:
+            names = ", ".join(dict.fromkeys(still_running))
+            entries.append(f"[PENDING] Still working: {names}. Their results will follow.")
         return "\n".join(entries)
 
     # Forward combined execution results to interaction agent for user response generation
-    async def _dispatch_to_interaction_agent(self, payload: str) -> None:
+    async def _dispatch_to_interaction_agent(self, payload: str, request_ids: Sequence[str] = ()) -> None:
         """Send the aggregated execution summary to the interaction agent."""
 
-        from ..interaction_agent.runtime import InteractionAgentRuntime
-
-        runtime = InteractionAgentRuntime()
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
-            asyncio.run(runtime.handle_agent_message(payload))
+            asyncio.run(self._deliver(payload, request_ids))
             return
 
-        loop.create_task(runtime.handle_agent_message(payload))
+        loop.create_task(self._deliver(payload, request_ids))
+
+    # Hand results to the interaction agent and mark them delivered once it has processed them
+    async def _deliver(self, payload: str, request_ids: Sequence[str]) -> None:
+        from ..interaction_agent.runtime import InteractionAgentRuntime
+
+        try:
+            result = await InteractionAgentRuntime().handle_agent_message(payload)
+            if result.success and self._queue is not None:
+                await asyncio.to_thread(self._queue.mark_delivered, request_ids)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.error("Failed to deliver execution results", extra={"error": str(exc)})
+        finally:
+            self._local_results.difference_update(request_ids)
+
+
+_execution_batch_manager: Optional[ExecutionBatchManager] = None
+
+
+# Return the process-wide batch manager shared by the interaction agent and triggers
+def get_execution_batch_manager() -> ExecutionBatchManager:
+    """Return the shared execution batch manager, creating it on first use."""
+
+    global _execution_batch_manager
+    if _execution_batch_manager is None:
+        _execution_batch_manager = ExecutionBatchManager()
+    return _execution_batch_manager
@@ -0,0 +1,181 @@
+"""Bounded, priority-ordered worker pool for execution agent runs."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from ...llm import Priority
+from ...logging_config import logger
+
+
+class ExecutionRejected(RuntimeError):
+    """Raised when the pool refuses a new execution or sheds a queued one."""
+
+    def __init__(self, message: str, *, shed: bool = False) -> None:
+        super().__init__(message)
+        self.shed = shed
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    request_id: str = field(compare=False)
+    agent_name: str = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class ExecutionPool:
+    """Run at most ``max_concurrency`` executions; queue up to ``queue_limit`` more.
+
+    Waiting executions are started in priority order (FIFO within a class).
+    When the queue is full, a new execution displaces the newest queued one
+    of a strictly lower priority (so trigger work is shed first); if there
+    is none, the new execution is rejected. A non-positive
+    ``max_concurrency`` disables the limit.
+    """
+
+    def __init__(self, max_concurrency: int, queue_limit: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.queue_limit = max(queue_limit, 0)
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._started = 0
+        self._rejected = 0
+        self._shed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _live_waiters(self) -> List[_Waiter]:
+        return [waiter for waiter in self._waiters if not waiter.future.done()]
+
+    def _has_free_worker(self) -> bool:
+        return self.max_concurrency <= 0 or self._running < self.max_concurrency
+
+    # Lowest-priority, most recently queued waiter: the first to go under overload
+    def _shed_candidate(self, priority: Priority) -> Optional[_Waiter]:
+        live = self._live_waiters()
+        if not live:
+            return None
+        worst = max(live, key=lambda waiter: (waiter.priority, waiter.sequence))
+        return worst if worst.priority > priority else None
+
+    def can_admit(self, priority: Priority) -> bool:
+        """Whether an execution of ``priority`` would be started or queued right now."""
+
+        live = self._live_waiters()
+        if self._has_free_worker() and not live:
+            return True
+        if len(live) < self.queue_limit:
+            return True
+        return self._shed_candidate(priority) is not None
+
+    @asynccontextmanager
+    async def slot(self, request_id: str, agent_name: str, priority: Priority) -> AsyncIterator[float]:
+        """Hold a worker for the duration of one execution; yields the queue wait in seconds."""
+
+        if not self.can_admit(priority):
+            self._rejected += 1
+            logger.warning(
+                "Execution rejected: pool saturated",
+                extra={"agent": agent_name, "priority": priority.name, "queued": len(self._live_waiters())},
+            )
+            raise ExecutionRejected("Execution queue is full")
+
+        live = self._live_waiters()
+        if live and len(live) >= self.queue_limit:
+            victim = self._shed_candidate(priority)
+            if victim is not None:
+                self._shed += 1
+                victim.future.set_exception(
+                    ExecutionRejected("Shed to make room for higher-priority work", shed=True)
+                )
+                logger.warning(
+                    "Execution shed from queue",
+                    extra={"agent": victim.agent_name, "priority": Priority(victim.priority).name},
+                )
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            request_id=request_id,
+            agent_name=agent_name,
+            future=loop.create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        self._pump()
+
+        try:
+            await asyncio.shield(waiter.future)
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Granted just as we were cancelled; hand the worker back
+                self._release()
+            else:
+                waiter.future.cancel()
+                self._pump()
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        try:
+            yield waited
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._pump()
+
+    def _pump(self) -> None:
+        """Start queued executions in priority order while workers are free."""
+
+        while self._waiters and self._has_free_worker():
+            head = heapq.heappop(self._waiters)
+            if head.future.done():
+                continue
+            self._running += 1
+            self._started += 1
+            head.future.set_result(None)
+
+    def queued_request_ids(self) -> Dict[str, float]:
+        """Map each queued request to the seconds it has waited so far."""
+
+        now = time.monotonic()
+        return {waiter.request_id: now - waiter.enqueued_at for waiter in self._live_waiters()}
+
+    def metrics(self) -> Dict[str, object]:
+        """Worker usage, queue depth and wait times."""
+
+        now = time.monotonic()
+        live = self._live_waiters()
+        by_priority = {priority.name.lower(): 0 for priority in Priority}
+        for waiter in live:
+            by_priority[Priority(waiter.priority).name.lower()] += 1
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_limit": self.queue_limit,
+            "running": self._running,
+            "queued": len(live),
+            "queued_by_priority": by_priority,
+            "oldest_wait_seconds": round(max((now - w.enqueued_at for w in live), default=0.0), 3),
+            "started": self._started,
+            "rejected": self._rejected,
+            "shed": self._shed,
+            "avg_wait_seconds": round(self._total_wait / self._started, 3) if self._started else 0.0,
+            "max_wait_seconds": round(self._max_wait, 3),
+        }
+
+
+__all__ = ["ExecutionPool", "ExecutionRejected"]
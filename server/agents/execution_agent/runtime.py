@@ -1,15 +1,28 @@
 """Simplified Execution Agent Runtime."""
 
+import asyncio
 import inspect
 import json
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
 from .agent import ExecutionAgent
-from .tools import get_tool_schemas, get_tool_registry
+from .tools import (
+    get_idempotent_tool_names,
+    get_read_only_tool_names,
+    get_serial_tool_names,
+    get_tool_registry,
+    get_tool_schemas,
+)
+from .tools.memo import create_tool_memo
+from .tools.selection import ToolSelection, select_tools
 from ...config import get_settings
-from ...gemini_client import request_chat_completion
+from ...llm import DeadlineExceeded, LLMError, Priority, deadline_scope, request_chat_completion, time_remaining
+from ...llm.budget import message_budget
+from ...llm.compaction import EXPAND_TOOL_NAME, ToolResultStore
+from ...llm.deadline import current_deadline, run_within
 from ...logging_config import logger
+from ...services.execution import get_execution_agent_logs
 
 
 @dataclass
@@ -26,36 +39,75 @@ class ExecutionAgentRuntime:
     """Manages the execution of a single agent request."""
 
     MAX_TOOL_ITERATIONS = 8
+    # Below this much time left, skip the wrap-up call and summarize locally
+    MIN_WRAPUP_SECONDS = 2.0
+    WRAPUP_PROMPT = (
+        "Time is almost up. Do not call any more tools. Reply now with your best answer: "
+        "what you completed, what you found, and anything still outstanding."
+    )
 
     # Initialize execution agent runtime with settings, tools, and agent instance
-    def __init__(self, agent_name: str):
+    def __init__(self, agent_name: str, priority: Priority = Priority.EXECUTION):
         settings = get_settings()
-        self.agent = ExecutionAgent(agent_name)
+        self.agent = ExecutionAgent(agent_name, conversation_limit=settings.execution_history_requests or None)
         self.api_key = settings.gemini_api_key
         self.model = settings.execution_agent_model
+        self.priority = priority
+        self.wrapup_reserve_seconds = settings.execution_wrapup_reserve_seconds
         self.tool_registry = get_tool_registry(agent_name=agent_name)
         self.tool_schemas = get_tool_schemas()
+        self.tool_subsetting = settings.execution_tool_subsetting
+        self.tool_selection: Optional[ToolSelection] = None
+        self.serial_tools = get_serial_tool_names()
+        # Only declared reads overlap other calls; anything else is treated as a write
+        self.read_only_tools = get_read_only_tool_names() | {EXPAND_TOOL_NAME}
+        # Repeated read-only calls within this run are served from the memo
+        self.idempotent_tools = get_idempotent_tool_names()
+        self.tool_memo = create_tool_memo(agent_name)
+        self._tool_slots = asyncio.Semaphore(max(settings.execution_tool_concurrency, 1))
+        # Tools currently running, and what the run had done if it was cancelled
+        self._active_tools: List[str] = []
+        self.partial_response: Optional[str] = None
+        # Large tool results stay out of the resent conversation behind handles
+        self.tool_results = ToolResultStore()
 
         if not self.api_key:
             raise ValueError("Gemini API key not configured. Set GEMINI_API_KEY environment variable.")
 
     # Main execution loop for running agent with LLM calls and tool execution
     async def execute(self, instructions: str) -> ExecutionResult:
-        """Execute the agent with given instructions."""
+        """Execute the agent with given instructions.
+
+        Under a deadline (see ``deadline_scope``) the loop stops planning once
+        only the wrap-up reserve is left and returns a best-effort answer. If
+        the run is cancelled, a partial result is logged and stored in
+        ``partial_response`` before the cancellation propagates.
+        """
+        tools_executed: List[str] = []
         try:
-            # Build system prompt with history
-            system_prompt = self.agent.build_system_prompt_with_history()
-
-            # Start conversation with the instruction
-            messages = [{"role": "user", "content": instructions}]
-            tools_executed: List[str] = []
+            self._select_tools(instructions)
+            # Static system prompt (cacheable); history rides in the first user message
+            system_prompt = self.agent.build_system_prompt()
+            token_budget = message_budget(self.model, system=system_prompt, tools=self.tool_schemas)
+            messages = self.agent.build_messages_for_llm(instructions, token_budget=token_budget)
             final_response: Optional[str] = None
+            out_of_time = False
 
             for iteration in range(self.MAX_TOOL_ITERATIONS):
+                remaining = time_remaining()
+                if remaining is not None and remaining <= self.wrapup_reserve_seconds:
+                    out_of_time = True
+                    break
+
                 logger.info(
                     f"[{self.agent.name}] Requesting plan (iteration {iteration + 1})"
                 )
-                response = await self._make_llm_call(system_prompt, messages, with_tools=True)
+                try:
+                    with self._work_scope():
+                        response = await self._make_llm_call(system_prompt, messages, with_tools=True)
+                except DeadlineExceeded:
+                    out_of_time = True
+                    break
                 assistant_message = response.get("choices", [{}])[0].get("message", {})
 
                 if not assistant_message:
@@ -63,6 +115,7 @@ class ExecutionAgentRuntime:
 
                 raw_tool_calls = assistant_message.get("tool_calls", []) or []
                 parsed_tool_calls = self._extract_tool_calls(raw_tool_calls)
+                self._expand_tools(parsed_tool_calls)
 
                 assistant_entry: Dict[str, Any] = {
                     "role": "assistant",
@@ -76,7 +129,9 @@ class ExecutionAgentRuntime:
                     final_response = assistant_entry["content"] or "No action required."
                     break
 
-                for tool_call in parsed_tool_calls:
+                outcomes = await self._run_tool_calls(parsed_tool_calls)
+
+                for tool_call, outcome in zip(parsed_tool_calls, outcomes):
                     tool_name = tool_call.get("name", "")
                     tool_args = tool_call.get("arguments", {})
                     call_id = tool_call.get("id")
@@ -95,9 +150,7 @@ class ExecutionAgentRuntime:
                         continue
 
                     tools_executed.append(tool_name)
-                    logger.info(f"[{self.agent.name}] Executing tool: {tool_name}")
-
-                    success, result = await self._execute_tool(tool_name, tool_args)
+                    success, result = outcome
 
                     if success:
                         logger.info(f"[{self.agent.name}] Tool {tool_name} completed successfully")
@@ -123,6 +176,9 @@ class ExecutionAgentRuntime:
             else:
                 raise RuntimeError("Reached tool iteration limit without final response")
 
+            if out_of_time:
+                return await self._finish_out_of_time(system_prompt, messages, tools_executed)
+
             if final_response is None:
                 raise RuntimeError("LLM did not return a final response")
 
@@ -135,6 +191,15 @@ class ExecutionAgentRuntime:
                 tools_executed=tools_executed
             )
 
+        except asyncio.CancelledError:
+            self.partial_response = self._progress_summary("Stopped", tools_executed)
+            if self._active_tools:
+                interrupted = ", ".join(dict.fromkeys(self._active_tools))
+                self.partial_response += f" Interrupted while running {interrupted}; that call may still have taken effect."
+            logger.warning(f"[{self.agent.name}] Execution cancelled")
+            self.agent.record_response(self.partial_response)
+            raise
+
         except Exception as e:
             logger.error(f"[{self.agent.name}] Execution failed: {e}")
             error_msg = str(e)
@@ -148,17 +213,147 @@ class ExecutionAgentRuntime:
                 error=error_msg
             )
 
+    # Narrow the tools sent to the model to the groups this request is likely to need
+    def _select_tools(self, instructions: str) -> None:
+        """Replace the full schema list with an intent-scoped subset (when enabled)."""
+        if not self.tool_subsetting:
+            return
+        recent_tools = get_execution_agent_logs().recent_tool_names(self.agent.name)
+        self.tool_selection = select_tools(self.agent.name, instructions, recent_tools)
+        self.tool_schemas = self.tool_selection.schemas()
+        logger.info(
+            f"[{self.agent.name}] Selected tool groups: {sorted(self.tool_selection.groups)}",
+            extra={"reason": self.tool_selection.reason, "tools": len(self.tool_schemas)},
+        )
+
+    # Widen the tool subset when the model calls a tool it was not shown
+    def _expand_tools(self, tool_calls: List[Dict[str, Any]]) -> None:
+        """Add the groups of any called tool missing from the current schemas."""
+        if self.tool_selection is None or self.tool_selection.is_full:
+            return
+        offered = {(schema.get("function") or schema).get("name") for schema in self.tool_schemas}
+        expanded = False
+        for tool_call in tool_calls:
+            tool_name = tool_call.get("name", "")
+            if tool_name == EXPAND_TOOL_NAME:
+                continue
+            if tool_name and tool_name not in offered and self.tool_selection.expand_for(tool_name):
+                logger.info(f"[{self.agent.name}] Expanding tools for unselected call: {tool_name}")
+                expanded = True
+        if expanded:
+            self.tool_schemas = self.tool_selection.schemas()
+
+    # Run one turn's tool calls, overlapping independent ones, and return outcomes in call order
+    async def _run_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Optional[Tuple[bool, Any]]]:
+        """Execute tool calls concurrently where safe.
+
+        Consecutive parallel-safe calls run together, at most
+        ``execution_tool_concurrency`` at a time; only tools declared read-only
+        are parallel-safe. Any other tool waits for every earlier call and
+        finishes before any later one starts, so effects keep the order the
+        model asked for. Calls without a name get ``None``.
+        """
+        outcomes: List[Optional[Tuple[bool, Any]]] = [None] * len(tool_calls)
+        group: List[int] = []
+
+        async def run(index: int) -> None:
+            tool_name = tool_calls[index]["name"]
+            async with self._tool_slots:
+                logger.info(f"[{self.agent.name}] Executing tool: {tool_name}")
+                self._active_tools.append(tool_name)
+                try:
+                    with self._work_scope():
+                        outcomes[index] = await self._execute_tool(
+                            tool_name, tool_calls[index].get("arguments", {})
+                        )
+                finally:
+                    self._active_tools.remove(tool_name)
+
+        async def flush() -> None:
+            if group:
+                await asyncio.gather(*(run(index) for index in group))
+                group.clear()
+
+        for index, tool_call in enumerate(tool_calls):
+            tool_name = tool_call.get("name", "")
+            if not tool_name:
+                continue
+            if tool_name in self.serial_tools or tool_name not in self.read_only_tools:
+                await flush()
+                await run(index)
+            else:
+                group.append(index)
+        await flush()
+        return outcomes
+
+    # Bound planning and tool work so the wrap-up reserve survives until the deadline
+    def _work_scope(self):
+        """Deadline scope ending ``wrapup_reserve_seconds`` before the run's deadline."""
+        remaining = time_remaining()
+        if remaining is None:
+            return deadline_scope(None)
+        return deadline_scope(remaining - self.wrapup_reserve_seconds)
+
+    # Produce a best-effort answer from the work done so far once the deadline is near
+    async def _finish_out_of_time(
+        self,
+        system_prompt: str,
+        messages: List[Dict],
+        tools_executed: List[str],
+    ) -> ExecutionResult:
+        """Ask for a tool-free wrap-up if time allows, else summarize the tool trail."""
+        logger.warning(f"[{self.agent.name}] Deadline approaching; returning best-effort answer")
+        response_text = ""
+        remaining = time_remaining()
+        if remaining is None or remaining > self.MIN_WRAPUP_SECONDS:
+            wrapup_messages = [*messages, {"role": "user", "content": self.WRAPUP_PROMPT}]
+            try:
+                response = await self._make_llm_call(system_prompt, wrapup_messages, with_tools=False)
+                message = response.get("choices", [{}])[0].get("message", {})
+                response_text = (message.get("content") or "").strip()
+            except (LLMError, DeadlineExceeded) as exc:
+                logger.warning(f"[{self.agent.name}] Wrap-up call failed: {exc}")
+
+        if not response_text:
+            response_text = self._progress_summary("Ran out of time", tools_executed)
+
+        self.agent.record_response(response_text)
+        return ExecutionResult(
+            agent_name=self.agent.name,
+            success=False,
+            response=response_text,
+            error="Deadline exceeded",
+            tools_executed=tools_executed,
+        )
+
+    # Describe how far a run got when it stops without a final answer
+    @staticmethod
+    def _progress_summary(outcome: str, tools_executed: List[str]) -> str:
+        if not tools_executed:
+            return f"{outcome} before any work could be done."
+        ran = ", ".join(dict.fromkeys(tools_executed))
+        return f"{outcome} after {len(tools_executed)} tool call(s) ({ran}) before reaching a final answer."
+
     # Execute OpenRouter API call with system prompt, messages, and optional tool schemas
     async def _make_llm_call(self, system_prompt: str, messages: List[Dict], with_tools: bool) -> Dict:
         """Make an LLM call."""
-        tools_to_send = self.tool_schemas if with_tools else None
+        tools_to_send = self.tool_results.tools_with_expansion(self.tool_schemas) if with_tools else None
         logger.info(f"[{self.agent.name}] Calling LLM with model: {self.model}, tools: {len(tools_to_send) if tools_to_send else 0}")
+        # Each tool subset is a distinct prefix; only the full tool list is worth a cachedContents
+        # entry, and appending the expansion tool would make it a second one
+        full_tools = (
+            self.tool_selection is None or self.tool_selection.is_full
+        ) and not self.tool_results.has_results
         return await request_chat_completion(
             model=self.model,
             messages=messages,
             system=system_prompt,
             api_key=self.api_key,
-            tools=tools_to_send
+            tools=tools_to_send,
+            priority=self.priority,
+            caller=f"execution_agent:{self.agent.name}",
+            # A tool-free call (the out-of-time wrap-up) would need its own, undersized entry
+            cache_static_prefix=with_tools and full_tools,
         )
 
     # Parse and validate tool calls from LLM response into structured format
@@ -202,7 +397,10 @@ class ExecutionAgentRuntime:
         result: Any,
         arguments: Dict[str, Any],
     ) -> str:
-        """Build a structured string for tool responses."""
+        """Build a structured string for tool responses, compacting oversized ones."""
+        if tool_name == EXPAND_TOOL_NAME:
+            # Pages are already bounded; compacting them again would hide what was asked for
+            return self._safe_json_dump(result)
         if success:
             payload: Dict[str, Any] = {
                 "tool": tool_name,
@@ -218,19 +416,53 @@ class ExecutionAgentRuntime:
                 "arguments": arguments,
                 "error": error_detail,
             }
-        return self._safe_json_dump(payload)
+        return self.tool_results.render(payload)
 
     # Execute tool function from registry with error handling and async support
     async def _execute_tool(self, tool_name: str, arguments: Dict) -> Tuple[bool, Any]:
-        """Execute a tool. Returns (success, result)."""
+        """Execute a tool. Returns (success, result).
+
+        Under a deadline the tool is bounded by the time remaining. Synchronous
+        tools (blocking Composio calls) run in a worker thread so sibling tools
+        and the event loop keep going, and so a deadline can stop waiting on them.
+        Repeated calls to idempotent tools are answered from the run's memo;
+        any tool not declared read-only clears it.
+        """
+        if tool_name == EXPAND_TOOL_NAME:
+            return self.tool_results.expand(
+                str(arguments.get("handle", "")), arguments.get("path"), arguments.get("offset") or 0
+            )
+
         tool_func = self.tool_registry.get(tool_name)
         if not tool_func:
             return False, {"error": f"Unknown tool: {tool_name}"}
 
+        if self.tool_memo is not None and tool_name in self.idempotent_tools:
+            return await self.tool_memo.call(
+                tool_name, arguments, lambda: self._invoke_tool(tool_name, tool_func, arguments)
+            )
+        if self.tool_memo is None or tool_name in self.read_only_tools:
+            return await self._invoke_tool(tool_name, tool_func, arguments)
+        try:
+            return await self._invoke_tool(tool_name, tool_func, arguments)
+        finally:
+            # The call may have changed what earlier reads returned
+            self.tool_memo.clear()
+
+    # Call a registry tool within the run's deadline
+    async def _invoke_tool(self, tool_name: str, tool_func: Any, arguments: Dict) -> Tuple[bool, Any]:
+        deadline = current_deadline()
         try:
-            result = tool_func(**arguments)
-            if inspect.isawaitable(result):
-                result = await result
+            if inspect.iscoroutinefunction(tool_func):
+                result = await run_within(tool_func(**arguments), deadline, what=f"tool {tool_name}")
+            else:
+                result = await run_within(
+                    asyncio.to_thread(tool_func, **arguments), deadline, what=f"tool {tool_name}"
+                )
+                if inspect.isawaitable(result):
+                    result = await run_within(result, deadline, what=f"tool {tool_name}")
             return True, result
+        except DeadlineExceeded:
+            return False, {"error": f"{tool_name} did not finish before the deadline; its outcome is unknown"}
         except Exception as e:
             return False, {"error": str(e)}
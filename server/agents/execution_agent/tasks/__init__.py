@@ -7,6 +7,9 @@ from typing import Any, Callable, Dict, List
 from .search_email.schemas import get_schemas as _get_email_search_schemas
 from .search_email.tool import build_registry as _build_email_search_registry
 
+# Task tools that only read; every other task tool runs on its own
+READ_ONLY_TASKS = frozenset({"task_email_search"})
+
 
 # Return tool schemas contributed by task modules
 def get_task_schemas() -> List[Dict[str, Any]]:
@@ -25,6 +28,7 @@ def get_task_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
 
 
 __all__ = [
+    "READ_ONLY_TASKS",
     "get_task_registry",
     "get_task_schemas",
 ]
@@ -7,7 +7,8 @@ from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from server.config import get_settings
 from server.logging_config import logger
-from server.gemini_client import request_chat_completion
+from server.llm import request_chat_completion
+from server.llm.compaction import EXPAND_TOOL_NAME, ToolResultStore
 from server.services.execution import get_execution_agent_logs
 from server.services.gmail import (
     EmailTextCleaner,
@@ -133,12 +134,15 @@ async def _run_email_search(
     api_key: str,
 ) -> List[Dict[str, Any]]:
     """Execute the main email search orchestration loop."""
+    cache_ttl = get_settings().email_search_cache_ttl_seconds
     messages: List[Dict[str, Any]] = [
         {"role": "user", "content": _render_user_message(search_query)}
     ]
     queries: List[str] = []
     emails: Dict[str, GmailSearchEmail] = {}
     selected_ids: Optional[List[str]] = None
+    # Large search results go out-of-band; the model expands the emails it needs
+    results = ToolResultStore()
     
     for iteration in range(MAX_LLM_ITERATIONS):
         logger.debug(
@@ -152,7 +156,9 @@ async def _run_email_search(
             messages=messages,
             system=get_system_prompt(),
             api_key=api_key,
-            tools=[GMAIL_FETCH_EMAILS_SCHEMA, _COMPLETION_TOOL_SCHEMA],
+            tools=results.tools_with_expansion([GMAIL_FETCH_EMAILS_SCHEMA, _COMPLETION_TOOL_SCHEMA]),
+            caller="email_search",
+            cache_ttl=cache_ttl,
         )
         
         # Process assistant response
@@ -180,6 +186,7 @@ async def _run_email_search(
             queries=queries,
             emails=emails,
             composio_user_id=composio_user_id,
+            results=results,
         )
         
         # Add tool responses to conversation
@@ -220,6 +227,7 @@ async def _execute_tool_calls(
     queries: List[str],
     emails: Dict[str, GmailSearchEmail],
     composio_user_id: str,
+    results: ToolResultStore,
 ) -> Tuple[List[Tuple[str, str]], Optional[List[str]]]:
     responses: List[Tuple[str, str]] = []
     completion_ids: Optional[List[str]] = None
@@ -265,7 +273,19 @@ async def _execute_tool_calls(
             else:
                 logger.warning(f"[SEARCH_RESULT] Query '{search_query}' → FAILED: {result_model.error}")
             
-            responses.append(_create_success_response(call_id, response_data))
+            responses.append((call_id, results.render(response_data)))
+
+        elif name == EXPAND_TOOL_NAME:
+            # Handle expansion of a compacted search result
+            success, page = results.expand(
+                str(arguments.get("handle") or ""),
+                arguments.get("path"),
+                arguments.get("offset") or 0,
+            )
+            if success:
+                responses.append(_create_success_response(call_id, page))
+            else:
+                responses.append(_create_error_response(call_id, None, page["error"]))
 
         else:
             # Handle unsupported tools
@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
-from .registry import get_tool_registry, get_tool_schemas
+from .registry import (
+    get_idempotent_tool_names,
+    get_read_only_tool_names,
+    get_serial_tool_names,
+    get_tool_registry,
+    get_tool_schemas,
+    invalidate_tool_registry,
+)
 
 __all__ = [
+    "get_idempotent_tool_names",
+    "get_read_only_tool_names",
+    "get_serial_tool_names",
     "get_tool_registry",
     "get_tool_schemas",
+    "invalidate_tool_registry",
 ]
@@ -35,6 +35,10 @@ _SCHEMAS: List[Dict[str, Any]] = [
 ]
 
 
+# Static FAQ lookups
+IDEMPOTENT_TOOLS = frozenset({"faq_search", "faq_get_topics", "faq_answer"})
+
+
 def get_schemas() -> List[Dict[str, Any]]:
     """Return FAQ tool schemas in OpenAI/OpenRouter format."""
     return _SCHEMAS
@@ -85,6 +89,7 @@ def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
 
 
 __all__ = [
+    "IDEMPOTENT_TOOLS",
     "build_registry",
     "get_schemas",
 ]
@@ -516,6 +516,28 @@ def gmail_search_people(
     return _execute("GMAIL_SEARCH_PEOPLE", composio_user_id, arguments)
 
 
+# Tools that change mailbox state; the runtime never runs these alongside other calls
+SERIAL_TOOLS = frozenset(
+    {
+        "gmail_create_draft",
+        "gmail_execute_draft",
+        "gmail_delete_draft",
+        "gmail_forward_email",
+        "gmail_reply_to_thread",
+    }
+)
+
+# Contact and draft lookups
+IDEMPOTENT_TOOLS = frozenset(
+    {
+        "gmail_get_contacts",
+        "gmail_get_people",
+        "gmail_list_drafts",
+        "gmail_search_people",
+    }
+)
+
+
 # Return Gmail tool callables
 def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:  # noqa: ARG001
     """Return Gmail tool callables."""
@@ -534,6 +556,8 @@ def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:  # noqa: A
 
 
 __all__ = [
+    "IDEMPOTENT_TOOLS",
+    "SERIAL_TOOLS",
     "build_registry",
     "get_schemas",
     "gmail_create_draft",
@@ -0,0 +1,210 @@
+"""Memoization of idempotent execution-agent tool calls.
+
+Tool modules list their pure reads in ``IDEMPOTENT_TOOLS``. Within one run a
+:class:`ToolMemo` serves a repeated call (same tool, same arguments) from the
+first result, and identical calls in flight at once share one invocation.
+Any other tool call may have changed what those reads return, so it clears
+the run's memo. With ``EXECUTION_TOOL_CACHE_TTL_SECONDS`` set, successful
+results are also kept in a process-wide :class:`SharedToolCache` for that
+long, per agent, so trigger-driven agents polling the same data skip the
+round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from server.config import get_settings
+from server.logging_config import logger
+
+ToolOutcome = Tuple[bool, Any]
+
+# Cross-run entries kept across all agents
+_SHARED_CACHE_SIZE = 512
+
+
+def tool_call_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Stable key for a tool name and its (order-insensitive) arguments."""
+    body = json.dumps(arguments, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(f"{tool_name}\0{body}".encode("utf-8")).hexdigest()
+
+
+def _cacheable(outcome: ToolOutcome) -> bool:
+    success, result = outcome
+    # Tool wrappers report many failures as {"error": ...} with success=True
+    return success and not (isinstance(result, dict) and "error" in result)
+
+
+class SharedToolCache:
+    """Process-wide LRU of successful idempotent tool results, scoped by agent."""
+
+    def __init__(self, max_entries: int = _SHARED_CACHE_SIZE) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, agent_name: str, key: str) -> Optional[Any]:
+        """Return a copy of the cached result, or None on miss/expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((agent_name, key))
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end((agent_name, key))
+                    self._stats["hits"] += 1
+                    return copy.deepcopy(result)
+                del self._entries[(agent_name, key)]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, agent_name: str, key: str, result: Any, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[(agent_name, key)] = (time.monotonic() + ttl_seconds, copy.deepcopy(result))
+            self._entries.move_to_end((agent_name, key))
+            self._stats["stores"] += 1
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, agent_name: Optional[str] = None) -> None:
+        """Drop one agent's entries, or every entry when ``agent_name`` is None."""
+        with self._lock:
+            if agent_name is None:
+                self._entries.clear()
+                return
+            for scope in [scope for scope in self._entries if scope[0] == agent_name]:
+                del self._entries[scope]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+class ToolMemo:
+    """Run-scoped memo of idempotent tool outcomes, backed by the shared cache."""
+
+    def __init__(
+        self,
+        agent_name: str,
+        shared: Optional[SharedToolCache] = None,
+        ttl_seconds: float = 0,
+    ) -> None:
+        self.agent_name = agent_name
+        self._shared = shared if ttl_seconds > 0 else None
+        self._ttl_seconds = ttl_seconds
+        self._outcomes: Dict[str, "asyncio.Future[ToolOutcome]"] = {}
+        self.hits = 0
+
+    async def call(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        invoke: Callable[[], Awaitable[ToolOutcome]],
+    ) -> ToolOutcome:
+        """Return the memoized outcome for this call, invoking the tool only on a miss."""
+        key = tool_call_key(tool_name, arguments)
+        pending = self._outcomes.get(key)
+        if pending is not None:
+            self.hits += 1
+            logger.info(f"[{self.agent_name}] Reusing result of earlier {tool_name} call")
+            try:
+                success, result = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not pending.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # Only the first caller was cancelled; run the call ourselves
+                return await self.call(tool_name, arguments, invoke)
+            return success, copy.deepcopy(result)
+
+        if self._shared is not None:
+            cached = self._shared.get(self.agent_name, key)
+            if cached is not None:
+                self.hits += 1
+                logger.info(f"[{self.agent_name}] Serving {tool_name} from the shared tool cache")
+                self._remember(key, (True, cached))
+                return True, cached
+
+        future: "asyncio.Future[ToolOutcome]" = asyncio.get_running_loop().create_future()
+        self._outcomes[key] = future
+        try:
+            outcome = await invoke()
+        except BaseException as exc:
+            # Concurrent duplicates must not wait forever on a call that never finished
+            self._forget(key, future)
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody else was waiting
+            raise
+
+        if _cacheable(outcome):
+            future.set_result((outcome[0], copy.deepcopy(outcome[1])))
+            if self._shared is not None:
+                self._shared.set(self.agent_name, key, outcome[1], self._ttl_seconds)
+        else:
+            # Failures are shared with concurrent duplicates but retried by later calls
+            self._forget(key, future)
+            future.set_result(outcome)
+        return outcome
+
+    def clear(self) -> None:
+        """Forget every memoized outcome after a call that may have written state."""
+        self._outcomes = {key: future for key, future in self._outcomes.items() if not future.done()}
+        if self._shared is not None:
+            self._shared.invalidate(self.agent_name)
+
+    def _remember(self, key: str, outcome: ToolOutcome) -> None:
+        future: "asyncio.Future[ToolOutcome]" = asyncio.get_running_loop().create_future()
+        future.set_result((outcome[0], copy.deepcopy(outcome[1])))
+        self._outcomes[key] = future
+
+    def _forget(self, key: str, future: "asyncio.Future[ToolOutcome]") -> None:
+        if self._outcomes.get(key) is future:
+            del self._outcomes[key]
+
+
+_shared_cache: Optional[SharedToolCache] = None
+_factory_lock = threading.Lock()
+
+
+def get_shared_tool_cache() -> SharedToolCache:
+    """Return the process-wide cross-run tool cache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _factory_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedToolCache()
+    return _shared_cache
+
+
+def create_tool_memo(agent_name: str) -> Optional[ToolMemo]:
+    """Return a memo for one run of ``agent_name``, or None when memoization is off."""
+    settings = get_settings()
+    if not settings.execution_tool_memoization:
+        return None
+    return ToolMemo(
+        agent_name,
+        shared=get_shared_tool_cache(),
+        ttl_seconds=settings.execution_tool_cache_ttl_seconds,
+    )
+
+
+__all__ = [
+    "SharedToolCache",
+    "ToolMemo",
+    "create_tool_memo",
+    "get_shared_tool_cache",
+    "tool_call_key",
+]
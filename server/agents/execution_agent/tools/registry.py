@@ -1,30 +1,53 @@
-"""Aggregate execution agent tool schemas and registries."""
+"""Aggregate execution agent tool schemas and registries.
+
+Schemas are assembled once per process and shared by every runtime. Bound
+registries (callables closed over an agent name for logging) are cached per
+agent in a small LRU, so the runtime created for each execution or trigger
+fire reuses them instead of re-wrapping every tool. Both caches are
+read-only views; call :func:`invalidate_tool_registry` after changing a
+tool module (tests, hot reload).
+"""
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional
 
 from . import gmail, triggers, ultrahuman_tools, faq_tools
-from ..tasks import get_task_registry, get_task_schemas
+from ..tasks import READ_ONLY_TASKS, get_task_registry, get_task_schemas
 
+# Bound registries kept for this many recently active agents
+_REGISTRY_CACHE_SIZE = 128
 
-# Return OpenAI/OpenRouter-compatible tool schemas
-def get_tool_schemas() -> List[Dict[str, Any]]:
-    """Return OpenAI/OpenRouter-compatible tool schemas."""
+_cache_lock = threading.Lock()
+_schemas: Optional[List[Dict[str, Any]]] = None
+_groups: Optional[Mapping[str, List[Dict[str, Any]]]] = None
+_serial_tools: Optional[FrozenSet[str]] = None
+_idempotent_tools: Optional[FrozenSet[str]] = None
+_read_only_tools: Optional[FrozenSet[str]] = None
+_registries: "OrderedDict[str, Mapping[str, Callable[..., Any]]]" = OrderedDict()
 
-    return [
-        *gmail.get_schemas(),
-        *get_task_schemas(),
-        *triggers.get_schemas(),
-        *ultrahuman_tools.get_schemas(),
-        *faq_tools.get_schemas(),
-    ]
 
+# Schemas per tool group, in the order they are sent to the model (uncached)
+def _build_tool_groups() -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        "gmail": list(gmail.get_schemas()),
+        "email_search": list(get_task_schemas()),
+        "triggers": list(triggers.get_schemas()),
+        "ultrahuman": list(ultrahuman_tools.get_schemas()),
+        "faq": list(faq_tools.get_schemas()),
+    }
 
-# Return Python callables for executing tools by name
-def get_tool_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
-    """Return Python callables for executing tools by name."""
 
+# Assemble schemas from every tool module (uncached)
+def _build_tool_schemas() -> List[Dict[str, Any]]:
+    return [schema for schemas in _build_tool_groups().values() for schema in schemas]
+
+
+# Bind every tool module's callables to an agent (uncached)
+def _build_tool_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
     registry: Dict[str, Callable[..., Any]] = {}
     registry.update(gmail.build_registry(agent_name))
     registry.update(get_task_registry(agent_name))
@@ -34,7 +57,126 @@ def get_tool_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
     return registry
 
 
+# Return OpenAI/OpenRouter-compatible tool schemas
+def get_tool_schemas() -> List[Dict[str, Any]]:
+    """Return OpenAI/OpenRouter-compatible tool schemas.
+
+    The list is shared across callers and must not be mutated.
+    """
+
+    global _schemas
+    if _schemas is None:
+        with _cache_lock:
+            if _schemas is None:
+                _schemas = _build_tool_schemas()
+    return _schemas
+
+
+# Return tool schemas grouped by the module that provides them
+def get_tool_groups() -> Mapping[str, List[Dict[str, Any]]]:
+    """Return ``{group: schemas}`` in send order; shared and read-only."""
+
+    global _groups
+    if _groups is None:
+        with _cache_lock:
+            if _groups is None:
+                _groups = MappingProxyType(_build_tool_groups())
+    return _groups
+
+
+# Return Python callables for executing tools by name
+def get_tool_registry(agent_name: str) -> Mapping[str, Callable[..., Any]]:
+    """Return Python callables for executing tools by name, bound to ``agent_name``."""
+
+    with _cache_lock:
+        registry = _registries.get(agent_name)
+        if registry is not None:
+            _registries.move_to_end(agent_name)
+            return registry
+
+    registry = MappingProxyType(_build_tool_registry(agent_name))
+    with _cache_lock:
+        registry = _registries.setdefault(agent_name, registry)
+        _registries.move_to_end(agent_name)
+        while len(_registries) > _REGISTRY_CACHE_SIZE:
+            _registries.popitem(last=False)
+    return registry
+
+
+# Return names of side-effecting tools that must run one at a time, in order
+def get_serial_tool_names() -> FrozenSet[str]:
+    """Return names of side-effecting tools that must run one at a time, in order.
+
+    Tools missing from :func:`get_read_only_tool_names` run one at a time
+    too; this set only names the known writers.
+    """
+
+    global _serial_tools
+    if _serial_tools is None:
+        _serial_tools = frozenset(
+            {*gmail.SERIAL_TOOLS, *triggers.SERIAL_TOOLS, *ultrahuman_tools.SERIAL_TOOLS}
+        )
+    return _serial_tools
+
+
+# Return names of tools declared read-only, the only ones that may run alongside other calls
+def get_read_only_tool_names() -> FrozenSet[str]:
+    """Return names of tools declared read-only, the only ones that may run alongside other calls."""
+
+    global _read_only_tools
+    if _read_only_tools is None:
+        _read_only_tools = frozenset(
+            {*get_idempotent_tool_names(), *READ_ONLY_TASKS, *ultrahuman_tools.READ_ONLY_TOOLS}
+        )
+    return _read_only_tools
+
+
+# Return names of read-only tools whose repeated calls may be memoized
+def get_idempotent_tool_names() -> FrozenSet[str]:
+    """Return names of read-only tools whose repeated calls may be memoized.
+
+    Each tool module lists these in ``IDEMPOTENT_TOOLS``: pure reads whose
+    result depends only on their arguments and on state the run has not
+    changed since. See :mod:`.memo` for how repeats are served and when the
+    memo is cleared.
+    """
+
+    global _idempotent_tools
+    if _idempotent_tools is None:
+        _idempotent_tools = frozenset(
+            {
+                *gmail.IDEMPOTENT_TOOLS,
+                *triggers.IDEMPOTENT_TOOLS,
+                *ultrahuman_tools.IDEMPOTENT_TOOLS,
+                *faq_tools.IDEMPOTENT_TOOLS,
+            }
+        )
+    return _idempotent_tools
+
+
+# Drop cached schemas and bound registries so the next lookup rebuilds them
+def invalidate_tool_registry(agent_name: Optional[str] = None) -> None:
+    """Forget one agent's bound registry, or every cache when ``agent_name`` is None."""
+
+    global _schemas, _groups, _serial_tools, _idempotent_tools, _read_only_tools
+    with _cache_lock:
+        if agent_name is not None:
+            _registries.pop(agent_name, None)
+            return
+        _registries.clear()
+        _schemas = None
+        _groups = None
+        _serial_tools = None
+        _idempotent_tools = None
+        _read_only_tools = None
+
+
 __all__ = [
+    "get_idempotent_tool_names",
+    "get_read_only_tool_names",
+    "get_serial_tool_names",
+    "get_tool_groups",
     "get_tool_registry",
     "get_tool_schemas",
+    "invalidate_tool_registry",
 ]
@@ -0,0 +1,131 @@
+"""Pick the tool groups an execution agent is likely to need.
+
+Sending every schema on every iteration costs thousands of prompt tokens
+that most agents never use. The selection is a cheap keyword match over the
+agent's name and instructions plus the tools it has called before; when
+nothing matches, every group is sent. The runtime widens the selection if
+the model calls a tool outside it (see :meth:`ToolSelection.expand_for`).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+from .registry import get_tool_groups
+
+# Words (matched at word starts) that suggest a group is needed
+_GROUP_KEYWORDS: Dict[str, Sequence[str]] = {
+    "gmail": (
+        "email", "e-mail", "mail", "inbox", "gmail", "draft", "reply", "forward", "send",
+        "contact", "thread", "cc", "bcc", "recipient", "unsubscribe",
+    ),
+    "email_search": (
+        "email", "e-mail", "mail", "inbox", "gmail", "thread", "receipt", "invoice", "newsletter",
+        "sender", "attachment",
+    ),
+    "ultrahuman": (
+        "ultrahuman", "ring", "sleep", "hrv", "heart", "recovery", "steps", "activity", "glucose",
+        "metabolic", "temperature", "readiness", "movement", "battery", "charg", "device", "firmware",
+        "reset", "order", "shipping", "replacement", "warranty", "health", "metric",
+    ),
+    "faq": (
+        "faq", "ultrahuman", "ring", "warranty", "refund", "return", "water", "spec", "size",
+        "integration", "strava", "apple health", "google fit", "wabi", "trade-in", "troubleshoot",
+        "battery", "charg",
+    ),
+    "triggers": (
+        "remind", "schedule", "recurring", "every", "daily", "weekly", "monthly", "tomorrow",
+        "tonight", "later", "trigger", "alarm", "follow up", "notify", "alert",
+    ),
+}
+
+# Groups pulled in alongside another (finding a thread precedes replying to it, etc.)
+_COMPANIONS: Dict[str, Sequence[str]] = {
+    "gmail": ("email_search",),
+    "email_search": ("gmail",),
+    "ultrahuman": ("faq",),
+    "faq": ("ultrahuman",),
+}
+
+# Small groups that are cheap enough to always send
+_ALWAYS_INCLUDED = ("triggers",)
+
+_PATTERNS = {
+    group: re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + r")", re.IGNORECASE)
+    for group, words in _GROUP_KEYWORDS.items()
+}
+
+
+def _group_of(tool_name: str, groups: Mapping[str, List[Dict[str, Any]]]) -> Optional[str]:
+    for group, schemas in groups.items():
+        for schema in schemas:
+            function = schema.get("function") or schema
+            if function.get("name") == tool_name:
+                return group
+    return None
+
+
+def _with_companions(selected: Iterable[str]) -> Set[str]:
+    result = set(selected)
+    for group in list(result):
+        result.update(_COMPANIONS.get(group, ()))
+    return result
+
+
+@dataclass
+class ToolSelection:
+    """The groups chosen for one agent run and the schemas they expand to."""
+
+    groups: Set[str]
+    reason: str
+    expansions: List[str] = field(default_factory=list)
+
+    @property
+    def is_full(self) -> bool:
+        return self.groups >= set(get_tool_groups())
+
+    def schemas(self) -> List[Dict[str, Any]]:
+        """Schemas of the selected groups in the registry's send order."""
+        all_groups = get_tool_groups()
+        return [schema for group, schemas in all_groups.items() if group in self.groups for schema in schemas]
+
+    def expand_for(self, tool_name: str) -> bool:
+        """Widen the selection to cover ``tool_name``; returns True if anything was added.
+
+        A known tool adds its group (and companions); an unknown name adds
+        every group so the model can see what actually exists.
+        """
+        all_groups = get_tool_groups()
+        group = _group_of(tool_name, all_groups)
+        added = _with_companions([group]) if group else set(all_groups)
+        added -= self.groups
+        if not added:
+            return False
+        self.groups |= added
+        self.expansions.append(tool_name)
+        return True
+
+
+def select_tools(
+    agent_name: str,
+    instructions: str,
+    recent_tools: Sequence[str] = (),
+) -> ToolSelection:
+    """Choose tool groups from the agent name, instructions and prior tool use."""
+    all_groups = get_tool_groups()
+    text = f"{agent_name}\n{instructions}"
+    matched = {group for group, pattern in _PATTERNS.items() if pattern.search(text)}
+    used = {group for group in (_group_of(name, all_groups) for name in recent_tools) if group}
+
+    if not matched and not used:
+        return ToolSelection(groups=set(all_groups), reason="no_match")
+
+    selected = _with_companions(matched | used) | set(_ALWAYS_INCLUDED)
+    selected &= set(all_groups)
+    reason = "keywords+history" if matched and used else ("keywords" if matched else "history")
+    return ToolSelection(groups=selected, reason=reason)
+
+
+__all__ = ["ToolSelection", "select_tools"]
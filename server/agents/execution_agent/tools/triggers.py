@@ -232,6 +232,13 @@ def _list_triggers_tool(*, agent_name: str) -> Dict[str, Any]:
     return {"triggers": [_trigger_record_to_payload(record) for record in records]}
 
 
+# Tools that write trigger state; the runtime never runs these alongside other calls
+SERIAL_TOOLS = frozenset({"createTrigger", "updateTrigger"})
+
+# Listing this agent's triggers
+IDEMPOTENT_TOOLS = frozenset({"listTriggers"})
+
+
 # Return trigger tool callables bound to a specific agent
 def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
     """Return trigger tool callables bound to a specific agent."""
@@ -244,6 +251,8 @@ def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
 
 
 __all__ = [
+    "IDEMPOTENT_TOOLS",
+    "SERIAL_TOOLS",
     "build_registry",
     "get_schemas",
 ]
@@ -9,6 +9,8 @@ from __future__ import annotations
 from typing import Any, Optional
 from server.logging_config import logger
 
+from ..memo import get_shared_tool_cache
+
 # Global context store
 _user_context: dict[str, Any] = {}
 
@@ -23,6 +25,9 @@ def set_user_context(payload: dict[str, Any]) -> None:
     """
     global _user_context
 
+    # Cached reads may describe the previous user
+    get_shared_tool_cache().invalidate()
+
     # Try to extract from nested structure
     if isinstance(payload, dict):
         if "data" in payload and isinstance(payload["data"], dict):
@@ -51,6 +56,7 @@ def clear_user_context() -> None:
     """Clear the user context."""
     global _user_context
     _user_context = {}
+    get_shared_tool_cache().invalidate()
     logger.info("User context cleared")
 
 
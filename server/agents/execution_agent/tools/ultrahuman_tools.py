@@ -39,6 +39,45 @@ _SCHEMAS: List[Dict[str, Any]] = [
 ]
 
 
+# Tools that change order, device or account state; the runtime never runs these alongside other calls
+SERIAL_TOOLS = frozenset(
+    {
+        "ultrahuman_create_replacement_request",
+        "ultrahuman_update_shipping_address",
+        "ultrahuman_enable_data_sharing",
+        "ultrahuman_trigger_soft_reset",
+        "ultrahuman_confirm_wear_status",
+    }
+)
+
+# Reads that may run alongside other calls but are not memoized
+READ_ONLY_TOOLS = frozenset(
+    {
+        "ultrahuman_check_charger_status",
+        "ultrahuman_check_troubleshooting_history",
+        "ultrahuman_battery_troubleshoot",
+    }
+)
+
+# Ring, device and health-data reads
+IDEMPOTENT_TOOLS = frozenset(
+    {
+        "ultrahuman_get_ring_battery_info",
+        "ultrahuman_get_device_info",
+        "ultrahuman_get_reset_status",
+        "ultrahuman_get_health_metrics",
+        "ultrahuman_get_sleep_data",
+        "ultrahuman_get_heart_rate_data",
+        "ultrahuman_get_hrv_data",
+        "ultrahuman_get_activity_data",
+        "ultrahuman_get_recovery_score",
+        "ultrahuman_get_glucose_data",
+        "ultrahuman_get_order_status",
+        "ultrahuman_get_warranty_info",
+    }
+)
+
+
 def get_schemas() -> List[Dict[str, Any]]:
     """Return Ultrahuman tool schemas in OpenAI/OpenRouter format."""
     return _SCHEMAS
@@ -89,6 +128,9 @@ def build_registry(agent_name: str) -> Dict[str, Callable[..., Any]]:
 
 
 __all__ = [
+    "IDEMPOTENT_TOOLS",
+    "READ_ONLY_TOOLS",
+    "SERIAL_TOOLS",
     "build_registry",
     "get_schemas",
 ]
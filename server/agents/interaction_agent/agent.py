@@ -2,8 +2,10 @@
 
 from html import escape
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from ...llm.budget import fit_history
+from ...llm.tokens import estimate_tokens
 from ...services.execution import get_agent_roster
 
 _prompt_path = Path(__file__).parent / "system_prompt.md"
@@ -21,14 +23,21 @@ def prepare_message_with_history(
     latest_text: str,
     transcript: str,
     message_type: str = "user",
+    token_budget: Optional[int] = None,
 ) -> List[Dict[str, str]]:
-    """Compose a message that bundles history, roster, and the latest turn."""
-    sections: List[str] = []
+    """Compose a message that bundles history, roster, and the latest turn.
 
-    sections.append(_render_conversation_history(transcript))
-    sections.append(f"<active_agents>\n{_render_active_agents()}\n</active_agents>")
-    sections.append(_render_current_turn(latest_text, message_type))
+    When ``token_budget`` is given, the history is trimmed so the whole
+    message fits within it.
+    """
+    roster = f"<active_agents>\n{_render_active_agents()}\n</active_agents>"
+    current_turn = _render_current_turn(latest_text, message_type)
 
+    if token_budget is not None:
+        history_budget = token_budget - estimate_tokens(roster) - estimate_tokens(current_turn)
+        transcript = fit_history(transcript, history_budget, source="interaction_agent")
+
+    sections = [_render_conversation_history(transcript), roster, current_turn]
     content = "\n\n".join(sections)
     return [{"role": "user", "content": content}]
 
@@ -1,17 +1,24 @@
 """Interaction Agent Runtime - handles LLM calls for user and agent turns."""
 
 import json
+import uuid
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from .agent import build_system_prompt, prepare_message_with_history
 from .tools import ToolResult, get_tool_schemas, handle_tool_call
 from ...config import get_settings
 from ...services.conversation import get_conversation_log, get_working_memory_log
-from ...gemini_client import request_chat_completion
+from ...llm import Priority, request_chat_completion, stream_chat_completion
+from ...llm.budget import message_budget
+from ...llm.compaction import ToolResultStore
 from ...logging_config import logger
 
 
+# Receives incremental events ("delta" / "message") while a turn is streamed
+StreamEventSink = Callable[[Dict[str, Any]], None]
+
+
 @dataclass
 class InteractionResult:
     """Result from the interaction agent."""
@@ -55,6 +62,8 @@ class InteractionAgentRuntime:
         self.conversation_log = get_conversation_log()
         self.working_memory_log = get_working_memory_log()
         self.tool_schemas = get_tool_schemas()
+        # No expansion tool here: the tool list is part of the cached static prefix
+        self.tool_results = ToolResultStore()
 
         if not self.api_key:
             raise ValueError(
@@ -62,8 +71,12 @@ class InteractionAgentRuntime:
             )
 
     # Main entry point for processing user messages through the LLM interaction loop
-    async def execute(self, user_message: str) -> InteractionResult:
-        """Handle a user-authored message."""
+    async def execute(
+        self,
+        user_message: str,
+        on_event: Optional[StreamEventSink] = None,
+    ) -> InteractionResult:
+        """Handle a user-authored message, optionally streaming output to ``on_event``."""
 
         try:
             transcript_before = self._load_conversation_transcript()
@@ -71,11 +84,14 @@ class InteractionAgentRuntime:
 
             system_prompt = build_system_prompt()
             messages = prepare_message_with_history(
-                user_message, transcript_before, message_type="user"
+                user_message,
+                transcript_before,
+                message_type="user",
+                token_budget=message_budget(self.model, system=system_prompt, tools=self.tool_schemas),
             )
 
             logger.info("Processing user message through interaction agent")
-            summary = await self._run_interaction_loop(system_prompt, messages)
+            summary = await self._run_interaction_loop(system_prompt, messages, on_event)
 
             final_response = self._finalize_response(summary)
 
@@ -106,7 +122,10 @@ class InteractionAgentRuntime:
 
             system_prompt = build_system_prompt()
             messages = prepare_message_with_history(
-                agent_message, transcript_before, message_type="agent"
+                agent_message,
+                transcript_before,
+                message_type="agent",
+                token_budget=message_budget(self.model, system=system_prompt, tools=self.tool_schemas),
             )
 
             logger.info("Processing execution agent results")
@@ -136,13 +155,19 @@ class InteractionAgentRuntime:
         self,
         system_prompt: str,
         messages: List[Dict[str, Any]],
+        on_event: Optional[StreamEventSink] = None,
     ) -> _LoopSummary:
         """Iteratively query the LLM until it issues a final response."""
 
         summary = _LoopSummary()
+        # Execution agents started during this turn report back as one batch
+        turn_id = uuid.uuid4().hex
 
         for iteration in range(self.MAX_TOOL_ITERATIONS):
-            response = await self._make_llm_call(system_prompt, messages)
+            if on_event is not None:
+                response = await self._make_streaming_llm_call(system_prompt, messages, on_event)
+            else:
+                response = await self._make_llm_call(system_prompt, messages)
             assistant_message = self._extract_assistant_message(response)
 
             assistant_content = (assistant_message.get("content") or "").strip()
@@ -161,6 +186,10 @@ class InteractionAgentRuntime:
             messages.append(assistant_entry)
 
             if not parsed_tool_calls:
+                # Text from turns that call tools, or that follows a user-facing message, is
+                # never shown or recorded, so only a final reply without either is streamed
+                if on_event is not None and assistant_content and not summary.user_messages:
+                    on_event({"type": "delta", "text": assistant_content})
                 break
 
             for tool_call in parsed_tool_calls:
@@ -171,7 +200,7 @@ class InteractionAgentRuntime:
                     if isinstance(agent_name, str) and agent_name:
                         summary.execution_agents.add(agent_name)
 
-                result = self._execute_tool(tool_call)
+                result = self._execute_tool(tool_call, turn_id)
 
                 if result.user_message:
                     summary.user_messages.append(result.user_message)
@@ -216,7 +245,50 @@ class InteractionAgentRuntime:
             system=system_prompt,
             api_key=self.api_key,
             tools=self.tool_schemas,
+            priority=Priority.INTERACTIVE,
+            caller="interaction_agent",
+            cache_static_prefix=True,
+        )
+
+    # Stream an LLM call, forwarding user-facing messages as they arrive
+    async def _make_streaming_llm_call(
+        self,
+        system_prompt: str,
+        messages: List[Dict[str, Any]],
+        on_event: StreamEventSink,
+    ) -> Dict[str, Any]:
+        """Make a streaming LLM call and return the assembled response.
+
+        Assistant text is not forwarded here: until the stream ends it is not
+        known whether the turn calls tools, so the loop emits it afterwards.
+        """
+
+        logger.debug(
+            "Interaction agent streaming LLM",
+            extra={"model": self.model, "tools": len(self.tool_schemas)},
         )
+        response: Dict[str, Any] = {}
+        async for event in stream_chat_completion(
+            model=self.model,
+            messages=messages,
+            system=system_prompt,
+            api_key=self.api_key,
+            tools=self.tool_schemas,
+            priority=Priority.INTERACTIVE,
+            caller="interaction_agent",
+            cache_static_prefix=True,
+        ):
+            if event["type"] == "tool_call":
+                function_block = event["tool_call"].get("function") or {}
+                if function_block.get("name") != "send_message_to_user":
+                    continue
+                arguments, error = self._parse_tool_arguments(function_block.get("arguments"))
+                message = arguments.get("message")
+                if not error and isinstance(message, str) and message:
+                    on_event({"type": "message", "text": message})
+            elif event["type"] == "done":
+                response = event["response"]
+        return response
 
     # Extract the assistant's message from the OpenRouter API response structure
     def _extract_assistant_message(self, response: Dict[str, Any]) -> Dict[str, Any]:
@@ -284,7 +356,7 @@ class InteractionAgentRuntime:
         return {}, f"unsupported argument type: {type(raw_arguments).__name__}"
 
     # Execute tool calls with error handling and logging, returning standardized results
-    def _execute_tool(self, tool_call: _ToolCall) -> ToolResult:
+    def _execute_tool(self, tool_call: _ToolCall, turn_id: Optional[str] = None) -> ToolResult:
         """Execute a tool call and convert low-level errors into structured results."""
 
         if "__invalid_arguments__" in tool_call.arguments:
@@ -294,7 +366,7 @@ class InteractionAgentRuntime:
 
         try:
             self._log_tool_invocation(tool_call, stage="start")
-            result = handle_tool_call(tool_call.name, tool_call.arguments)
+            result = handle_tool_call(tool_call.name, tool_call.arguments, turn_id=turn_id)
         except Exception as exc:  # pragma: no cover - defensive
             logger.error(
                 "Tool execution crashed",
@@ -345,16 +417,7 @@ class InteractionAgentRuntime:
             key = "result" if result.success else "error"
             payload[key] = result.payload
 
-        return self._safe_json_dump(payload)
-
-    # Safely serialize objects to JSON with fallback to string representation
-    def _safe_json_dump(self, payload: Any) -> str:
-        """Serialize payload to JSON, falling back to repr on failure."""
-
-        try:
-            return json.dumps(payload, default=str)
-        except TypeError:
-            return repr(payload)
+        return self.tool_results.render(payload, expandable=False)
 
     # Log tool execution stages (start, done, error) with structured metadata
     def _log_tool_invocation(
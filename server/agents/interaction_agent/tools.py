@@ -1,6 +1,7 @@
 """Tool definitions for interaction agent."""
 
 import asyncio
+import hashlib
 import json
 from dataclasses import dataclass
 from typing import Any, Optional
@@ -8,7 +9,7 @@ from typing import Any, Optional
 from ...logging_config import logger
 from ...services.conversation import get_conversation_log
 from ...services.execution import get_agent_roster, get_execution_agent_logs
-from ..execution_agent.batch_manager import ExecutionBatchManager
+from ..execution_agent.batch_manager import get_execution_batch_manager
 
 
 @dataclass
@@ -41,6 +42,28 @@ TOOL_SCHEMAS = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "cancel_agent",
+            "description": "Stop an execution agent's in-progress work, e.g. when the user changes their mind. Its partial progress is reported back.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Name of the execution agent whose running task should be stopped.",
+                    },
+                    "reason": {
+                        "type": "string",
+                        "description": "Short reason for stopping (e.g., 'User no longer wants the email sent').",
+                    },
+                },
+                "required": ["agent_name"],
+                "additionalProperties": False,
+            },
+        },
+    },
     {
         "type": "function",
         "function": {
@@ -105,12 +128,29 @@ TOOL_SCHEMAS = [
     },
 ]
 
-_EXECUTION_BATCH_MANAGER = ExecutionBatchManager()
-
-
 # Create or reuse execution agent and dispatch instructions asynchronously
-def send_message_to_agent(agent_name: str, instructions: str) -> ToolResult:
-    """Send instructions to an execution agent."""
+def send_message_to_agent(
+    agent_name: str,
+    instructions: str,
+    *,
+    turn_id: Optional[str] = None,
+) -> ToolResult:
+    """Send instructions to an execution agent.
+
+    Agents dispatched during the same interaction turn (``turn_id``) report
+    back as one batch.
+    """
+    manager = get_execution_batch_manager()
+    if not manager.can_accept():
+        logger.warning(f"Execution pool saturated; not dispatching to {agent_name}")
+        return ToolResult(
+            success=False,
+            payload={
+                "error": "Too many agents are already running. Tell the user to try again shortly.",
+                "agent_name": agent_name,
+            },
+        )
+
     roster = get_agent_roster()
     roster.load()
     existing_agents = set(roster.get_agents())
@@ -124,9 +164,20 @@ def send_message_to_agent(agent_name: str, instructions: str) -> ToolResult:
     action = "Created" if is_new else "Reused"
     logger.info(f"{action} agent: {agent_name}")
 
+    # A repeated identical call within one turn must not start the agent twice
+    idempotency_key = None
+    if turn_id:
+        digest = hashlib.sha256(f"{agent_name}\n{instructions}".encode("utf-8")).hexdigest()[:32]
+        idempotency_key = f"{turn_id}:{digest}"
+
     async def _execute_async() -> None:
         try:
-            result = await _EXECUTION_BATCH_MANAGER.execute_agent(agent_name, instructions)
+            result = await manager.execute_agent(
+                agent_name,
+                instructions,
+                batch_key=turn_id,
+                idempotency_key=idempotency_key,
+            )
             status = "SUCCESS" if result.success else "FAILED"
             logger.info(f"Agent '{agent_name}' completed: {status}")
         except Exception as exc:  # pragma: no cover - defensive
@@ -150,6 +201,30 @@ def send_message_to_agent(agent_name: str, instructions: str) -> ToolResult:
     )
 
 
+# Stop an execution agent's queued or running work
+def cancel_agent(agent_name: str, reason: Optional[str] = None) -> ToolResult:
+    """Cancel in-flight executions for ``agent_name``."""
+    cancelled = get_execution_batch_manager().cancel(
+        agent_name=agent_name,
+        reason=reason or "cancelled by the interaction agent",
+    )
+    if not cancelled:
+        return ToolResult(
+            success=False,
+            payload={"error": f"No running work found for agent '{agent_name}'", "agent_name": agent_name},
+        )
+
+    logger.info(f"Cancelled {len(cancelled)} execution(s) for agent: {agent_name}")
+    return ToolResult(
+        success=True,
+        payload={
+            "status": "cancelling",
+            "agent_name": agent_name,
+            "cancelled": len(cancelled),
+        },
+    )
+
+
 # Send immediate message to user and record in conversation history
 def send_message_to_user(message: str) -> ToolResult:
     """Record a user-visible reply in the conversation log."""
@@ -215,7 +290,7 @@ def get_tool_schemas():
 
 
 # Route tool calls to appropriate handlers with argument validation and error handling
-def handle_tool_call(name: str, arguments: Any) -> ToolResult:
+def handle_tool_call(name: str, arguments: Any, *, turn_id: Optional[str] = None) -> ToolResult:
     """Handle tool calls from interaction agent."""
     try:
         if isinstance(arguments, str):
@@ -226,7 +301,9 @@ def handle_tool_call(name: str, arguments: Any) -> ToolResult:
             return ToolResult(success=False, payload={"error": "Invalid arguments format"})
 
         if name == "send_message_to_agent":
-            return send_message_to_agent(**args)
+            return send_message_to_agent(**args, turn_id=turn_id)
+        if name == "cancel_agent":
+            return cancel_agent(**args)
         if name == "send_message_to_user":
             return send_message_to_user(**args)
         if name == "send_draft":
@@ -8,9 +8,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .config import get_settings
+from .gemini_client import close_http_client, open_http_client
 from .logging_config import configure_logging, logger
 from .routes import api_router
 from .services import get_trigger_scheduler
+from .agents.execution_agent.batch_manager import get_execution_batch_manager
+from .services.execution import import_legacy_execution_logs
 
 
 # Register global exception handlers for consistent error responses across the API
@@ -65,6 +68,35 @@ register_exception_handlers(app)
 app.include_router(api_router)
 
 
+@app.on_event("startup")
+# Point out settings that have no effect in the current configuration
+async def _warn_on_inert_settings() -> None:
+    if _settings.execution_history_requests > 0 and _settings.execution_summary_threshold <= 0:
+        logger.warning(
+            "EXECUTION_HISTORY_REQUESTS has no effect while EXECUTION_SUMMARY_THRESHOLD=0; "
+            "execution agents load their whole log",
+            extra={"execution_history_requests": _settings.execution_history_requests},
+        )
+
+
+@app.on_event("startup")
+# Open the pooled Gemini HTTP client so LLM calls reuse warm connections
+async def _open_gemini_client() -> None:
+    await open_http_client()
+
+
+@app.on_event("startup")
+# Carry file-backend execution journals into SQLite before any agent reads its history
+async def _import_execution_logs() -> None:
+    await import_legacy_execution_logs()
+
+
+@app.on_event("startup")
+# Resume durable execution work left behind by a previous process
+async def _start_execution_queue() -> None:
+    await get_execution_batch_manager().start()
+
+
 @app.on_event("startup")
 # Initialize background services (trigger scheduler) when the app starts
 async def _start_trigger_scheduler() -> None:
@@ -79,4 +111,16 @@ async def _stop_trigger_scheduler() -> None:
     await scheduler.stop()
 
 
+@app.on_event("shutdown")
+# Stop renewing execution leases; unfinished jobs are resumed on the next start
+async def _stop_execution_queue() -> None:
+    await get_execution_batch_manager().shutdown()
+
+
+@app.on_event("shutdown")
+# Close pooled Gemini connections after background services have stopped
+async def _close_gemini_client() -> None:
+    await close_http_client()
+
+
 __all__ = ["app"]
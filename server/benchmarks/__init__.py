@@ -0,0 +1,5 @@
+"""Offline micro-benchmarks for hot paths in the server.
+
+Run a benchmark as a module from the repository root, for example
+``python -m server.benchmarks.tool_declarations``.
+"""
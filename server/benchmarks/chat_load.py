@@ -0,0 +1,182 @@
+"""Drive /api/v1/chat/send at increasing concurrency against the local Gemini stub.
+
+Starts the stub on a free port with a scripted interaction turn (one
+``send_message_to_user`` call, then a final answer), points the server at it
+through the ``gemini_base_url`` setting and, for each concurrency level, submits batches
+of chat messages and waits for every interaction turn to finish. Throughput
+that stops growing with concurrency marks where the loop saturates.
+
+Note: turns are appended to the local conversation log under ``server/data``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import uvicorn
+
+_DEFAULT_SCRIPT = {
+    "scripts": [
+        {
+            "match": "",
+            "turns": [
+                {"functionCall": {"name": "send_message_to_user", "args": {"message": "On it."}}},
+                {"text": ""},
+            ],
+        }
+    ]
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_stub(args: argparse.Namespace, port: int) -> uvicorn.Server:
+    from ..gemini_stub import create_app
+
+    script_path = args.script
+    if script_path is None:
+        handle = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        json.dump(_DEFAULT_SCRIPT, handle)
+        handle.close()
+        script_path = Path(handle.name)
+
+    app = create_app(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_statuses=(429, 503),
+        script_path=script_path,
+        fixtures_dir=args.fixtures,
+        seed=args.seed,
+    )
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def _drain(baseline: set) -> None:
+    """Wait until every task spawned since ``baseline`` (the agent turns) has finished."""
+    current = asyncio.current_task()
+    while True:
+        pending = [task for task in asyncio.all_tasks() if task is not current and task not in baseline]
+        if not pending:
+            return
+        await asyncio.wait(pending)
+
+
+async def _run_level(client: httpx.AsyncClient, level: int, rounds: int) -> Dict[str, Any]:
+    from ..config import get_settings
+    from ..llm import get_llm_limiter
+
+    model = get_settings().interaction_agent_model
+    before = get_llm_limiter().metrics().get(model, {})
+    batch_seconds: List[float] = []
+    baseline = set(asyncio.all_tasks())
+
+    started = time.perf_counter()
+    for round_index in range(rounds):
+        batch_started = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                client.post(
+                    "/api/v1/chat/send",
+                    json={"messages": [{"role": "user", "content": f"load test {level}-{round_index}-{index}"}]},
+                )
+                for index in range(level)
+            )
+        )
+        rejected = [response.status_code for response in responses if response.status_code != 202]
+        if rejected:
+            raise RuntimeError(f"chat/send rejected requests: {rejected[:5]}")
+        await _drain(baseline)
+        batch_seconds.append(time.perf_counter() - batch_started)
+    elapsed = time.perf_counter() - started
+
+    after = get_llm_limiter().metrics().get(model, {})
+    granted = after.get("granted", 0) - before.get("granted", 0)
+    waited = after.get("avg_wait_seconds", 0.0) * after.get("granted", 0) - before.get(
+        "avg_wait_seconds", 0.0
+    ) * before.get("granted", 0)
+    turns = level * rounds
+    ordered = sorted(batch_seconds)
+    return {
+        "level": level,
+        "turns": turns,
+        "turns_per_second": turns / elapsed,
+        "batch_p50_ms": statistics.median(ordered) * 1000,
+        "batch_p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000,
+        "llm_calls_per_turn": granted / turns if turns else 0.0,
+        "avg_queue_wait_ms": (waited / granted * 1000) if granted else 0.0,
+    }
+
+
+async def _benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    from ..app import app
+    from ..gemini_client import close_http_client
+
+    transport = httpx.ASGITransport(app=app)
+    results: List[Dict[str, Any]] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for level in args.levels:
+            results.append(await _run_level(client, level, args.rounds))
+    await close_http_client()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--levels",
+        type=lambda raw: [int(value) for value in raw.split(",")],
+        default=[1, 2, 4, 8, 16, 32],
+        help="Comma-separated concurrency levels (default: 1,2,4,8,16,32)",
+    )
+    parser.add_argument("--rounds", type=int, default=5, help="Batches per level")
+    parser.add_argument("--latency", default="lognormal:0.4,0.5", help="Stub latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub error injection rate")
+    parser.add_argument("--script", type=Path, default=None, help="Custom stub script (JSON)")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Replay recorded fixtures")
+    parser.add_argument("--seed", type=int, default=7, help="Stub sampling seed")
+    args = parser.parse_args()
+
+    from ..config import get_settings
+
+    # Settings read the environment at import time, so point the live instance at the stub
+    port = _free_port()
+    settings = get_settings()
+    settings.gemini_base_url = f"http://127.0.0.1:{port}/v1beta"
+    settings.gemini_api_key = settings.gemini_api_key or "stub-key"
+
+    stub = _start_stub(args, port)
+    try:
+        results = asyncio.run(_benchmark(args))
+        stats = httpx.get(f"http://127.0.0.1:{port}/_stub/stats").json()
+    finally:
+        stub.should_exit = True
+
+    print(f"{'level':>5} {'turns':>6} {'turns/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'calls/turn':>10} {'queue ms':>9}")
+    for row in results:
+        print(
+            f"{row['level']:>5} {row['turns']:>6} {row['turns_per_second']:>8.2f} {row['batch_p50_ms']:>8.0f}"
+            f" {row['batch_p95_ms']:>8.0f} {row['llm_calls_per_turn']:>10.2f} {row['avg_queue_wait_ms']:>9.0f}"
+        )
+    print(f"stub: {stats}")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
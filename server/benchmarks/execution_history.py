@@ -0,0 +1,82 @@
+"""Time to load an execution agent's recent history: full log parse vs indexed file vs SQLite.
+
+Writes a synthetic journal of ``--requests`` requests (each with a few
+actions, tool responses and a reply) to a temporary directory, then times
+building the history for the last ``--limit`` requests three ways: parsing
+the whole log and cutting at the limit (the original behaviour), reading
+from the indexed offset of the limit-th newest request in the file
+backend, and a request range query against the same journal migrated
+into the SQLite backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from ..services.execution.log_backends import FileLogBackend, SQLiteLogBackend
+from ..services.execution.log_store import ExecutionAgentLogStore
+from ..services.execution.migrate_logs import migrate_file_logs
+
+_AGENT = "Daily inbox digest"
+
+
+def _populate(store: ExecutionAgentLogStore, requests: int) -> None:
+    for index in range(requests):
+        store.record_request(_AGENT, f"Summarise today's unread email ({index}) and flag anything urgent.")
+        store.record_action(_AGENT, f"Calling task_email_search with query=is:unread newer_than:1d ({index})")
+        emails = ", ".join(f'{{"id": "18e{index:05x}{n:02d}", "subject": "Invoice {n}"}}' for n in range(20))
+        store.record_tool_response(_AGENT, "task_email_search", f"[{emails}]")
+        store.record_action(_AGENT, "Calling gmail_list_drafts with max_results=5")
+        store.record_tool_response(_AGENT, "gmail_list_drafts", "{\"drafts\": []}")
+        store.record_agent_response(_AGENT, f"Digest {index}: 20 unread, 1 urgent (invoice overdue).")
+
+
+def _full_parse(store: ExecutionAgentLogStore, limit: int) -> str:
+    lines = store.load_transcript(_AGENT).split("\n")
+    kept = 0
+    for index in range(len(lines) - 1, -1, -1):
+        if "<agent_request" in lines[index]:
+            kept += 1
+            if kept == limit:
+                return "\n".join(lines[index:])
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, nargs="+", default=[100, 1000, 10000], help="Log sizes")
+    parser.add_argument("--limit", type=int, default=30, help="Requests kept in the history")
+    parser.add_argument("--number", type=int, default=20, help="Loads per timing run")
+    args = parser.parse_args()
+
+    print(f"{'requests':>9} {'log KB':>8} {'full ms':>8} {'indexed ms':>11} {'sqlite ms':>10}")
+    for requests in args.requests:
+        with tempfile.TemporaryDirectory() as directory:
+            file_backend = FileLogBackend(Path(directory))
+            sqlite_backend = SQLiteLogBackend(Path(directory) / "execution_logs.db")
+            store = ExecutionAgentLogStore(file_backend)
+            sqlite_store = ExecutionAgentLogStore(sqlite_backend)
+            _populate(store, requests)
+            migrate_file_logs(file_backend, sqlite_backend)
+            expected = _full_parse(store, args.limit)
+            assert expected == store.load_transcript(_AGENT, max_requests=args.limit)
+            assert expected == sqlite_store.load_transcript(_AGENT, max_requests=args.limit)
+            size_kb = (Path(directory) / "daily-inbox-digest.log").stat().st_size / 1024
+
+            full = timeit.timeit(lambda: _full_parse(store, args.limit), number=args.number) / args.number
+            indexed = timeit.timeit(
+                lambda: store.load_transcript(_AGENT, max_requests=args.limit), number=args.number
+            ) / args.number
+            queried = timeit.timeit(
+                lambda: sqlite_store.load_transcript(_AGENT, max_requests=args.limit), number=args.number
+            ) / args.number
+            print(
+                f"{requests:>9} {size_kb:>8.0f} {full * 1000:>8.2f} {indexed * 1000:>11.2f} {queried * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
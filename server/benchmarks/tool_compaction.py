@@ -0,0 +1,120 @@
+"""Request bytes per iteration of an email-search loop with and without tool-result compaction.
+
+Replays a scripted search (two Gmail searches, one expansion, completion)
+over synthetic emails and measures the Gemini request body sent on each
+iteration. Without compaction every search result is resent in full on
+every later iteration; with it only the digests are, plus the one page the
+model asked for.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..agents.execution_agent.tasks.search_email.gmail_internal import GMAIL_FETCH_EMAILS_SCHEMA
+from ..agents.execution_agent.tasks.search_email.schemas import (
+    COMPLETE_TOOL_NAME,
+    SEARCH_TOOL_NAME,
+    EmailSearchToolResult,
+    GmailSearchEmail,
+    get_completion_schema,
+)
+from ..agents.execution_agent.tasks.search_email.system_prompt import get_system_prompt
+from ..gemini_client.client import _build_request
+from ..llm.compaction import EXPAND_TOOL_NAME, ToolResultStore
+
+_BASE_TOOLS = [GMAIL_FETCH_EMAILS_SCHEMA, get_completion_schema()]
+
+_PARAGRAPH = (
+    "Hi team, following up on the invoice we discussed last week. The attached statement covers "
+    "the March billing cycle, including the prorated seats and the support add-on. Let me know if "
+    "anything looks off before the payment run on Friday. "
+)
+
+
+def _emails(query: str, count: int, text_chars: int, offset: int) -> List[GmailSearchEmail]:
+    sent = datetime(2025, 3, 28, 9, 30, tzinfo=timezone.utc)
+    text = (_PARAGRAPH * (text_chars // len(_PARAGRAPH) + 1))[:text_chars]
+    return [
+        GmailSearchEmail(
+            id=f"18e{offset + index:013x}",
+            thread_id=f"18e{offset + index:013x}",
+            query=query,
+            subject=f"Invoice #{4100 + offset + index} for March",
+            sender="Billing <billing@acme.example>",
+            recipient="me@example.com",
+            timestamp=sent - timedelta(days=offset + index),
+            label_ids=["INBOX", "CATEGORY_UPDATES"],
+            clean_text=text,
+            has_attachments=True,
+            attachment_count=1,
+            attachment_filenames=[f"invoice-{4100 + offset + index}.pdf"],
+        )
+        for index in range(count)
+    ]
+
+
+def _call(call_id: str, name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def _script(count: int, text_chars: int) -> List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """(tool, arguments, search payload) per model turn."""
+    steps = []
+    for index, query in enumerate(("from:acme invoice", "acme billing newer_than:90d")):
+        result = EmailSearchToolResult(
+            status="success",
+            query=query,
+            result_count=count,
+            messages=_emails(query, count, text_chars, offset=index * count),
+        )
+        arguments = {"query": query, "max_results": count}
+        steps.append((SEARCH_TOOL_NAME, arguments, result.model_dump(exclude_none=True)))
+    steps.append((EXPAND_TOOL_NAME, {"handle": "r1", "path": "messages.0.clean_text"}, None))
+    steps.append((COMPLETE_TOOL_NAME, {"message_ids": [f"18e{0:013x}"]}, None))
+    return steps
+
+
+def _replay(count: int, text_chars: int, inline_chars: int) -> List[int]:
+    """Request body bytes for each LLM call of the scripted search."""
+    results = ToolResultStore(inline_chars=inline_chars)
+    messages: List[Dict[str, Any]] = [{"role": "user", "content": "Please help me find emails: acme invoices"}]
+    sizes: List[int] = []
+    for turn, (tool, arguments, payload) in enumerate(_script(count, text_chars)):
+        request = _build_request(messages, get_system_prompt(), results.tools_with_expansion(_BASE_TOOLS))
+        sizes.append(len(request.encode()))
+        if tool == COMPLETE_TOOL_NAME:
+            break
+        call_id = f"call_{turn}"
+        messages.append({"role": "assistant", "content": "", "tool_calls": [_call(call_id, tool, arguments)]})
+        if payload is not None:
+            content = results.render(payload)
+        else:
+            _, page = results.expand(arguments["handle"], arguments.get("path"))
+            content = json.dumps(page, ensure_ascii=False)
+        messages.append({"role": "tool", "tool_call_id": call_id, "content": content})
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=10, help="Emails returned per search")
+    parser.add_argument("--text-chars", type=int, default=3000, help="clean_text length per email")
+    parser.add_argument("--inline-chars", type=int, default=8000, help="Compaction threshold")
+    args = parser.parse_args()
+
+    full = _replay(args.emails, args.text_chars, inline_chars=0)
+    compact = _replay(args.emails, args.text_chars, inline_chars=args.inline_chars)
+
+    print(f"{args.emails} emails/search, {args.text_chars} chars/email, inline limit {args.inline_chars}")
+    print(f"{'iteration':>9} {'full bytes':>11} {'compact bytes':>14} {'saved':>6}")
+    for index, (full_bytes, compact_bytes) in enumerate(zip(full, compact), start=1):
+        print(f"{index:>9} {full_bytes:>11} {compact_bytes:>14} {1 - compact_bytes / full_bytes:>6.0%}")
+    print(f"{'total':>9} {sum(full):>11} {sum(compact):>14} {1 - sum(compact) / sum(full):>6.0%}")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
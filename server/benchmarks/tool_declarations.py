@@ -0,0 +1,50 @@
+"""Per-call cost of building a Gemini request for the full execution-agent tool set.
+
+Compares the original path (convert every schema, then serialize the whole
+payload) with the memoized, pre-serialized tools block.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from ..agents.execution_agent.tools import get_tool_schemas
+from ..gemini_client.client import _build_request, _convert_messages_to_gemini, _convert_tools_to_gemini
+
+_MESSAGES = [{"role": "user", "content": "Check my ring battery and summarise last night's sleep."}]
+_SYSTEM = "You are an execution agent."
+
+
+def _uncached_body() -> bytes:
+    contents, system_instruction = _convert_messages_to_gemini(_MESSAGES, _SYSTEM)
+    payload = {
+        "contents": contents,
+        "systemInstruction": {"parts": [{"text": system_instruction}]},
+        "tools": _convert_tools_to_gemini(get_tool_schemas()),
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _memoized_body() -> bytes:
+    return _build_request(_MESSAGES, _SYSTEM, get_tool_schemas()).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs (best is reported)")
+    args = parser.parse_args()
+
+    assert json.loads(_uncached_body()) == json.loads(_memoized_body())
+
+    tools = get_tool_schemas()
+    print(f"execution-agent tools: {len(tools)}, body size: {len(_memoized_body())} bytes")
+    for label, func in (("uncached", _uncached_body), ("memoized", _memoized_body)):
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        print(f"{label:>9}: {best / args.number * 1e6:8.1f} µs/call")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
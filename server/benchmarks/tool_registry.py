@@ -0,0 +1,76 @@
+"""Per-run cost of assembling the execution-agent tool registry and schemas.
+
+Compares rebuilding both from every tool module (the original per-runtime
+path) with the cached schemas and per-agent bound registries. Reports the
+one-off cold build, then time and allocated bytes per simulated run for a
+warm agent and for a rotating set of agents.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+from itertools import count
+from typing import Callable
+
+from ..agents.execution_agent.tools import registry
+
+
+def _uncached_run(agent_name: str) -> None:
+    registry._build_tool_schemas()
+    registry._build_tool_registry(agent_name)
+    frozenset(
+        {*registry.gmail.SERIAL_TOOLS, *registry.triggers.SERIAL_TOOLS, *registry.ultrahuman_tools.SERIAL_TOOLS}
+    )
+
+
+def _cached_run(agent_name: str) -> None:
+    registry.get_tool_schemas()
+    registry.get_tool_registry(agent_name)
+    registry.get_serial_tool_names()
+
+
+def _allocated_bytes(func: Callable[[], None], runs: int) -> float:
+    func()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    worst = 0
+    for _ in range(runs):
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        worst = max(worst, peak)
+    tracemalloc.stop()
+    # Peak over baseline approximates what one run allocates before it is freed
+    return worst - baseline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Runs per timing pass")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing passes (best is reported)")
+    parser.add_argument("--agents", type=int, default=32, help="Distinct agents in the rotating case")
+    args = parser.parse_args()
+
+    registry.invalidate_tool_registry()
+    cold = timeit.timeit(lambda: _cached_run("cold-agent"), number=1)
+    tools = registry.get_tool_schemas()
+    bound = registry.get_tool_registry("cold-agent")
+    print(f"tools: {len(tools)} schemas, {len(bound)} callables; cold build: {cold * 1e3:.2f} ms")
+
+    rotation = count()
+    cases = (
+        ("uncached", lambda: _uncached_run("agent")),
+        ("cached (same agent)", lambda: _cached_run("agent")),
+        ("cached (rotating)", lambda: _cached_run(f"agent-{next(rotation) % args.agents}")),
+    )
+    print(f"{'case':>20} {'µs/run':>9} {'bytes/run':>10}")
+    for label, func in cases:
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        allocated = _allocated_bytes(func, runs=200)
+        print(f"{label:>20} {best / args.number * 1e6:9.1f} {allocated:10.0f}")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
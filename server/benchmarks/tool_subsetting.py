@@ -0,0 +1,111 @@
+"""Prompt tokens and request cost saved by intent-scoped execution-agent tool subsets.
+
+For a set of representative agent requests, compares sending every tool
+schema with the subset chosen by ``select_tools``: estimated tool tokens,
+Gemini request body size and the time to build the request (including the
+selection itself). With ``--live`` and ``GEMINI_API_KEY`` set it also sends
+each variant to Gemini and reports the provider's prompt token count and
+median latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from ..agents.execution_agent.tools import get_tool_schemas
+from ..agents.execution_agent.tools.selection import select_tools
+from ..gemini_client.client import _build_request
+from ..llm.tokens import estimate_tools_tokens
+
+_SYSTEM = "You are an execution agent."
+
+_CASES: List[Tuple[str, str]] = [
+    ("Email to Sarah about Friday", "Draft a reply to Sarah's last email saying Friday works."),
+    ("Sleep summary", "Summarise my sleep and HRV from last night."),
+    ("Ring battery", "My ring battery drains fast, what should I check?"),
+    ("Morning reminder", "Remind me every weekday at 8am to stretch."),
+    ("Receipts", "Find the Uber receipts in my inbox from March."),
+    ("Warranty question", "Is my ring still under warranty and how do returns work?"),
+    ("Misc", "What's the capital of Portugal?"),
+]
+
+
+def _messages(instructions: str) -> List[Dict[str, Any]]:
+    return [{"role": "user", "content": instructions}]
+
+
+async def _live(name: str, instructions: str, tools: List[Dict[str, Any]], runs: int) -> Tuple[int, float]:
+    from ..config import get_settings
+    from ..llm import request_chat_completion
+
+    settings = get_settings()
+    latencies: List[float] = []
+    prompt_tokens = 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = await request_chat_completion(
+            model=settings.execution_agent_model,
+            messages=_messages(instructions),
+            system=_SYSTEM,
+            api_key=settings.gemini_api_key,
+            tools=tools,
+            caller=f"benchmark:{name}",
+        )
+        latencies.append(time.perf_counter() - started)
+        prompt_tokens = response["usage"]["prompt_tokens"]
+    return prompt_tokens, statistics.median(latencies) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=500, help="Builds per timing run")
+    parser.add_argument("--live", action="store_true", help="Also call Gemini (needs GEMINI_API_KEY)")
+    parser.add_argument("--runs", type=int, default=3, help="Live calls per variant")
+    args = parser.parse_args()
+
+    full = get_tool_schemas()
+    full_tokens = estimate_tools_tokens(full)
+    full_bytes = len(_build_request(_messages(""), _SYSTEM, full).encode())
+    print(f"full tool set: {len(full)} tools, ~{full_tokens} tokens, {full_bytes} request bytes")
+    print(f"{'case':>28} {'tools':>5} {'~tokens':>8} {'saved':>6} {'bytes':>7} {'full µs':>8} {'subset µs':>9}")
+
+    saved_total = 0
+    for name, instructions in _CASES:
+        selection = select_tools(name, instructions)
+        subset = selection.schemas()
+        tokens = estimate_tools_tokens(subset)
+        saved_total += full_tokens - tokens
+        body = _build_request(_messages(instructions), _SYSTEM, subset).encode()
+
+        full_time = timeit.timeit(
+            lambda: _build_request(_messages(instructions), _SYSTEM, full).encode(), number=args.number
+        )
+        subset_time = timeit.timeit(
+            lambda: _build_request(
+                _messages(instructions), _SYSTEM, select_tools(name, instructions).schemas()
+            ).encode(),
+            number=args.number,
+        )
+        print(
+            f"{name:>28} {len(subset):>5} {tokens:>8} {1 - tokens / full_tokens:>6.0%} {len(body):>7}"
+            f" {full_time / args.number * 1e6:>8.1f} {subset_time / args.number * 1e6:>9.1f}"
+        )
+
+        if args.live:
+            full_prompt, full_ms = asyncio.run(_live(name, instructions, full, args.runs))
+            subset_prompt, subset_ms = asyncio.run(_live(name, instructions, subset, args.runs))
+            print(
+                f"{'':>28} live prompt tokens {full_prompt} -> {subset_prompt},"
+                f" median latency {full_ms:.0f} ms -> {subset_ms:.0f} ms"
+            )
+
+    print(f"average estimated tool tokens saved per call: {saved_total / len(_CASES):.0f}")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
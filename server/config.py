@@ -1,9 +1,10 @@
 """Simplified configuration management."""
 
+import json
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -39,6 +40,13 @@ def _env_int(name: str, fallback: int) -> int:
         return fallback
 
 
+def _env_float(name: str, fallback: float) -> float:
+    try:
+        return float(os.getenv(name, str(fallback)))
+    except (TypeError, ValueError):
+        return fallback
+
+
 class Settings(BaseModel):
     """Application settings with lightweight env fallbacks."""
 
@@ -56,6 +64,97 @@ class Settings(BaseModel):
     execution_agent_search_model: str = Field(default="gemini-2.0-flash")
     summarizer_model: str = Field(default="gemini-2.0-flash")
 
+    # Gemini endpoint (point at a local stub with e.g. http://127.0.0.1:8089/v1beta)
+    gemini_base_url: str = Field(default=os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta"))
+
+    # Gemini HTTP transport (shared pooled client)
+    gemini_http2: bool = Field(default=os.getenv("GEMINI_HTTP2", "1") != "0")
+    gemini_max_connections: int = Field(default=_env_int("GEMINI_MAX_CONNECTIONS", 20))
+    gemini_max_keepalive_connections: int = Field(default=_env_int("GEMINI_MAX_KEEPALIVE_CONNECTIONS", 10))
+    gemini_keepalive_expiry_seconds: int = Field(default=_env_int("GEMINI_KEEPALIVE_EXPIRY_SECONDS", 60))
+    gemini_timeout_seconds: int = Field(default=_env_int("GEMINI_TIMEOUT_SECONDS", 60))
+
+    # Gemini server-side context caching for static system prompts and tool declarations
+    gemini_context_cache_enabled: bool = Field(default=os.getenv("GEMINI_CONTEXT_CACHE", "1") != "0")
+    gemini_context_cache_ttl_seconds: int = Field(default=_env_int("GEMINI_CONTEXT_CACHE_TTL_SECONDS", 3600))
+    gemini_context_cache_refresh_margin_seconds: int = Field(default=_env_int("GEMINI_CONTEXT_CACHE_REFRESH_MARGIN_SECONDS", 300))
+    gemini_context_cache_retry_seconds: int = Field(default=_env_int("GEMINI_CONTEXT_CACHE_RETRY_SECONDS", 900))
+
+    # LLM response cache (opt-in per caller; a TTL of 0 bypasses the cache)
+    llm_cache_max_entries: int = Field(default=_env_int("LLM_CACHE_MAX_ENTRIES", 256))
+    llm_cache_disk_enabled: bool = Field(default=os.getenv("LLM_CACHE_DISK", "1") != "0")
+    summarizer_cache_ttl_seconds: int = Field(default=_env_int("SUMMARIZER_CACHE_TTL_SECONDS", 3600))
+    email_search_cache_ttl_seconds: int = Field(default=_env_int("EMAIL_SEARCH_CACHE_TTL_SECONDS", 300))
+
+    # LLM admission control (shared across callers; 0 disables a limit, and all are off by default)
+    llm_max_concurrency: int = Field(default=_env_int("LLM_MAX_CONCURRENCY", 0))
+    llm_requests_per_minute: int = Field(default=_env_int("LLM_REQUESTS_PER_MINUTE", 0))
+    llm_tokens_per_minute: int = Field(default=_env_int("LLM_TOKENS_PER_MINUTE", 0))
+    llm_model_budgets_raw: str = Field(default=os.getenv("LLM_MODEL_BUDGETS", ""))
+
+    # LLM provider routing (Gemini first; OpenRouter used for failover/hedging when keyed)
+    llm_fallback_provider: str = Field(default=os.getenv("LLM_FALLBACK_PROVIDER", "openrouter"))
+    openrouter_fallback_model: str = Field(default=os.getenv("OPENROUTER_FALLBACK_MODEL", "google/gemini-2.0-flash-001"))
+    llm_health_window: int = Field(default=_env_int("LLM_HEALTH_WINDOW", 50))
+    llm_degraded_error_rate: float = Field(default=_env_float("LLM_DEGRADED_ERROR_RATE", 0.5))
+    llm_degraded_p95_seconds: float = Field(default=_env_float("LLM_DEGRADED_P95_SECONDS", 30.0))
+    llm_hedge_delay_seconds: float = Field(default=_env_float("LLM_HEDGE_DELAY_SECONDS", 0.0))
+    llm_singleflight_enabled: bool = Field(default=os.getenv("LLM_SINGLEFLIGHT", "1") != "0")
+
+    # LLM resilience (retries with jittered backoff; per-provider circuit breakers)
+    llm_retry_max_attempts: int = Field(default=_env_int("LLM_RETRY_MAX_ATTEMPTS", 3))
+    llm_retry_base_delay_seconds: float = Field(default=_env_float("LLM_RETRY_BASE_DELAY_SECONDS", 0.5))
+    llm_retry_max_delay_seconds: float = Field(default=_env_float("LLM_RETRY_MAX_DELAY_SECONDS", 20.0))
+    llm_breaker_failure_threshold: int = Field(default=_env_int("LLM_BREAKER_FAILURE_THRESHOLD", 5))
+    llm_breaker_reset_seconds: float = Field(default=_env_float("LLM_BREAKER_RESET_SECONDS", 30.0))
+
+    # Prompt budgeting (history is trimmed to fit; 0 budget means the full context window)
+    llm_prompt_budget_tokens: int = Field(default=_env_int("LLM_PROMPT_BUDGET_TOKENS", 64000))
+    llm_output_reserve_tokens: int = Field(default=_env_int("LLM_OUTPUT_RESERVE_TOKENS", 8192))
+
+    # LLM usage accounting (per-caller tokens and latency in data/llm_usage.db)
+    llm_usage_tracking_enabled: bool = Field(default=os.getenv("LLM_USAGE_TRACKING", "1") != "0")
+    llm_usage_retention_days: int = Field(default=_env_int("LLM_USAGE_RETENTION_DAYS", 7))
+
+    # Execution agent log storage: "sqlite" (data/execution_logs.db) or "file" (one journal per agent)
+    execution_log_backend: str = Field(default=os.getenv("EXECUTION_LOG_BACKEND", "sqlite"))
+
+    # Cap on past requests loaded into an execution agent's history once a rolling summary covers
+    # the older ones (0 = no cap). Ignored, with a startup warning, when summarization is off
+    execution_history_requests: int = Field(default=_env_int("EXECUTION_HISTORY_REQUESTS", 0))
+
+    # Execution agent deadlines (LLM and tool calls share the run's remaining time)
+    execution_timeout_seconds: int = Field(default=_env_int("EXECUTION_TIMEOUT_SECONDS", 90))
+    execution_wrapup_reserve_seconds: int = Field(default=_env_int("EXECUTION_WRAPUP_RESERVE_SECONDS", 10))
+
+    # Independent tool calls from one model turn run concurrently up to this cap (1 = serial)
+    execution_tool_concurrency: int = Field(default=_env_int("EXECUTION_TOOL_CONCURRENCY", 4))
+    # Send only the tool groups an agent's request is likely to need (expanded on demand)
+    execution_tool_subsetting: bool = Field(default=os.getenv("EXECUTION_TOOL_SUBSETTING", "1") != "0")
+    # Serve repeated read-only tool calls within a run from memory; optionally across runs for a TTL
+    execution_tool_memoization: bool = Field(default=os.getenv("EXECUTION_TOOL_MEMOIZATION", "1") != "0")
+    execution_tool_cache_ttl_seconds: int = Field(default=_env_int("EXECUTION_TOOL_CACHE_TTL_SECONDS", 0))
+
+    # Execution agents running at once (0 = unlimited) and how many more may wait for a worker
+    execution_max_concurrency: int = Field(default=_env_int("EXECUTION_MAX_CONCURRENCY", 4))
+    execution_queue_limit: int = Field(default=_env_int("EXECUTION_QUEUE_LIMIT", 16))
+
+    # Persist execution requests/results so restarts resume work instead of dropping it
+    execution_queue_durable: bool = Field(default=os.getenv("EXECUTION_QUEUE_DURABLE", "1") != "0")
+    execution_queue_lease_seconds: int = Field(default=_env_int("EXECUTION_QUEUE_LEASE_SECONDS", 30))
+    execution_queue_max_attempts: int = Field(default=_env_int("EXECUTION_QUEUE_MAX_ATTEMPTS", 3))
+    execution_queue_retention_days: int = Field(default=_env_int("EXECUTION_QUEUE_RETENTION_DAYS", 7))
+
+    # Deliver each execution result as it completes (results within the window are coalesced)
+    execution_result_streaming: bool = Field(default=os.getenv("EXECUTION_RESULT_STREAMING", "0") == "1")
+    execution_result_coalesce_seconds: float = Field(
+        default=_env_float("EXECUTION_RESULT_COALESCE_SECONDS", 1.0)
+    )
+
+    # Tool results longer than this are replaced by a digest plus a handle (0 = always inline)
+    tool_result_inline_chars: int = Field(default=_env_int("TOOL_RESULT_INLINE_CHARS", 8000))
+    tool_result_page_chars: int = Field(default=_env_int("TOOL_RESULT_PAGE_CHARS", 6000))
+
     # Credentials / integrations
     openrouter_api_key: Optional[str] = Field(default=os.getenv("OPENROUTER_API_KEY"))
     gemini_api_key: Optional[str] = Field(default=os.getenv("GEMINI_API_KEY"))
@@ -74,6 +173,9 @@ class Settings(BaseModel):
     # Summarisation controls
     conversation_summary_threshold: int = Field(default=100)
     conversation_summary_tail_size: int = Field(default=10)
+    # Execution logs: requests merged into an agent's summary per pass (0 disables), and kept verbatim
+    execution_summary_threshold: int = Field(default=_env_int("EXECUTION_SUMMARY_THRESHOLD", 20))
+    execution_summary_tail_requests: int = Field(default=_env_int("EXECUTION_SUMMARY_TAIL_REQUESTS", 10))
 
     @property
     def cors_allow_origins(self) -> List[str]:
@@ -82,6 +184,19 @@ class Settings(BaseModel):
             return ["*"]
         return [origin.strip() for origin in self.cors_allow_origins_raw.split(",") if origin.strip()]
 
+    @property
+    def llm_model_budgets(self) -> Dict[str, Dict[str, Any]]:
+        """Parse per-model overrides, e.g. {"gemini-2.0-flash": {"rpm": 2000, "tpm": 4000000, "concurrency": 16}}."""
+        if not self.llm_model_budgets_raw.strip():
+            return {}
+        try:
+            parsed = json.loads(self.llm_model_budgets_raw)
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+        return {str(model): limits for model, limits in parsed.items() if isinstance(limits, dict)}
+
     @property
     def resolved_docs_url(self) -> Optional[str]:
         """Return documentation URL when docs are enabled."""
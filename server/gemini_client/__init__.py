@@ -1,5 +1,14 @@
 """Gemini API client for LLM completions."""
 
-from .client import GeminiError, request_chat_completion
+from .cache import get_response_cache
+from .client import GeminiError, request_chat_completion, stream_chat_completion
+from .transport import close_http_client, open_http_client
 
-__all__ = ["GeminiError", "request_chat_completion"]
+__all__ = [
+    "GeminiError",
+    "close_http_client",
+    "get_response_cache",
+    "open_http_client",
+    "request_chat_completion",
+    "stream_chat_completion",
+]
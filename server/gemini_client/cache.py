@@ -0,0 +1,221 @@
+"""Content-addressed cache for Gemini responses with memory and SQLite tiers.
+
+Disk lookups run in a worker thread and stores are written by a background
+writer thread, so the SQLite tier never blocks the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..logging_config import logger
+
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+_DEFAULT_DB_PATH = _DATA_DIR / "llm_cache.db"
+
+# Delete expired rows once every this many stores
+_PRUNE_EVERY = 200
+
+
+def make_cache_key(model: str, body: bytes) -> str:
+    """Return a stable hash of the model and the serialized Gemini request body.
+
+    The body is produced deterministically from the converted payload, so
+    identical (model, system, messages, tools) inputs hash identically.
+    """
+    digest = hashlib.sha256(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Two-tier LRU cache: an in-process dict in front of a SQLite table."""
+
+    def __init__(self, db_path: Optional[Path], max_entries: int = 256) -> None:
+        self._db_path = db_path
+        self._max_entries = max(max_entries, 1)
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._writes = 0
+        # Rows waiting for the background writer
+        self._pending: List[Tuple[str, str, Dict[str, Any], float, float]] = []
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        if self._db_path is not None:
+            self._ensure_directory()
+            self._ensure_schema()
+
+    def _ensure_directory(self) -> None:
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("llm cache directory creation failed", extra={"error": str(exc)})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        schema_sql = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        """
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_llm_responses_expires
+        ON llm_responses (expires_at);
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(schema_sql)
+            conn.execute(index_sql)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached response, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return copy.deepcopy(response)
+                del self._memory[key]
+            if self._db_path is None:
+                self._stats["misses"] += 1
+                return None
+
+        row = await asyncio.to_thread(self._read, key, now)
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, response = row
+            self._remember(key, expires_at, response)
+            self._stats["disk_hits"] += 1
+            return copy.deepcopy(response)
+
+    def _read(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, expires_at FROM llm_responses WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("llm cache read failed", extra={"error": str(exc)})
+            return None
+        if row is None or row["expires_at"] <= now:
+            return None
+        return row["expires_at"], json.loads(row["response"])
+
+    def set(self, key: str, model: str, response: Dict[str, Any], ttl_seconds: float) -> None:
+        """Store a response in memory now and queue it for the disk tier."""
+        if ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl_seconds
+        stored = copy.deepcopy(response)
+        with self._lock:
+            self._remember(key, expires_at, stored)
+            self._stats["stores"] += 1
+        if self._db_path is None:
+            return
+        with self._pending_lock:
+            # The memory tier only hands out copies, so the writer can serialize this one
+            self._pending.append((key, model, stored, now, expires_at))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="llm-cache-writer", daemon=True)
+                self._writer.start()
+
+    # Drain queued rows until none are left, then let the thread exit
+    def _write_pending(self) -> None:
+        while True:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    self._writer = None
+                    return
+            self._write(batch)
+
+    def _write(self, batch: List[Tuple[str, str, Dict[str, Any], float, float]]) -> None:
+        rows = [
+            (key, model, json.dumps(response), created_at, expires_at)
+            for key, model, response, created_at, expires_at in batch
+        ]
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO llm_responses"
+                    " (cache_key, model, response, created_at, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                previous, self._writes = self._writes, self._writes + len(rows)
+                if previous // _PRUNE_EVERY != self._writes // _PRUNE_EVERY:
+                    conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+        except sqlite3.Error as exc:
+            logger.warning("llm cache write failed", extra={"error": str(exc), "rows": len(rows)})
+
+    def _remember(self, key: str, expires_at: float, response: Dict[str, Any]) -> None:
+        self._memory[key] = (expires_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current memory-tier size."""
+        with self._lock:
+            return {**self._stats, "memory_entries": len(self._memory)}
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending = []
+        with self._lock:
+            self._memory.clear()
+            if self._db_path is None:
+                return
+            try:
+                with self._connect() as conn:
+                    conn.execute("DELETE FROM llm_responses")
+            except sqlite3.Error as exc:
+                logger.warning("llm cache clear failed", extra={"error": str(exc)})
+
+
+_response_cache: Optional[ResponseCache] = None
+_factory_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _response_cache
+    if _response_cache is None:
+        with _factory_lock:
+            if _response_cache is None:
+                settings = get_settings()
+                db_path = _DEFAULT_DB_PATH if settings.llm_cache_disk_enabled else None
+                _response_cache = ResponseCache(db_path, max_entries=settings.llm_cache_max_entries)
+    return _response_cache
+
+
+__all__ = ["ResponseCache", "get_response_cache", "make_cache_key"]
@@ -0,0 +1,210 @@
+"""Server-side context caching (cachedContents) for static prompt prefixes."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from ..config import get_settings
+from ..logging_config import logger
+from .transport import get_http_client
+
+# Live handles kept locally; the least recently used beyond this is deleted server-side
+_MAX_HANDLES = 32
+
+
+@dataclass
+class _CachedPrefix:
+    """A live cachedContents handle and its locally tracked expiry."""
+
+    name: str
+    expires_at: float
+
+
+def prefix_fingerprint(
+    model: str,
+    system_instruction: Optional[Dict[str, Any]],
+    tools_digest: Optional[str],
+) -> Optional[str]:
+    """Hash the static part of a request (system instruction and tools digest)."""
+    if system_instruction is None and tools_digest is None:
+        return None
+    canonical = json.dumps(
+        {"model": model, "system": system_instruction, "tools": tools_digest},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CachedContentManager:
+    """Create, reuse and refresh cachedContents handles keyed by prefix fingerprint.
+
+    Any failure (prefix below the model's minimum cacheable size, API not
+    available, network error) marks the prefix unavailable for a cool-down
+    period so callers fall back to sending the prefix inline. At most
+    ``max_handles`` handles are tracked: expired ones are dropped and the
+    least recently used beyond the bound are deleted server-side, so their
+    storage is not billed until the TTL runs out.
+    """
+
+    def __init__(self, max_handles: int = _MAX_HANDLES) -> None:
+        self._max_handles = max(max_handles, 1)
+        self._handles: "OrderedDict[str, _CachedPrefix]" = OrderedDict()
+        self._unavailable_until: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._deletions: Set["asyncio.Task[None]"] = set()
+
+    async def resolve(
+        self,
+        *,
+        model: str,
+        api_key: str,
+        base_url: str,
+        payload: Dict[str, Any],
+        fingerprint: str,
+    ) -> Optional[str]:
+        """Return a cachedContents name for the payload prefix, or None to send inline."""
+        now = time.monotonic()
+        if self._unavailable_until.get(fingerprint, 0.0) > now:
+            return None
+
+        settings = get_settings()
+        margin = settings.gemini_context_cache_refresh_margin_seconds
+
+        handle = self._handles.get(fingerprint)
+        if handle and handle.expires_at - margin > now:
+            self._handles.move_to_end(fingerprint)
+            return handle.name
+
+        lock = self._locks.setdefault(fingerprint, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            handle = self._handles.get(fingerprint)
+            if handle and handle.expires_at - margin > now:
+                return handle.name
+
+            if handle and handle.expires_at > now:
+                refreshed = await self._refresh(handle, api_key=api_key, base_url=base_url)
+                if refreshed:
+                    return handle.name
+
+            created = await self._create(model=model, api_key=api_key, base_url=base_url, payload=payload)
+            if created is None:
+                self._handles.pop(fingerprint, None)
+                self._unavailable_until[fingerprint] = (
+                    time.monotonic() + settings.gemini_context_cache_retry_seconds
+                )
+                return None
+
+            self._handles[fingerprint] = created
+            self._prune(api_key=api_key, base_url=base_url)
+            return created.name
+
+    def invalidate(self, fingerprint: str) -> None:
+        """Forget a handle the API rejected (expired or deleted server-side)."""
+        self._handles.pop(fingerprint, None)
+
+    def clear(self) -> None:
+        self._handles.clear()
+        self._unavailable_until.clear()
+        self._locks.clear()
+
+    def _prune(self, *, api_key: str, base_url: str) -> None:
+        """Drop expired bookkeeping and delete least recently used handles past the bound."""
+        now = time.monotonic()
+        for fingerprint in [fp for fp, handle in self._handles.items() if handle.expires_at <= now]:
+            del self._handles[fingerprint]
+        for fingerprint in [fp for fp, until in self._unavailable_until.items() if until <= now]:
+            del self._unavailable_until[fingerprint]
+        while len(self._handles) > self._max_handles:
+            _, evicted = self._handles.popitem(last=False)
+            task = asyncio.ensure_future(self._delete(evicted, api_key=api_key, base_url=base_url))
+            self._deletions.add(task)
+            task.add_done_callback(self._deletions.discard)
+        for fingerprint in [
+            fp
+            for fp, lock in self._locks.items()
+            if not lock.locked() and fp not in self._handles and fp not in self._unavailable_until
+        ]:
+            del self._locks[fingerprint]
+
+    async def _create(
+        self,
+        *,
+        model: str,
+        api_key: str,
+        base_url: str,
+        payload: Dict[str, Any],
+    ) -> Optional[_CachedPrefix]:
+        ttl = get_settings().gemini_context_cache_ttl_seconds
+        body: Dict[str, Any] = {"model": f"models/{model}", "ttl": f"{ttl}s"}
+        for key in ("systemInstruction", "tools"):
+            if key in payload:
+                body[key] = payload[key]
+
+        url = f"{base_url.rstrip('/')}/cachedContents?key={api_key}"
+        try:
+            response = await get_http_client().post(url, json=body)
+        except httpx.HTTPError as exc:
+            logger.warning("Gemini context cache creation failed", extra={"error": str(exc)})
+            return None
+
+        if response.is_error:
+            logger.info(
+                "Gemini context cache unavailable; sending prefix inline",
+                extra={"status": response.status_code, "model": model},
+            )
+            return None
+
+        name = response.json().get("name")
+        if not isinstance(name, str) or not name:
+            return None
+
+        logger.info("Gemini context cache created", extra={"model": model, "cache": name})
+        return _CachedPrefix(name=name, expires_at=time.monotonic() + ttl)
+
+    async def _refresh(self, handle: _CachedPrefix, *, api_key: str, base_url: str) -> bool:
+        ttl = get_settings().gemini_context_cache_ttl_seconds
+        url = f"{base_url.rstrip('/')}/{handle.name}?updateMask=ttl&key={api_key}"
+        try:
+            response = await get_http_client().patch(url, json={"ttl": f"{ttl}s"})
+        except httpx.HTTPError as exc:
+            logger.warning("Gemini context cache refresh failed", extra={"error": str(exc)})
+            return False
+        if response.is_error:
+            return False
+        handle.expires_at = time.monotonic() + ttl
+        return True
+
+    async def _delete(self, handle: _CachedPrefix, *, api_key: str, base_url: str) -> None:
+        url = f"{base_url.rstrip('/')}/{handle.name}?key={api_key}"
+        try:
+            response = await get_http_client().delete(url)
+        except httpx.HTTPError as exc:
+            logger.warning("Gemini context cache deletion failed", extra={"error": str(exc)})
+            return
+        if response.is_error and response.status_code != 404:
+            logger.info(
+                "Gemini context cache deletion rejected",
+                extra={"status": response.status_code, "cache": handle.name},
+            )
+            return
+        logger.info("Gemini context cache evicted", extra={"cache": handle.name})
+
+
+_manager = CachedContentManager()
+
+
+def get_cached_content_manager() -> CachedContentManager:
+    return _manager
+
+
+__all__ = ["CachedContentManager", "get_cached_content_manager", "prefix_fingerprint"]
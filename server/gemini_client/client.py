@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
 from ..config import get_settings
+from ..http_utils import retry_after_seconds
+from ..logging_config import logger
+from .cache import get_response_cache, make_cache_key
+from .cached_content import get_cached_content_manager, prefix_fingerprint
+from .transport import get_http_client
 
 GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
 
@@ -15,6 +23,16 @@ GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
 class GeminiError(RuntimeError):
     """Raised when the Gemini API returns an error response."""
 
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 
 def _convert_messages_to_gemini(
     messages: List[Dict[str, str]], system: Optional[str] = None
@@ -92,6 +110,79 @@ def _convert_tools_to_gemini(tools: Optional[List[Dict[str, Any]]]) -> Optional[
     return [{"functionDeclarations": function_declarations}]
 
 
+@dataclass(frozen=True)
+class _ToolsBlock:
+    """Converted tool declarations, serialized once and shared across calls."""
+
+    declarations: List[Dict[str, Any]]
+    serialized: str
+    digest: str
+
+
+_TOOLS_BLOCK_CACHE_SIZE = 32
+# Keyed by the identity of each schema dict; the cached entry holds strong
+# references to those dicts so their ids cannot be reused while cached.
+_tools_block_cache: "OrderedDict[Tuple[int, ...], Tuple[Tuple[Dict[str, Any], ...], Optional[_ToolsBlock]]]" = OrderedDict()
+
+
+def _get_tools_block(tools: Optional[List[Dict[str, Any]]]) -> Optional[_ToolsBlock]:
+    """Return the memoized Gemini tools block for a list of OpenAI-style schemas.
+
+    Tool schemas are module-level constants, so the same dict objects recur on
+    every call even when the surrounding list is rebuilt. Schemas must not be
+    mutated in place after they are first sent.
+    """
+    if not tools:
+        return None
+
+    identity = tuple(id(tool) for tool in tools)
+    cached = _tools_block_cache.get(identity)
+    if cached is not None:
+        _tools_block_cache.move_to_end(identity)
+        return cached[1]
+
+    declarations = _convert_tools_to_gemini(tools)
+    block: Optional[_ToolsBlock] = None
+    if declarations:
+        serialized = json.dumps(declarations, ensure_ascii=False, separators=(",", ":"))
+        block = _ToolsBlock(
+            declarations=declarations,
+            serialized=serialized,
+            digest=hashlib.sha256(serialized.encode("utf-8")).hexdigest(),
+        )
+
+    _tools_block_cache[identity] = (tuple(tools), block)
+    while len(_tools_block_cache) > _TOOLS_BLOCK_CACHE_SIZE:
+        _tools_block_cache.popitem(last=False)
+    return block
+
+
+@dataclass
+class _GeminiRequest:
+    """Per-call payload (contents, system instruction) plus the shared tools block."""
+
+    payload: Dict[str, Any]
+    tools: Optional[_ToolsBlock] = None
+
+    def encode(self) -> bytes:
+        """Serialize to a request body, splicing in the pre-serialized tools."""
+        body = json.dumps(self.payload, ensure_ascii=False, separators=(",", ":"))
+        if self.tools is not None:
+            body = f'{body[:-1]},"tools":{self.tools.serialized}}}'
+        return body.encode("utf-8")
+
+
+def _convert_function_call(func_call: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": f"call_{func_call.get('name', 'unknown')}",
+        "type": "function",
+        "function": {
+            "name": func_call.get("name"),
+            "arguments": json.dumps(func_call.get("args", {}))
+        }
+    }
+
+
 def _convert_gemini_response(response: Dict[str, Any]) -> Dict[str, Any]:
     """Convert Gemini response to OpenAI-compatible format."""
     candidates = response.get("candidates", [])
@@ -117,15 +208,7 @@ def _convert_gemini_response(response: Dict[str, Any]) -> Dict[str, Any]:
         if "text" in part:
             text_content += part["text"]
         elif "functionCall" in part:
-            func_call = part["functionCall"]
-            tool_calls.append({
-                "id": f"call_{func_call.get('name', 'unknown')}",
-                "type": "function",
-                "function": {
-                    "name": func_call.get("name"),
-                    "arguments": json.dumps(func_call.get("args", {}))
-                }
-            })
+            tool_calls.append(_convert_function_call(part["functionCall"]))
 
     message: Dict[str, Any] = {
         "role": "assistant",
@@ -144,26 +227,22 @@ def _convert_gemini_response(response: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-async def request_chat_completion(
-    *,
-    model: str,
-    messages: List[Dict[str, str]],
-    system: Optional[str] = None,
-    api_key: Optional[str] = None,
-    tools: Optional[List[Dict[str, Any]]] = None,
-    base_url: str = GEMINI_BASE_URL,
-) -> Dict[str, Any]:
-    """Request a chat completion from Gemini and return OpenAI-compatible format."""
-
+def _resolve_api_key(api_key: Optional[str]) -> str:
     settings = get_settings()
     key = (api_key or settings.gemini_api_key or "").strip()
     if not key:
         raise GeminiError("Missing Gemini API key")
+    return key
+
 
-    # Convert messages to Gemini format
+def _build_request(
+    messages: List[Dict[str, str]],
+    system: Optional[str],
+    tools: Optional[List[Dict[str, Any]]],
+) -> _GeminiRequest:
+    """Assemble the generateContent request; only ``contents`` is rebuilt per call."""
     contents, system_instruction = _convert_messages_to_gemini(messages, system)
 
-    # Build payload
     payload: Dict[str, Any] = {
         "contents": contents
     }
@@ -173,40 +252,264 @@ async def request_chat_completion(
             "parts": [{"text": system_instruction}]
         }
 
-    # Convert and add tools if present
-    gemini_tools = _convert_tools_to_gemini(tools)
-    if gemini_tools:
-        payload["tools"] = gemini_tools
+    return _GeminiRequest(payload=payload, tools=_get_tools_block(tools))
+
 
-    # Build URL with API key
+def _error_detail(response: httpx.Response) -> str:
+    try:
+        error_payload = response.json()
+        return error_payload.get("error", {}).get("message", str(error_payload))
+    except Exception:
+        return response.text
+
+
+async def request_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    system: Optional[str] = None,
+    api_key: Optional[str] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+    base_url: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    cache_static_prefix: bool = False,
+) -> Dict[str, Any]:
+    """Request a chat completion from Gemini and return OpenAI-compatible format.
+
+    Pass ``cache_ttl`` (seconds) to opt into the response cache; byte-identical
+    payloads within the TTL are served without a network round trip. Callers
+    whose output must vary between calls leave it unset.
+
+    Set ``cache_static_prefix`` when the system prompt and tools repeat across
+    calls; they are then sent once as a server-side cachedContents handle and
+    referenced by name, falling back to inline when caching is unavailable.
+    """
+
+    key = _resolve_api_key(api_key)
+    base_url = base_url or get_settings().gemini_base_url
+    request = _build_request(messages, system, tools)
+
+    cache = get_response_cache() if cache_ttl and cache_ttl > 0 else None
+    cache_key = make_cache_key(model, request.encode()) if cache is not None else None
+    if cache is not None:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Gemini response served from cache", extra={"model": model})
+            cached["cache_hit"] = True
+            return cached
+
+    if cache_static_prefix:
+        response = await _post_with_cached_prefix(model, key, request, base_url)
+    else:
+        response = await _post_generate_content(model, key, request, base_url)
+    # Only real candidates are cached; the "No response generated." fallback is not
+    if cache is not None and "finish_reason" in response["choices"][0]:
+        cache.set(cache_key, model, response, cache_ttl)
+    return response
+
+
+# Statuses Gemini returns when a cachedContents handle expired or was rejected
+_CACHED_PREFIX_REJECTED_STATUSES = {400, 403, 404}
+
+
+async def _apply_cached_prefix(
+    model: str,
+    key: str,
+    request: _GeminiRequest,
+    base_url: str,
+) -> tuple[_GeminiRequest, Optional[str]]:
+    """Swap the static prefix for a cachedContents handle when one is available."""
+    if not get_settings().gemini_context_cache_enabled:
+        return request, None
+
+    system_instruction = request.payload.get("systemInstruction")
+    tools_digest = request.tools.digest if request.tools is not None else None
+    fingerprint = prefix_fingerprint(model, system_instruction, tools_digest)
+    if fingerprint is None:
+        return request, None
+
+    prefix: Dict[str, Any] = {}
+    if system_instruction is not None:
+        prefix["systemInstruction"] = system_instruction
+    if request.tools is not None:
+        prefix["tools"] = request.tools.declarations
+
+    name = await get_cached_content_manager().resolve(
+        model=model,
+        api_key=key,
+        base_url=base_url,
+        payload=prefix,
+        fingerprint=fingerprint,
+    )
+    if name is None:
+        return request, None
+
+    slim = {k: v for k, v in request.payload.items() if k != "systemInstruction"}
+    slim["cachedContent"] = name
+    return _GeminiRequest(payload=slim), fingerprint
+
+
+async def _post_with_cached_prefix(
+    model: str,
+    key: str,
+    request: _GeminiRequest,
+    base_url: str,
+) -> Dict[str, Any]:
+    cached_request, fingerprint = await _apply_cached_prefix(model, key, request, base_url)
+    if fingerprint is None:
+        return await _post_generate_content(model, key, request, base_url)
+
+    try:
+        return await _post_generate_content(model, key, cached_request, base_url)
+    except GeminiError as exc:
+        if exc.status_code not in _CACHED_PREFIX_REJECTED_STATUSES:
+            raise
+        logger.warning("Gemini rejected cached prefix; retrying inline", extra={"error": str(exc)})
+        get_cached_content_manager().invalidate(fingerprint)
+        return await _post_generate_content(model, key, request, base_url)
+
+
+async def _post_generate_content(
+    model: str,
+    key: str,
+    request: _GeminiRequest,
+    base_url: str,
+) -> Dict[str, Any]:
     url = f"{base_url.rstrip('/')}/models/{model}:generateContent?key={key}"
 
-    async with httpx.AsyncClient() as client:
+    client = get_http_client()
+    try:
+        response = await client.post(url, content=request.encode())
         try:
-            response = await client.post(
-                url,
-                headers={"Content-Type": "application/json"},
-                json=payload,
-                timeout=60.0,
-            )
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                detail: str
-                try:
-                    error_payload = exc.response.json()
-                    detail = error_payload.get("error", {}).get("message", str(error_payload))
-                except Exception:
-                    detail = exc.response.text
-                raise GeminiError(f"Gemini request failed ({exc.response.status_code}): {detail}") from exc
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            detail = _error_detail(exc.response)
+            raise GeminiError(
+                f"Gemini request failed ({exc.response.status_code}): {detail}",
+                status_code=exc.response.status_code,
+                retry_after=retry_after_seconds(exc.response),
+            ) from exc
 
-            gemini_response = response.json()
-            return _convert_gemini_response(gemini_response)
+        gemini_response = response.json()
+        return _convert_gemini_response(gemini_response)
 
-        except httpx.HTTPError as exc:
-            raise GeminiError(f"Gemini request failed: {exc}") from exc
+    except httpx.HTTPError as exc:
+        raise GeminiError(f"Gemini request failed: {exc}") from exc
 
-    raise GeminiError("Gemini request failed: unknown error")
 
-
-__all__ = ["GeminiError", "request_chat_completion", "GEMINI_BASE_URL"]
+async def stream_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    system: Optional[str] = None,
+    api_key: Optional[str] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+    base_url: Optional[str] = None,
+    cache_static_prefix: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a chat completion from Gemini via server-sent events.
+
+    Yields ``{"type": "text", "text": ...}`` for each text delta and
+    ``{"type": "tool_call", "tool_call": ...}`` as soon as a functionCall part
+    arrives. The final event is ``{"type": "done", "response": ...}`` carrying
+    the assembled OpenAI-compatible response, identical in shape to
+    :func:`request_chat_completion`.
+    """
+
+    key = _resolve_api_key(api_key)
+    base_url = base_url or get_settings().gemini_base_url
+    request = _build_request(messages, system, tools)
+
+    fingerprint: Optional[str] = None
+    sent_request = request
+    if cache_static_prefix:
+        sent_request, fingerprint = await _apply_cached_prefix(model, key, request, base_url)
+
+    yielded = False
+    try:
+        async for event in _stream_generate_content(model, key, sent_request, base_url):
+            yielded = True
+            yield event
+    except GeminiError as exc:
+        if fingerprint is None or yielded or exc.status_code not in _CACHED_PREFIX_REJECTED_STATUSES:
+            raise
+        logger.warning("Gemini rejected cached prefix; retrying inline", extra={"error": str(exc)})
+        get_cached_content_manager().invalidate(fingerprint)
+        async for event in _stream_generate_content(model, key, request, base_url):
+            yield event
+
+
+async def _stream_generate_content(
+    model: str,
+    key: str,
+    request: _GeminiRequest,
+    base_url: str,
+) -> AsyncIterator[Dict[str, Any]]:
+    url = f"{base_url.rstrip('/')}/models/{model}:streamGenerateContent?alt=sse&key={key}"
+
+    parts: List[Dict[str, Any]] = []
+    finish_reason: Optional[str] = None
+    usage: Dict[str, Any] = {}
+    saw_candidate = False
+
+    client = get_http_client()
+    try:
+        async with client.stream("POST", url, content=request.encode()) as response:
+            if response.is_error:
+                await response.aread()
+                detail = _error_detail(response)
+                raise GeminiError(
+                    f"Gemini request failed ({response.status_code}): {detail}",
+                    status_code=response.status_code,
+                    retry_after=retry_after_seconds(response),
+                )
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if not data:
+                    continue
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping malformed Gemini stream chunk")
+                    continue
+
+                usage = chunk.get("usageMetadata") or usage
+                candidates = chunk.get("candidates") or []
+                if not candidates:
+                    continue
+                saw_candidate = True
+                candidate = candidates[0]
+                finish_reason = candidate.get("finishReason") or finish_reason
+
+                for part in (candidate.get("content") or {}).get("parts", []):
+                    if "text" in part:
+                        if part["text"]:
+                            yield {"type": "text", "text": part["text"]}
+                        if parts and "text" in parts[-1]:
+                            parts[-1] = {"text": parts[-1]["text"] + part["text"]}
+                        else:
+                            parts.append({"text": part["text"]})
+                    elif "functionCall" in part:
+                        parts.append(part)
+                        yield {
+                            "type": "tool_call",
+                            "tool_call": _convert_function_call(part["functionCall"]),
+                        }
+
+    except httpx.HTTPError as exc:
+        raise GeminiError(f"Gemini request failed: {exc}") from exc
+
+    assembled: Dict[str, Any] = {"usageMetadata": usage}
+    if saw_candidate:
+        candidate_payload: Dict[str, Any] = {"content": {"role": "model", "parts": parts}}
+        if finish_reason:
+            candidate_payload["finishReason"] = finish_reason
+        assembled["candidates"] = [candidate_payload]
+
+    yield {"type": "done", "response": _convert_gemini_response(assembled)}
+
+
+__all__ = ["GeminiError", "request_chat_completion", "stream_chat_completion", "GEMINI_BASE_URL"]
@@ -0,0 +1,74 @@
+"""Process-wide pooled HTTP client shared by Gemini requests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+from ..config import get_settings
+from ..logging_config import logger
+
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+def _http2_available() -> bool:
+    """Return True when the optional ``h2`` package is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    http2 = settings.gemini_http2
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested for Gemini but 'h2' is not installed; using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.gemini_max_connections,
+        max_keepalive_connections=settings.gemini_max_keepalive_connections,
+        keepalive_expiry=settings.gemini_keepalive_expiry_seconds,
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=httpx.Timeout(settings.gemini_timeout_seconds),
+        headers={"Content-Type": "application/json"},
+    )
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the shared client if needed; called from app startup."""
+    global _client
+    async with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = _build_client()
+            logger.info("Gemini HTTP client opened")
+        return _client
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily outside the app lifecycle."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release pooled connections."""
+    global _client
+    async with _client_lock:
+        if _client is not None:
+            await _client.aclose()
+            _client = None
+            logger.info("Gemini HTTP client closed")
+
+
+__all__ = ["close_http_client", "get_http_client", "open_http_client"]
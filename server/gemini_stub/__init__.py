@@ -0,0 +1,5 @@
+"""Local stand-in for the Gemini API used for offline testing."""
+
+from .app import create_app
+
+__all__ = ["create_app"]
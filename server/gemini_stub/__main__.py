@@ -0,0 +1,60 @@
+"""Run the Gemini stub: ``python -m server.gemini_stub --port 8089``.
+
+Point the server at it with ``GEMINI_BASE_URL=http://127.0.0.1:8089/v1beta``.
+"""
+
+import argparse
+from pathlib import Path
+
+import uvicorn
+
+from .app import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Gemini API stub")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8089, help="Port to bind (default: 8089)")
+    parser.add_argument(
+        "--min-cache-tokens",
+        type=int,
+        default=0,
+        help="Reject cachedContents smaller than this many (estimated) tokens",
+    )
+    parser.add_argument(
+        "--latency",
+        default=None,
+        help="Response delay distribution: fixed:S, uniform:LO,HI, normal:MEAN,STD or lognormal:MEDIAN,SIGMA",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of generate requests to fail")
+    parser.add_argument(
+        "--error-status",
+        default="503",
+        help="Comma-separated statuses used for injected errors (default: 503)",
+    )
+    parser.add_argument("--script", type=Path, default=None, help="JSON file of scripted model turns")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded fixtures to replay")
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="UPSTREAM_URL",
+        help="Forward fixture misses to this API base URL and record them into --fixtures",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency/error sampling")
+    args = parser.parse_args()
+
+    app = create_app(
+        min_cache_tokens=args.min_cache_tokens,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_statuses=[int(value) for value in args.error_status.split(",") if value.strip()],
+        script_path=args.script,
+        fixtures_dir=args.fixtures,
+        record_upstream=args.record,
+        seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
@@ -0,0 +1,242 @@
+"""FastAPI app emulating the subset of the Gemini REST API the server uses."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .behavior import ErrorInjector, FixtureStore, LatencyDistribution, Script, status_name
+
+
+def _estimate_tokens(payload: Any) -> int:
+    return max(1, len(json.dumps(payload)) // 4)
+
+
+def _error(status_code: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"code": status_code, "message": message, "status": status_name(status_code)}},
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def create_app(
+    *,
+    min_cache_tokens: int = 0,
+    latency: Optional[str] = None,
+    error_rate: float = 0.0,
+    error_statuses: Sequence[int] = (503,),
+    script_path: Optional[Path] = None,
+    fixtures_dir: Optional[Path] = None,
+    record_upstream: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    """Build a stub Gemini server.
+
+    Args:
+        min_cache_tokens: Reject cachedContents smaller than this (mirrors the
+            real API's minimum cacheable prefix size).
+        latency: Delay before each generate response, e.g. ``lognormal:0.8,0.5``
+            (see :class:`LatencyDistribution`).
+        error_rate: Fraction of generate requests failed with ``error_statuses``;
+            429s carry a ``Retry-After`` header.
+        script_path: JSON file of scripted turns (see :class:`Script`).
+        fixtures_dir: Directory of recorded fixtures replayed on exact match.
+        record_upstream: Real API base URL; fixture misses are forwarded there
+            and recorded into ``fixtures_dir``.
+        seed: Seed for latency and error sampling, for repeatable runs.
+    """
+
+    rng = random.Random(seed)
+    delays = LatencyDistribution.parse(latency, rng)
+    errors = ErrorInjector(rate=error_rate, statuses=tuple(error_statuses), rng=rng)
+    script = Script.load(script_path) if script_path else None
+    fixtures = FixtureStore(fixtures_dir) if fixtures_dir else None
+    if record_upstream and fixtures is None:
+        raise ValueError("record_upstream requires fixtures_dir")
+
+    app = FastAPI(title="Gemini stub", docs_url=None, redoc_url=None)
+    caches: Dict[str, Dict[str, Any]] = {}
+    stats: Dict[str, int] = {
+        "generate": 0,
+        "stream": 0,
+        "cache_create": 0,
+        "cache_refresh": 0,
+        "cached_requests": 0,
+        "errors_injected": 0,
+        "fixture_hits": 0,
+        "fixture_misses": 0,
+        "recorded": 0,
+        "scripted": 0,
+    }
+
+    def _resolve_cache(body: Dict[str, Any]) -> tuple[Optional[Dict[str, Any]], Optional[JSONResponse]]:
+        name = body.get("cachedContent")
+        if not name:
+            return None, None
+        entry = caches.get(name)
+        if entry is None or entry["expires_at"] <= time.time():
+            return None, _error(404, f"CachedContent not found: {name}")
+        if "systemInstruction" in body or "tools" in body:
+            return None, _error(400, "cachedContent cannot be combined with systemInstruction or tools")
+        stats["cached_requests"] += 1
+        return entry, None
+
+    def _build_response(
+        body: Dict[str, Any],
+        cache_entry: Optional[Dict[str, Any]],
+        parts: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        prompt_tokens = _estimate_tokens(body.get("contents", []))
+        usage: Dict[str, Any] = {"candidatesTokenCount": 4}
+        if cache_entry is not None:
+            usage["cachedContentTokenCount"] = cache_entry["tokens"]
+            prompt_tokens += cache_entry["tokens"]
+        else:
+            prompt_tokens += _estimate_tokens({k: body.get(k) for k in ("systemInstruction", "tools")})
+        usage["promptTokenCount"] = prompt_tokens
+        usage["totalTokenCount"] = prompt_tokens + usage["candidatesTokenCount"]
+        return {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": parts or [{"text": "stub response"}]},
+                    "finishReason": "STOP",
+                }
+            ],
+            "usageMetadata": usage,
+        }
+
+    def _expand(body: Dict[str, Any], cache_entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the request as if the cached prefix had been sent inline."""
+        if cache_entry is None:
+            return body
+        expanded = {key: value for key, value in body.items() if key != "cachedContent"}
+        for key in ("systemInstruction", "tools"):
+            if key in cache_entry["body"]:
+                expanded[key] = cache_entry["body"][key]
+        return expanded
+
+    async def _forward(model: str, body: Dict[str, Any], api_key: str) -> Union[Dict[str, Any], JSONResponse]:
+        url = f"{record_upstream.rstrip('/')}/models/{model}:generateContent?key={api_key}"
+        async with httpx.AsyncClient(timeout=120) as client:
+            upstream = await client.post(url, json=body)
+        if upstream.is_error:
+            return JSONResponse(upstream.json(), status_code=upstream.status_code)
+        return upstream.json()
+
+    async def _respond(model: str, request: Request) -> Union[Dict[str, Any], JSONResponse]:
+        body = await request.json()
+        delay = delays.sample()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        injected = errors.pick()
+        if injected is not None:
+            stats["errors_injected"] += 1
+            headers = {"Retry-After": str(errors.retry_after_seconds)} if injected == 429 else None
+            return _error(injected, "Injected stub error", headers)
+
+        cache_entry, error = _resolve_cache(body)
+        if error is not None:
+            return error
+        expanded = _expand(body, cache_entry)
+
+        if fixtures is not None:
+            recorded = fixtures.lookup(model, expanded)
+            if recorded is not None:
+                stats["fixture_hits"] += 1
+                return recorded
+            stats["fixture_misses"] += 1
+            if record_upstream:
+                forwarded = await _forward(model, expanded, request.query_params.get("key", ""))
+                if isinstance(forwarded, dict):
+                    fixtures.save(model, expanded, forwarded)
+                    stats["recorded"] += 1
+                return forwarded
+
+        if script is not None:
+            turn = script.next_turn(expanded)
+            if turn is not None:
+                stats["scripted"] += 1
+                if "error" in turn:
+                    return _error(int(turn["error"]), "Scripted stub error")
+                return _build_response(body, cache_entry, Script.parts(turn))
+
+        return _build_response(body, cache_entry)
+
+    @app.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        stats["generate"] += 1
+        return await _respond(model, request)
+
+    @app.post("/v1beta/models/{model}:streamGenerateContent")
+    async def stream_generate_content(model: str, request: Request):
+        stats["stream"] += 1
+        response = await _respond(model, request)
+        if isinstance(response, JSONResponse):
+            return response
+
+        async def _events():
+            candidate = response["candidates"][0]
+            chunks: List[List[Dict[str, Any]]] = []
+            for part in candidate["content"]["parts"]:
+                if "text" not in part:
+                    chunks.append([part])
+                    continue
+                words = part["text"].split(" ")
+                chunks.extend([{"text": word if index == 0 else f" {word}"}] for index, word in enumerate(words))
+            for index, parts in enumerate(chunks):
+                chunk: Dict[str, Any] = {"candidates": [{"content": {"role": "model", "parts": parts}}]}
+                if index == len(chunks) - 1:
+                    chunk["candidates"][0]["finishReason"] = candidate.get("finishReason", "STOP")
+                    chunk["usageMetadata"] = response.get("usageMetadata", {})
+                yield f"data: {json.dumps(chunk)}\r\n\r\n"
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    @app.post("/v1beta/cachedContents")
+    async def create_cached_content(request: Request):
+        body = await request.json()
+        tokens = _estimate_tokens({k: body.get(k) for k in ("systemInstruction", "tools")})
+        if tokens < min_cache_tokens:
+            return _error(400, f"Cached content is too small: {tokens} < {min_cache_tokens}")
+        ttl = float(str(body.get("ttl", "3600s")).rstrip("s"))
+        name = f"cachedContents/{uuid.uuid4().hex[:12]}"
+        caches[name] = {"body": body, "tokens": tokens, "expires_at": time.time() + ttl}
+        stats["cache_create"] += 1
+        return {"name": name, "model": body.get("model"), "usageMetadata": {"totalTokenCount": tokens}}
+
+    @app.patch("/v1beta/cachedContents/{cache_id}")
+    async def update_cached_content(cache_id: str, request: Request):
+        name = f"cachedContents/{cache_id}"
+        entry = caches.get(name)
+        if entry is None:
+            return _error(404, f"CachedContent not found: {name}")
+        body = await request.json()
+        ttl = float(str(body.get("ttl", "3600s")).rstrip("s"))
+        entry["expires_at"] = time.time() + ttl
+        stats["cache_refresh"] += 1
+        return {"name": name}
+
+    @app.delete("/v1beta/cachedContents/{cache_id}")
+    async def delete_cached_content(cache_id: str):
+        caches.pop(f"cachedContents/{cache_id}", None)
+        return {}
+
+    @app.get("/_stub/stats")
+    async def stub_stats():
+        return {**stats, "live_caches": len(caches), "fixtures": len(fixtures) if fixtures else 0}
+
+    return app
+
+
+__all__ = ["create_app"]
@@ -0,0 +1,178 @@
+"""Configurable stub behaviours: latency, error injection, scripted turns and fixtures."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Canonical Google API status names for injected errors
+_STATUS_NAMES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+def status_name(status_code: int) -> str:
+    return _STATUS_NAMES.get(status_code, "STUB_ERROR")
+
+
+class LatencyDistribution:
+    """Sample response delays in seconds from a named distribution.
+
+    Specs: ``fixed:S``, ``uniform:LOW,HIGH``, ``normal:MEAN,STD`` and
+    ``lognormal:MEDIAN,SIGMA`` (heavy-tailed, closest to real API latency).
+    """
+
+    def __init__(self, kind: str, params: Sequence[float], rng: random.Random) -> None:
+        self.kind = kind
+        self.params = tuple(params)
+        self._rng = rng
+
+    @classmethod
+    def parse(cls, spec: Optional[str], rng: random.Random) -> "LatencyDistribution":
+        if not spec:
+            return cls("fixed", (0.0,), rng)
+        kind, _, raw = spec.partition(":")
+        params = [float(value) for value in raw.split(",") if value.strip()]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec {spec!r}; expected e.g. 'lognormal:0.8,0.5'")
+        return cls(kind, params, rng)
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self._rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, self._rng.gauss(*self.params))
+        median, sigma = self.params
+        return self._rng.lognormvariate(0.0, sigma) * median
+
+
+@dataclass
+class ErrorInjector:
+    """Fail a fraction of requests with one of the configured status codes."""
+
+    rate: float = 0.0
+    statuses: Sequence[int] = (503,)
+    retry_after_seconds: int = 1
+    rng: random.Random = field(default_factory=random.Random)
+
+    def pick(self) -> Optional[int]:
+        if self.rate <= 0 or self.rng.random() >= self.rate:
+            return None
+        return self.rng.choice(list(self.statuses))
+
+
+def _turn_parts(turn: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if "parts" in turn:
+        return list(turn["parts"])
+    if "functionCall" in turn:
+        return [{"functionCall": turn["functionCall"]}]
+    return [{"text": str(turn.get("text", ""))}]
+
+
+def _request_text(body: Dict[str, Any]) -> str:
+    texts: List[str] = []
+    for part in (body.get("systemInstruction") or {}).get("parts", []):
+        texts.append(str(part.get("text", "")))
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            if "text" in part:
+                texts.append(str(part["text"]))
+    return "\n".join(texts)
+
+
+class Script:
+    """Scripted model turns selected by request content.
+
+    The file holds ``{"scripts": [{"match": "...", "turns": [...]}]}``. The
+    first script whose ``match`` substring appears in the system instruction
+    or contents is used, and the turn index is the number of model turns
+    already in the request, so concurrent conversations advance independently.
+    A turn is ``{"text": ...}``, ``{"functionCall": {"name", "args"}}``,
+    ``{"parts": [...]}`` or ``{"error": STATUS}``; past the last turn the
+    final turn repeats.
+    """
+
+    def __init__(self, scripts: List[Dict[str, Any]]) -> None:
+        self._scripts = scripts
+
+    @classmethod
+    def load(cls, path: Path) -> "Script":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        scripts = data.get("scripts", data) if isinstance(data, dict) else data
+        return cls(list(scripts))
+
+    def next_turn(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        text = _request_text(body)
+        for script in self._scripts:
+            match = script.get("match", "")
+            if match and match not in text:
+                continue
+            turns = script.get("turns") or []
+            if not turns:
+                return None
+            index = sum(1 for content in body.get("contents", []) if content.get("role") == "model")
+            return turns[min(index, len(turns) - 1)]
+        return None
+
+    @staticmethod
+    def parts(turn: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return _turn_parts(turn)
+
+
+def fixture_key(model: str, body: Dict[str, Any]) -> str:
+    """Hash a request body with any cachedContent handle already expanded."""
+    canonical = json.dumps(
+        {"model": model, "body": {k: v for k, v in body.items() if k != "cachedContent"}},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """Recorded ``{"model", "request", "response"}`` JSON files keyed by request hash."""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._fixtures: Dict[str, Dict[str, Any]] = {}
+        if directory.is_dir():
+            for path in sorted(directory.glob("*.json")):
+                record = json.loads(path.read_text(encoding="utf-8"))
+                key = fixture_key(record["model"], record["request"])
+                self._fixtures[key] = record["response"]
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    def lookup(self, model: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._fixtures.get(fixture_key(model, body))
+
+    def save(self, model: str, body: Dict[str, Any], response: Dict[str, Any]) -> Path:
+        key = fixture_key(model, body)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{key[:16]}.json"
+        record = {"model": model, "request": body, "response": response}
+        path.write_text(json.dumps(record, indent=2, ensure_ascii=False), encoding="utf-8")
+        self._fixtures[key] = response
+        return path
+
+
+__all__ = [
+    "ErrorInjector",
+    "FixtureStore",
+    "LatencyDistribution",
+    "Script",
+    "fixture_key",
+    "status_name",
+]
@@ -0,0 +1,49 @@
+"""HTTP helpers shared by the LLM provider clients."""
+
+from __future__ import annotations
+
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse ``"13"``, ``"13s"`` or ``"1.5s"`` into seconds."""
+    value = value.strip().rstrip("s")
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Return how long the server asked us to back off, if it said.
+
+    Reads the ``Retry-After`` header (delta-seconds or HTTP date) and falls
+    back to a Google ``RetryInfo`` error detail (``"retryDelay": "13s"``).
+    """
+    header = response.headers.get("retry-after")
+    if header:
+        seconds = _parse_duration(header)
+        if seconds is not None:
+            return seconds
+        try:
+            return max(parsedate_to_datetime(header).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+    try:
+        payload = response.json()
+    except Exception:
+        return None
+    error = payload.get("error") if isinstance(payload, dict) else None
+    details = error.get("details") if isinstance(error, dict) else None
+    for detail in details or []:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            return _parse_duration(str(detail["retryDelay"]))
+    return None
+
+
+__all__ = ["retry_after_seconds"]
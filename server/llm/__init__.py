@@ -0,0 +1,26 @@
+"""LLM call coordination shared by every agent: admission control, routing and dispatch."""
+
+from .client import request_chat_completion, stream_chat_completion
+from .deadline import DeadlineExceeded, deadline_scope, time_remaining
+from .limiter import LimiterTimeout, Priority, get_llm_limiter
+from .resilience import CircuitOpenError
+from .router import get_llm_router
+from .singleflight import get_singleflight
+from .types import LLMError
+from .usage import get_usage_store
+
+__all__ = [
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "LLMError",
+    "LimiterTimeout",
+    "Priority",
+    "deadline_scope",
+    "get_llm_limiter",
+    "get_llm_router",
+    "get_singleflight",
+    "get_usage_store",
+    "request_chat_completion",
+    "stream_chat_completion",
+    "time_remaining",
+]
@@ -0,0 +1,187 @@
+"""Prompt budgeting: fit history transcripts into a model's token budget before dispatch."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..logging_config import logger
+from .tokens import estimate_tokens, estimate_tools_tokens
+
+# Advertised input windows; unknown models fall back to the conservative default
+_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gemini-2.5-pro": 1_048_576,
+    "gemini-2.5-flash": 1_048_576,
+    "gemini-2.0-flash": 1_048_576,
+    "gemini-1.5-pro": 2_097_152,
+    "gemini-1.5-flash": 1_048_576,
+}
+_DEFAULT_CONTEXT_WINDOW = 128_000
+
+# Drop order for transcript entries: tool traffic first, then replies, then user turns
+_TIER_BY_TAG: Dict[str, int] = {
+    "tool_response": 0,
+    "agent_action": 0,
+    "wait": 0,
+    "agent_response": 1,
+    "agent_message": 1,
+    "poke_reply": 1,
+    "user_message": 2,
+    "agent_request": 2,
+}
+_DEFAULT_TIER = 1
+# Summaries of already-trimmed history are never dropped
+_PINNED_TAGS = {"conversation_summary", "execution_summary"}
+
+# Oversized entries are cut to this many characters before anything is dropped
+_COMPACT_CHARS = 1200
+
+# Room kept for the omission note prepended after dropping entries
+_NOTE_TOKENS = 16
+
+_ENTRY_PATTERN = re.compile(r"<([A-Za-z_][\w-]*)(?:\s[^>]*)?>.*?</\1>", re.DOTALL)
+
+
+def context_window(model: str) -> int:
+    """Return the input token window for ``model`` (provider prefixes ignored)."""
+    name = model.rsplit("/", 1)[-1]
+    for prefix, window in _CONTEXT_WINDOWS.items():
+        if name.startswith(prefix):
+            return window
+    return _DEFAULT_CONTEXT_WINDOW
+
+
+def prompt_budget(model: str) -> int:
+    """Return the total prompt budget: the configured target capped by the window."""
+    settings = get_settings()
+    ceiling = context_window(model) - settings.llm_output_reserve_tokens
+    target = settings.llm_prompt_budget_tokens
+    return min(target, ceiling) if target > 0 else ceiling
+
+
+def message_budget(
+    model: str,
+    *,
+    system: Optional[str] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """Tokens left for the message list once the system prompt and tools are paid for."""
+    return max(prompt_budget(model) - estimate_tokens(system) - estimate_tools_tokens(tools), 0)
+
+
+@dataclass
+class BudgetReport:
+    """What the budgeter did to a transcript."""
+
+    budget_tokens: int
+    tokens_before: int
+    tokens_after: int
+    dropped: Dict[str, int] = field(default_factory=dict)
+    compacted: int = 0
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.dropped) or self.compacted > 0
+
+    def as_log_extra(self) -> Dict[str, Any]:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "dropped": dict(self.dropped),
+            "compacted": self.compacted,
+        }
+
+
+@dataclass
+class _Entry:
+    tag: str
+    text: str
+    tokens: int
+    tier: int
+    dropped: bool = False
+
+
+def _compact(entry: _Entry) -> bool:
+    if len(entry.text) <= _COMPACT_CHARS or entry.tag in _PINNED_TAGS:
+        return False
+    close = f"</{entry.tag}>"
+    body = entry.text[: -len(close)]
+    omitted = len(body) - _COMPACT_CHARS
+    entry.text = f"{body[:_COMPACT_CHARS]}… [{omitted} characters trimmed]{close}"
+    entry.tokens = estimate_tokens(entry.text)
+    return True
+
+
+def fit_transcript(transcript: str, budget_tokens: int) -> Tuple[str, BudgetReport]:
+    """Trim a rendered ``<tag>payload</tag>`` transcript to ``budget_tokens``.
+
+    Works oldest-first within each tier, compacting oversized entries before
+    dropping any, and tool traffic goes before replies, which go before user
+    turns. A note recording how many entries were omitted leads the result.
+    """
+    budget_tokens = max(budget_tokens, 0)
+    tokens_before = estimate_tokens(transcript)
+    report = BudgetReport(budget_tokens=budget_tokens, tokens_before=tokens_before, tokens_after=tokens_before)
+    if tokens_before <= budget_tokens:
+        return transcript, report
+
+    entries = [
+        _Entry(
+            tag=match.group(1),
+            text=match.group(0),
+            tokens=estimate_tokens(match.group(0)),
+            tier=_TIER_BY_TAG.get(match.group(1), _DEFAULT_TIER),
+        )
+        for match in _ENTRY_PATTERN.finditer(transcript)
+    ]
+    total = sum(entry.tokens for entry in entries)
+    target = max(budget_tokens - _NOTE_TOKENS, 0)
+
+    for tier in sorted({entry.tier for entry in entries}):
+        candidates = [entry for entry in entries if entry.tier == tier and entry.tag not in _PINNED_TAGS]
+        for entry in candidates:
+            if total <= target:
+                break
+            before = entry.tokens
+            if _compact(entry):
+                report.compacted += 1
+                total -= before - entry.tokens
+        for entry in candidates:
+            if total <= target:
+                break
+            entry.dropped = True
+            total -= entry.tokens
+            report.dropped[entry.tag] = report.dropped.get(entry.tag, 0) + 1
+        if total <= target:
+            break
+
+    kept = [entry.text for entry in entries if not entry.dropped]
+    omitted = sum(report.dropped.values())
+    if omitted:
+        kept.insert(0, f"<history_note>{omitted} older entries omitted to fit the context budget</history_note>")
+    result = "\n".join(kept)
+    report.tokens_after = estimate_tokens(result)
+    return result, report
+
+
+def fit_history(transcript: str, budget_tokens: Optional[int], *, source: str) -> str:
+    """Apply :func:`fit_transcript` when a budget is given and log what was dropped."""
+    if budget_tokens is None or not transcript:
+        return transcript
+    fitted, report = fit_transcript(transcript, budget_tokens)
+    if report.trimmed:
+        logger.info("Trimmed history to fit prompt budget", extra={"source": source, **report.as_log_extra()})
+    return fitted
+
+
+__all__ = [
+    "BudgetReport",
+    "context_window",
+    "fit_history",
+    "fit_transcript",
+    "message_budget",
+    "prompt_budget",
+]
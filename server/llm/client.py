@@ -0,0 +1,158 @@
+"""Provider-neutral entry points for LLM calls used by every agent."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..config import get_settings
+from ..logging_config import logger
+from .budget import context_window, prompt_budget
+from .deadline import DeadlineExceeded, current_deadline
+from .limiter import Priority
+from .router import get_llm_router
+from .singleflight import get_singleflight
+from .types import LLMCall, LLMError
+from .usage import UsageRecord, get_usage_store
+
+
+def _record_usage(
+    call: LLMCall,
+    started: float,
+    response: Optional[Dict[str, Any]],
+    *,
+    error: Optional[BaseException] = None,
+    streamed: bool = False,
+) -> None:
+    """Persist tokens and wall time for one call; a no-op when tracking is off."""
+    if not get_settings().llm_usage_tracking_enabled:
+        return
+    cache_hit = bool((response or {}).get("cache_hit"))
+    # A cache hit spent no upstream tokens; count the call but not its original usage
+    usage = {} if cache_hit else (response or {}).get("usage") or {}
+    provider = (response or {}).get("provider") or getattr(error, "provider", None) or "unknown"
+    get_usage_store().record(
+        UsageRecord(
+            caller=call.caller or "unknown",
+            provider=provider,
+            model=(response or {}).get("model") or call.model,
+            priority=call.priority.name.lower(),
+            prompt_tokens=int(usage.get("prompt_tokens") or 0),
+            completion_tokens=int(usage.get("completion_tokens") or 0),
+            cached_tokens=int(usage.get("cached_tokens") or 0),
+            total_tokens=int(usage.get("total_tokens") or 0),
+            latency_ms=(time.monotonic() - started) * 1000,
+            ok=error is None,
+            streamed=streamed,
+            cache_hit=cache_hit,
+        )
+    )
+
+
+def _check_budget(call: LLMCall) -> None:
+    """Fail fast on prompts the model cannot accept; warn when over the target budget."""
+    estimated = call.estimated_tokens()
+    window = context_window(call.model)
+    if estimated > window:
+        raise LLMError(
+            f"Prompt of ~{estimated} tokens exceeds the {window}-token context window of {call.model}"
+        )
+    if estimated > prompt_budget(call.model):
+        logger.warning(
+            "LLM prompt over budget",
+            extra={"caller": call.caller, "model": call.model, "estimated_tokens": estimated},
+        )
+
+
+async def _complete(call: LLMCall) -> Dict[str, Any]:
+    started = time.monotonic()
+    try:
+        response = await get_llm_router().complete(call)
+    except (LLMError, DeadlineExceeded) as exc:
+        _record_usage(call, started, None, error=exc)
+        raise
+    _record_usage(call, started, response)
+    return response
+
+
+async def request_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    system: Optional[str] = None,
+    api_key: Optional[str] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+    priority: Priority = Priority.EXECUTION,
+    caller: Optional[str] = None,
+    cache_ttl: Optional[float] = None,
+    cache_static_prefix: bool = False,
+) -> Dict[str, Any]:
+    """Request a chat completion through the router at ``priority``.
+
+    Returns ``{"choices", "usage", "provider", "model"}`` with OpenAI-style
+    choices and normalized token usage, whichever provider served it.
+    Concurrent identical calls share one upstream request, accounted to the
+    ``caller`` that issued it, when it runs at the same or a higher priority
+    and with a deadline no earlier than the joiner's. Inside a
+    :func:`deadline_scope` the queue wait, each attempt and any retry backoff
+    are bounded by the time remaining; running out raises ``DeadlineExceeded``.
+    """
+    call = LLMCall(
+        model=model,
+        messages=messages,
+        system=system,
+        api_key=api_key,
+        tools=tools,
+        priority=priority,
+        caller=caller,
+        cache_ttl=cache_ttl,
+        cache_static_prefix=cache_static_prefix,
+        deadline=current_deadline(),
+    )
+    _check_budget(call)
+    if not get_settings().llm_singleflight_enabled:
+        return await _complete(call)
+    return await get_singleflight().do(
+        call.fingerprint(),
+        lambda: _complete(call),
+        priority=call.priority,
+        deadline=call.deadline,
+    )
+
+
+async def stream_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    system: Optional[str] = None,
+    api_key: Optional[str] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+    priority: Priority = Priority.INTERACTIVE,
+    caller: Optional[str] = None,
+    cache_static_prefix: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream ``text``/``tool_call`` events followed by a ``done`` event with the full response."""
+    call = LLMCall(
+        model=model,
+        messages=messages,
+        system=system,
+        api_key=api_key,
+        tools=tools,
+        priority=priority,
+        caller=caller,
+        cache_static_prefix=cache_static_prefix,
+        deadline=current_deadline(),
+    )
+    _check_budget(call)
+    started = time.monotonic()
+    try:
+        async for event in get_llm_router().stream(call):
+            if event["type"] == "done":
+                _record_usage(call, started, event["response"], streamed=True)
+            yield event
+    except (LLMError, DeadlineExceeded) as exc:
+        _record_usage(call, started, None, error=exc, streamed=True)
+        raise
+
+
+__all__ = ["request_chat_completion", "stream_chat_completion"]
@@ -0,0 +1,181 @@
+"""Keep large tool results out of the conversation an agent loop resends.
+
+Agent loops resend every message on each iteration, so one 40 KB email
+search result costs 40 KB on every remaining iteration. A
+:class:`ToolResultStore` lives for one run: results under the inline limit
+pass through untouched, larger ones are kept out-of-band behind a handle and
+replaced in the conversation by a bounded digest (long strings clipped, long
+lists shortened). The model reads the full value in pages through the
+``expand_tool_result`` tool (:data:`EXPAND_TOOL_SCHEMA`).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import get_settings
+
+EXPAND_TOOL_NAME = "expand_tool_result"
+
+EXPAND_TOOL_SCHEMA: Dict[str, Any] = {
+    "type": "function",
+    "function": {
+        "name": EXPAND_TOOL_NAME,
+        "description": (
+            "Read the full content behind a truncated tool result. Results that were too large to show "
+            "carry a 'result_handle'; pass it here, optionally with a path to one field "
+            "(e.g. 'result.messages.2.clean_text'), and page through long values with 'offset'."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "The result_handle of the truncated result."},
+                "path": {
+                    "type": "string",
+                    "description": "Dot-separated keys/list indexes into the result; omit for the whole result.",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to continue from (use next_offset from the previous page).",
+                },
+            },
+            "required": ["handle"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# (string chars, list items) kept per level; tighter levels are tried until the digest fits.
+# Strings shrink before lists do, so ids and subjects of every listed item survive longest.
+_DIGEST_LEVELS: Sequence[Tuple[int, int]] = (
+    (400, 50),
+    (200, 50),
+    (100, 50),
+    (60, 50),
+    (40, 50),
+    (40, 20),
+    (40, 10),
+    (16, 3),
+)
+
+
+def _dump(payload: Any) -> str:
+    try:
+        return json.dumps(payload, default=str, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return json.dumps({"repr": repr(payload)})
+
+
+def _clip(value: Any, string_limit: int, list_limit: int) -> Any:
+    if isinstance(value, str):
+        if len(value) > string_limit:
+            return f"{value[:string_limit]}… [+{len(value) - string_limit} chars]"
+        return value
+    if isinstance(value, dict):
+        return {key: _clip(item, string_limit, list_limit) for key, item in value.items()}
+    if isinstance(value, list):
+        clipped = [_clip(item, string_limit, list_limit) for item in value[:list_limit]]
+        if len(value) > list_limit:
+            clipped.append(f"… [+{len(value) - list_limit} more items]")
+        return clipped
+    return value
+
+
+def digest(payload: Any, max_chars: int) -> Tuple[Any, bool]:
+    """Return ``(value, clipped)`` where ``value`` serializes to at most ~``max_chars``."""
+    if len(_dump(payload)) <= max_chars:
+        return payload, False
+    # Round-trip so the walker only sees plain JSON types
+    plain = json.loads(_dump(payload))
+    for string_limit, list_limit in _DIGEST_LEVELS:
+        clipped = _clip(plain, string_limit, list_limit)
+        if len(_dump(clipped)) <= max_chars:
+            return clipped, True
+    return {"preview": _dump(plain)[:max_chars]}, True
+
+
+class ToolResultStore:
+    """Run-scoped store that swaps oversized tool results for digests plus a handle."""
+
+    def __init__(self, inline_chars: Optional[int] = None, page_chars: Optional[int] = None) -> None:
+        settings = get_settings()
+        self.inline_chars = settings.tool_result_inline_chars if inline_chars is None else inline_chars
+        self.page_chars = max(settings.tool_result_page_chars if page_chars is None else page_chars, 256)
+        self._results: Dict[str, Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.inline_chars > 0
+
+    @property
+    def has_results(self) -> bool:
+        """Whether any result was stored out-of-band (so the expansion tool is useful)."""
+        return bool(self._results)
+
+    def tools_with_expansion(self, tools: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+        """``tools`` plus the expansion tool once a handle exists."""
+        if not tools or not self._results:
+            return tools
+        return [*tools, EXPAND_TOOL_SCHEMA]
+
+    def render(self, payload: Dict[str, Any], *, expandable: bool = True) -> str:
+        """Serialize a tool message payload, compacting it when it exceeds the inline limit.
+
+        With ``expandable`` the full payload is kept and the digest carries its
+        ``result_handle``; otherwise the digest only notes the truncation.
+        """
+        content = _dump(payload)
+        if not self.enabled or len(content) <= self.inline_chars:
+            return content
+
+        clipped, _ = digest(payload, self.inline_chars)
+        if not isinstance(clipped, dict):
+            clipped = {"result": clipped}
+        if expandable:
+            handle = f"r{len(self._results) + 1}"
+            self._results[handle] = json.loads(content)
+            clipped["result_handle"] = handle
+            clipped["note"] = (
+                f"Truncated from {len(content)} chars; call {EXPAND_TOOL_NAME} with this handle for full values."
+            )
+        else:
+            clipped["note"] = f"Truncated from {len(content)} chars."
+        return _dump(clipped)
+
+    def expand(self, handle: str, path: Optional[str] = None, offset: int = 0) -> Tuple[bool, Dict[str, Any]]:
+        """Return ``(success, page)`` for a stored result or one field of it."""
+        if handle not in self._results:
+            return False, {"error": f"Unknown result handle '{handle}'", "known_handles": sorted(self._results)}
+
+        value: Any = self._results[handle]
+        for part in [segment for segment in (path or "").split(".") if segment]:
+            try:
+                value = value[int(part)] if isinstance(value, list) else value[part]
+            except (KeyError, IndexError, ValueError, TypeError):
+                return False, {"error": f"Path '{path}' not found in result {handle}"}
+
+        try:
+            offset = max(int(offset or 0), 0)
+        except (TypeError, ValueError):
+            return False, {"error": "offset must be an integer"}
+        text = value if isinstance(value, str) else _dump(value)
+        end = offset + self.page_chars
+        page: Dict[str, Any] = {
+            "handle": handle,
+            "path": path or "",
+            "total_chars": len(text),
+            "offset": offset,
+            "content": text[offset:end],
+        }
+        if end < len(text):
+            page["next_offset"] = end
+        return True, page
+
+
+__all__ = [
+    "EXPAND_TOOL_NAME",
+    "EXPAND_TOOL_SCHEMA",
+    "ToolResultStore",
+    "digest",
+]
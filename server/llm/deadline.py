@@ -0,0 +1,79 @@
+"""Request deadlines that flow from the batch manager into every LLM and tool call.
+
+A deadline is an absolute ``time.monotonic()`` instant held in a context
+variable, so it follows the task tree without being threaded through every
+signature. Nested scopes can only tighten it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_current_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when work cannot finish before the active deadline."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """Run the block under a deadline ``seconds`` from now (never later than the current one)."""
+    current = _current_deadline.get()
+    if seconds is None:
+        yield current
+        return
+    deadline = time.monotonic() + max(seconds, 0.0)
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """Return the active deadline as a ``time.monotonic()`` instant, if any."""
+    return _current_deadline.get()
+
+
+def time_remaining(deadline: Optional[float] = None) -> Optional[float]:
+    """Seconds left before ``deadline`` (default: the active one); ``None`` when unbounded."""
+    deadline = deadline if deadline is not None else _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def run_within(awaitable: Awaitable[T], deadline: Optional[float], *, what: str) -> T:
+    """Await ``awaitable`` but give up with :class:`DeadlineExceeded` at ``deadline``."""
+    remaining = time_remaining(deadline) if deadline is not None else None
+    if remaining is None:
+        return await awaitable
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(f"No time left for {what}")
+    try:
+        return await asyncio.wait_for(awaitable, timeout=remaining)
+    except asyncio.TimeoutError as exc:
+        # Only translate timeouts caused by our deadline, not ones raised by the work itself
+        if isinstance(exc, DeadlineExceeded) or time_remaining(deadline) > 0:
+            raise
+        raise DeadlineExceeded(f"{what} did not finish before the deadline") from exc
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "current_deadline",
+    "deadline_scope",
+    "run_within",
+    "time_remaining",
+]
@@ -0,0 +1,310 @@
+"""Priority-aware concurrency and token-bucket rate limiting for LLM calls."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..config import get_settings
+from ..logging_config import logger
+from .deadline import DeadlineExceeded, time_remaining
+
+
+class Priority(IntEnum):
+    """Scheduling class for an LLM call; lower values are served first."""
+
+    INTERACTIVE = 0
+    EXECUTION = 1
+    TRIGGER = 2
+    SUMMARIZER = 3
+
+
+# How long each class may wait in the queue before giving up
+_DEFAULT_QUEUE_TIMEOUTS: Dict[Priority, float] = {
+    Priority.INTERACTIVE: 30.0,
+    Priority.EXECUTION: 60.0,
+    Priority.TRIGGER: 120.0,
+    Priority.SUMMARIZER: 300.0,
+}
+
+
+class LimiterTimeout(RuntimeError):
+    """Raised when a queued LLM call cannot start before its deadline."""
+
+
+@dataclass(frozen=True)
+class ModelBudget:
+    """Per-model limits; a non-positive value disables that limit."""
+
+    requests_per_minute: int
+    tokens_per_minute: int
+    max_concurrency: int
+
+
+class TokenBucket:
+    """Continuously refilling bucket that may go negative to record overspend."""
+
+    def __init__(self, capacity: float, per_seconds: float = 60.0) -> None:
+        self.capacity = float(capacity)
+        self.unlimited = capacity <= 0
+        self._rate = self.capacity / per_seconds if not self.unlimited else 0.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def level(self, now: float) -> float:
+        self._refill(now)
+        return self._level
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (capped at a full bucket)."""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self._level >= needed:
+            return 0.0
+        return (needed - self._level) / self._rate
+
+    def consume(self, amount: float, now: float) -> None:
+        if self.unlimited:
+            return
+        self._refill(now)
+        self._level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Return (or, when negative, charge) tokens after the true cost is known."""
+        if self.unlimited:
+            return
+        self._level = min(self.capacity, self._level + amount)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    future: "asyncio.Future[None]" = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+@dataclass
+class _ModelState:
+    budget: ModelBudget
+    requests: TokenBucket
+    tokens: TokenBucket
+    waiters: List[_Waiter] = field(default_factory=list)
+    in_flight: int = 0
+    granted: int = 0
+    timed_out: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class LimiterSlot:
+    """Handle for a granted call; report actual usage to settle the token bucket."""
+
+    def __init__(self, state: _ModelState, estimated_tokens: int) -> None:
+        self._state = state
+        self._estimated_tokens = estimated_tokens
+
+    def record_usage(self, total_tokens: Optional[int]) -> None:
+        if total_tokens is None or total_tokens < 0:
+            return
+        self._state.tokens.refund(self._estimated_tokens - total_tokens)
+        self._estimated_tokens = total_tokens
+
+
+class LLMLimiter:
+    """Shared limiter: strict priority queue per model, gated by concurrency and budgets."""
+
+    def __init__(self, default_budget: ModelBudget, budgets: Optional[Dict[str, ModelBudget]] = None) -> None:
+        self._default_budget = default_budget
+        self._budgets = dict(budgets or {})
+        self._states: Dict[str, _ModelState] = {}
+        self._sequence = itertools.count()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._states.get(model)
+        if state is None:
+            budget = self._budgets.get(model, self._default_budget)
+            state = _ModelState(
+                budget=budget,
+                requests=TokenBucket(budget.requests_per_minute),
+                tokens=TokenBucket(budget.tokens_per_minute),
+            )
+            self._states[model] = state
+        return state
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        priority: Priority,
+        estimated_tokens: int = 0,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[LimiterSlot]:
+        """Wait for a slot for ``model`` and hold it for the duration of the call.
+
+        ``deadline`` (a ``time.monotonic()`` instant) caps the queue wait; running
+        out of it raises :class:`DeadlineExceeded` instead of ``LimiterTimeout``.
+        """
+        state = self._state(model)
+        queue_timeout = timeout if timeout is not None else _DEFAULT_QUEUE_TIMEOUTS[priority]
+        remaining = time_remaining(deadline) if deadline is not None else None
+        bounded_by_deadline = remaining is not None and remaining < queue_timeout
+        if bounded_by_deadline:
+            queue_timeout = remaining
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            tokens=max(estimated_tokens, 0),
+            future=loop.create_future(),
+            enqueued_at=time.monotonic(),
+        )
+        heapq.heappush(state.waiters, waiter)
+        self._pump(state)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=max(queue_timeout, 0.0))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as we gave up; hand the slot back
+                self._release(state)
+            else:
+                waiter.future.cancel()
+                self._pump(state)
+            if isinstance(exc, asyncio.TimeoutError):
+                state.timed_out += 1
+                if bounded_by_deadline:
+                    raise DeadlineExceeded(f"LLM call for {model} ran out of time in the queue") from None
+                logger.warning(
+                    "LLM call timed out in queue",
+                    extra={"model": model, "priority": priority.name, "timeout": queue_timeout},
+                )
+                raise LimiterTimeout(
+                    f"LLM call for {model} waited more than {queue_timeout:g}s in the {priority.name.lower()} queue"
+                ) from None
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+        try:
+            yield LimiterSlot(state, waiter.tokens)
+        finally:
+            self._release(state)
+
+    def _release(self, state: _ModelState) -> None:
+        state.in_flight -= 1
+        self._pump(state)
+
+    def _pump(self, state: _ModelState) -> None:
+        """Grant slots to queued calls in priority order while limits allow."""
+        while state.waiters:
+            head = state.waiters[0]
+            if head.future.done():
+                heapq.heappop(state.waiters)
+                continue
+
+            if 0 < state.budget.max_concurrency <= state.in_flight:
+                return
+
+            now = time.monotonic()
+            delay = max(
+                state.requests.wait_time(1, now),
+                state.tokens.wait_time(head.tokens, now),
+            )
+            if delay > 0:
+                self._schedule_pump(state, delay)
+                return
+
+            heapq.heappop(state.waiters)
+            state.requests.consume(1, now)
+            state.tokens.consume(head.tokens, now)
+            state.in_flight += 1
+            state.granted += 1
+            head.future.set_result(None)
+
+    def _schedule_pump(self, state: _ModelState, delay: float) -> None:
+        if state.timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+
+        def _fire() -> None:
+            state.timer = None
+            self._pump(state)
+
+        state.timer = loop.call_later(delay, _fire)
+
+    def metrics(self) -> Dict[str, Dict[str, object]]:
+        """Queue depth, in-flight calls and budget headroom per model."""
+        now = time.monotonic()
+        snapshot: Dict[str, Dict[str, object]] = {}
+        for model, state in self._states.items():
+            live = [waiter for waiter in state.waiters if not waiter.future.done()]
+            by_priority = {priority.name.lower(): 0 for priority in Priority}
+            for waiter in live:
+                by_priority[Priority(waiter.priority).name.lower()] += 1
+            snapshot[model] = {
+                "in_flight": state.in_flight,
+                "queued": len(live),
+                "queued_by_priority": by_priority,
+                "oldest_wait_seconds": round(max((now - w.enqueued_at for w in live), default=0.0), 3),
+                "granted": state.granted,
+                "timed_out": state.timed_out,
+                "avg_wait_seconds": round(state.total_wait / state.granted, 3) if state.granted else 0.0,
+                "max_wait_seconds": round(state.max_wait, 3),
+                "requests_available": None if state.requests.unlimited else round(state.requests.level(now), 1),
+                "tokens_available": None if state.tokens.unlimited else round(state.tokens.level(now)),
+            }
+        return snapshot
+
+
+_limiter: Optional[LLMLimiter] = None
+
+
+def get_llm_limiter() -> LLMLimiter:
+    """Return the process-wide limiter configured from settings."""
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        default_budget = ModelBudget(
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_concurrency=settings.llm_max_concurrency,
+        )
+        budgets = {
+            model: ModelBudget(
+                requests_per_minute=int(limits.get("rpm", default_budget.requests_per_minute)),
+                tokens_per_minute=int(limits.get("tpm", default_budget.tokens_per_minute)),
+                max_concurrency=int(limits.get("concurrency", default_budget.max_concurrency)),
+            )
+            for model, limits in settings.llm_model_budgets.items()
+        }
+        _limiter = LLMLimiter(default_budget, budgets)
+    return _limiter
+
+
+__all__ = [
+    "LLMLimiter",
+    "LimiterSlot",
+    "LimiterTimeout",
+    "ModelBudget",
+    "Priority",
+    "TokenBucket",
+    "get_llm_limiter",
+]
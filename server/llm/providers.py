@@ -0,0 +1,175 @@
+"""Provider adapters that translate LLMCall into Gemini or OpenRouter requests."""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, List, Protocol
+
+from ..config import get_settings
+from ..gemini_client import GeminiError
+from ..gemini_client import request_chat_completion as gemini_request_chat_completion
+from ..gemini_client import stream_chat_completion as gemini_stream_chat_completion
+from ..openrouter_client import OpenRouterError
+from ..openrouter_client import request_chat_completion as openrouter_request_chat_completion
+from .types import LLMCall, LLMError
+
+# Failures that count against a provider's health and trigger failover
+PROVIDER_ERRORS = (GeminiError, OpenRouterError, LLMError)
+
+
+def _normalize_gemini_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+    return {
+        "prompt_tokens": int(usage.get("promptTokenCount") or 0),
+        "completion_tokens": int(usage.get("candidatesTokenCount") or 0),
+        "total_tokens": int(usage.get("totalTokenCount") or 0),
+        "cached_tokens": int(usage.get("cachedContentTokenCount") or 0),
+    }
+
+
+def _normalize_openai_usage(usage: Dict[str, Any]) -> Dict[str, int]:
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+        "completion_tokens": int(usage.get("completion_tokens") or 0),
+        "total_tokens": int(usage.get("total_tokens") or 0),
+        "cached_tokens": int(details.get("cached_tokens") or 0),
+    }
+
+
+def normalize_response(
+    raw: Dict[str, Any],
+    *,
+    provider: str,
+    model: str,
+) -> Dict[str, Any]:
+    """Return ``{"choices", "usage", "provider", "model"}`` regardless of provider."""
+    choices = raw.get("choices") or []
+    if not choices:
+        raise LLMError(f"{provider} response missing choices", provider=provider)
+
+    first = choices[0]
+    message = dict(first.get("message") or {})
+    message.setdefault("role", "assistant")
+    if message.get("content") is None:
+        message["content"] = ""
+    if not message.get("tool_calls"):
+        message.pop("tool_calls", None)
+
+    normalized_choice: Dict[str, Any] = {"message": message}
+    if "finish_reason" in first:
+        normalized_choice["finish_reason"] = first["finish_reason"]
+
+    usage = raw.get("usage") or {}
+    normalize_usage = _normalize_gemini_usage if provider == "gemini" else _normalize_openai_usage
+    normalized = {
+        "choices": [normalized_choice],
+        "usage": normalize_usage(usage),
+        "provider": provider,
+        "model": model,
+    }
+    if raw.get("cache_hit"):
+        normalized["cache_hit"] = True
+    return normalized
+
+
+class Provider(Protocol):
+    name: str
+    supports_streaming: bool
+
+    def model_for(self, model: str) -> str: ...
+
+    async def complete(self, call: LLMCall) -> Dict[str, Any]: ...
+
+
+class GeminiProvider:
+    """Primary provider; supports streaming and Gemini-side caching."""
+
+    name = "gemini"
+    supports_streaming = True
+
+    def model_for(self, model: str) -> str:
+        return model
+
+    async def complete(self, call: LLMCall) -> Dict[str, Any]:
+        raw = await gemini_request_chat_completion(
+            model=call.model,
+            messages=call.messages,
+            system=call.system,
+            api_key=call.api_key,
+            tools=call.tools,
+            cache_ttl=call.cache_ttl,
+            cache_static_prefix=call.cache_static_prefix,
+        )
+        return normalize_response(raw, provider=self.name, model=call.model)
+
+    async def stream(self, call: LLMCall) -> AsyncIterator[Dict[str, Any]]:
+        async for event in gemini_stream_chat_completion(
+            model=call.model,
+            messages=call.messages,
+            system=call.system,
+            api_key=call.api_key,
+            tools=call.tools,
+            cache_static_prefix=call.cache_static_prefix,
+        ):
+            if event["type"] == "done":
+                event = {
+                    "type": "done",
+                    "response": normalize_response(event["response"], provider=self.name, model=call.model),
+                }
+            yield event
+
+
+class OpenRouterProvider:
+    """Fallback provider reached through OpenRouter's OpenAI-compatible API."""
+
+    name = "openrouter"
+    supports_streaming = False
+
+    def __init__(self, fallback_model: str) -> None:
+        self._fallback_model = fallback_model
+
+    def model_for(self, model: str) -> str:
+        # OpenRouter model ids are namespaced ("google/..."); map bare Gemini names
+        return model if "/" in model else self._fallback_model
+
+    async def complete(self, call: LLMCall) -> Dict[str, Any]:
+        model = self.model_for(call.model)
+        raw = await openrouter_request_chat_completion(
+            model=model,
+            messages=call.messages,
+            system=call.system,
+            tools=call.tools,
+        )
+        return normalize_response(raw, provider=self.name, model=model)
+
+
+def build_providers() -> List[Provider]:
+    """Return configured providers in preference order."""
+    settings = get_settings()
+    providers: List[Provider] = [GeminiProvider()]
+    fallback = settings.llm_fallback_provider
+    if fallback == "openrouter" and settings.openrouter_api_key:
+        providers.append(OpenRouterProvider(settings.openrouter_fallback_model))
+    return providers
+
+
+def response_events(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Synthesize stream events from a complete response (non-streaming providers)."""
+    message = response["choices"][0]["message"]
+    events: List[Dict[str, Any]] = []
+    if message.get("content"):
+        events.append({"type": "text", "text": message["content"]})
+    for tool_call in message.get("tool_calls") or []:
+        events.append({"type": "tool_call", "tool_call": tool_call})
+    events.append({"type": "done", "response": response})
+    return events
+
+
+__all__ = [
+    "GeminiProvider",
+    "OpenRouterProvider",
+    "PROVIDER_ERRORS",
+    "Provider",
+    "build_providers",
+    "normalize_response",
+    "response_events",
+]
@@ -0,0 +1,174 @@
+"""Retry classification, jittered backoff and per-provider circuit breakers for LLM calls."""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .deadline import DeadlineExceeded
+from .types import LLMError
+
+# Upstream statuses worth retrying: throttling, timeouts and server-side failures
+_RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while its circuit is open."""
+
+    def __init__(self, message: str, *, provider: Optional[str] = None, retry_after: float = 0.0) -> None:
+        super().__init__(message, provider=provider)
+        self.retry_after = retry_after
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True for throttling, 5xx, timeouts and transport failures.
+
+    Walks the ``__cause__`` chain so wrapped errors (``LLMError`` raised from a
+    ``GeminiError`` raised from an ``httpx`` timeout) classify like the root.
+    """
+    seen = 0
+    current: Optional[BaseException] = exc
+    while current is not None and seen < 8:
+        if isinstance(current, (CircuitOpenError, DeadlineExceeded)):
+            return False
+        status = _status_code(current)
+        if status is not None:
+            return status in _RETRYABLE_STATUSES
+        if isinstance(current, (httpx.TransportError, TimeoutError)):
+            return True
+        current = current.__cause__
+        seen += 1
+    return False
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Return the server-requested backoff carried anywhere in the cause chain."""
+    current: Optional[BaseException] = exc
+    while current is not None:
+        value = getattr(current, "retry_after", None)
+        if isinstance(value, (int, float)) and value > 0:
+            return float(value)
+        current = current.__cause__
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped per sleep."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """Seconds to sleep before retry number ``attempt`` (1-based).
+
+        A server-supplied Retry-After wins over the computed backoff but is
+        still capped at ``max_delay``.
+        """
+        requested = retry_after(exc) if exc is not None else None
+        if requested is not None:
+            return min(requested, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(attempt - 1, 0)))
+        return random.uniform(0.0, ceiling)
+
+
+class CircuitBreaker:
+    """Closed → open after consecutive retryable failures → half-open probe → closed.
+
+    While open, calls fail immediately so agents do not spend a full timeout
+    per request on a provider that is known to be down. After
+    ``reset_seconds`` one probe call is let through; its outcome closes the
+    circuit or re-opens it for another ``reset_seconds``.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        self._failure_threshold = max(failure_threshold, 1)
+        self._reset_seconds = reset_seconds
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self.retry_in() <= 0:
+            return self.HALF_OPEN
+        return self._state
+
+    def retry_in(self) -> float:
+        if self._state != self.OPEN:
+            return 0.0
+        return max(self._opened_at + self._reset_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed; claims the probe when half-open."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self) -> None:
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException) -> None:
+        """Count a failure; only retryable (provider-side) errors can trip the breaker."""
+        if not is_retryable(exc):
+            # A bad request says nothing about provider health; release a probe as success
+            if self._probe_in_flight:
+                self.record_success()
+            return
+        self._consecutive_failures += 1
+        if self._probe_in_flight or self._consecutive_failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                self.times_opened += 1
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Give back an unused probe (e.g. the call was cancelled before finishing)."""
+        if self._probe_in_flight:
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_in_seconds": round(self.retry_in(), 3),
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryPolicy",
+    "is_retryable",
+    "retry_after",
+]
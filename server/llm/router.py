@@ -0,0 +1,395 @@
+"""Latency- and error-aware routing across LLM providers with retries, failover and hedging."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..logging_config import logger
+from .deadline import run_within, time_remaining
+from .limiter import LimiterTimeout, get_llm_limiter
+from .providers import PROVIDER_ERRORS, Provider, build_providers, response_events
+from .resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, is_retryable
+from .types import LLMCall, LLMError, total_tokens
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ProviderHealth:
+    """Rolling window of (latency, success) samples for one provider/model."""
+
+    # Fewer samples than this never mark a provider degraded
+    MIN_SAMPLES = 5
+    # A degraded provider gets a probe request once it has been idle this long
+    RECOVERY_PROBE_SECONDS = 30.0
+
+    def __init__(self, window: int) -> None:
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=max(window, 1))
+        self.requests = 0
+        self.failures = 0
+        self._last_sample_at = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self._samples.append((latency, ok))
+        self._last_sample_at = time.monotonic()
+        self.requests += 1
+        if not ok:
+            self.failures += 1
+
+    def latency_percentiles(self) -> Tuple[float, float]:
+        latencies = sorted(latency for latency, ok in self._samples if ok)
+        return _percentile(latencies, 0.5), _percentile(latencies, 0.95)
+
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    def is_degraded(self, max_error_rate: float, max_p95_seconds: float) -> bool:
+        if len(self._samples) < self.MIN_SAMPLES:
+            return False
+        if time.monotonic() - self._last_sample_at > self.RECOVERY_PROBE_SECONDS:
+            return False
+        if self.error_rate() > max_error_rate:
+            return True
+        _, p95 = self.latency_percentiles()
+        return max_p95_seconds > 0 and p95 > max_p95_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.latency_percentiles()
+        return {
+            "samples": len(self._samples),
+            "p50_seconds": round(p50, 3),
+            "p95_seconds": round(p95, 3),
+            "error_rate": round(self.error_rate(), 3),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def _final_error(errors: List[Exception]) -> Optional[Exception]:
+    """Prefer a retryable failure so one open circuit does not mask a transient error."""
+    for error in errors:
+        if is_retryable(error):
+            return error
+    return errors[-1] if errors else None
+
+
+class LLMRouter:
+    """Pick the healthiest provider, fail over on errors and optionally hedge slow calls.
+
+    Each provider/model pair has a circuit breaker; a whole pass over the
+    providers that ends in a retryable error is retried with jittered
+    backoff (honoring Retry-After) up to the policy's attempt limit.
+    """
+
+    def __init__(
+        self,
+        providers: List[Provider],
+        *,
+        window: int = 50,
+        max_error_rate: float = 0.5,
+        max_p95_seconds: float = 30.0,
+        hedge_delay_seconds: float = 0.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+    ) -> None:
+        if not providers:
+            raise ValueError("LLMRouter requires at least one provider")
+        self._providers = providers
+        self._window = window
+        self._max_error_rate = max_error_rate
+        self._max_p95_seconds = max_p95_seconds
+        self._hedge_delay_seconds = hedge_delay_seconds
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_seconds = breaker_reset_seconds
+        self._health: Dict[str, ProviderHealth] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._retries = 0
+        self._failovers = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    def _health_for(self, provider: Provider, model: str) -> ProviderHealth:
+        key = f"{provider.name}/{provider.model_for(model)}"
+        health = self._health.get(key)
+        if health is None:
+            health = ProviderHealth(self._window)
+            self._health[key] = health
+        return health
+
+    def _breaker_for(self, provider: Provider, model: str) -> CircuitBreaker:
+        key = f"{provider.name}/{provider.model_for(model)}"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self._breaker_failure_threshold, self._breaker_reset_seconds)
+            self._breakers[key] = breaker
+        return breaker
+
+    def _claim(self, provider: Provider, model: str) -> CircuitBreaker:
+        """Return the provider's breaker, or raise if its circuit is open."""
+        breaker = self._breaker_for(provider, model)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"{provider.name} circuit open for {provider.model_for(model)}",
+                provider=provider.name,
+                retry_after=breaker.retry_in(),
+            )
+        return breaker
+
+    def _is_degraded(self, provider: Provider, model: str) -> bool:
+        return self._health_for(provider, model).is_degraded(self._max_error_rate, self._max_p95_seconds)
+
+    def _ordered(self, model: str) -> List[Provider]:
+        """Healthy providers first, preserving configured preference within each group."""
+        return sorted(
+            self._providers,
+            key=lambda provider: (
+                self._breaker_for(provider, model).state == CircuitBreaker.OPEN,
+                self._is_degraded(provider, model),
+            ),
+        )
+
+    async def _attempt(self, provider: Provider, call: LLMCall) -> Dict[str, Any]:
+        health = self._health_for(provider, call.model)
+        breaker = self._claim(provider, call.model)
+        try:
+            async with get_llm_limiter().slot(
+                provider.model_for(call.model), call.priority, call.estimated_tokens(), deadline=call.deadline
+            ) as slot:
+                started = time.monotonic()
+                try:
+                    response = await run_within(
+                        provider.complete(call), call.deadline, what=f"{provider.name} call"
+                    )
+                except PROVIDER_ERRORS as exc:
+                    health.record(time.monotonic() - started, ok=False)
+                    breaker.record_failure(exc)
+                    raise
+                health.record(time.monotonic() - started, ok=True)
+                breaker.record_success()
+                slot.record_usage(total_tokens(response))
+        finally:
+            breaker.release()
+        return response
+
+    async def _backoff(self, call: LLMCall, attempt: int, error: LLMError) -> bool:
+        """Sleep before the next attempt; return False when the error should surface."""
+        if attempt >= self._retry_policy.max_attempts or not is_retryable(error):
+            return False
+        delay = self._retry_policy.delay(attempt, error)
+        remaining = time_remaining(call.deadline) if call.deadline is not None else None
+        if remaining is not None and delay >= remaining:
+            # Sleeping would eat the rest of the caller's budget; surface the error now
+            return False
+        self._retries += 1
+        logger.warning(
+            "LLM call failed; retrying",
+            extra={
+                "caller": call.caller,
+                "model": call.model,
+                "attempt": attempt,
+                "delay_seconds": round(delay, 3),
+                "error": str(error),
+            },
+        )
+        await asyncio.sleep(delay)
+        return True
+
+    async def complete(self, call: LLMCall) -> Dict[str, Any]:
+        """Return a normalized response, retrying transient failures with backoff."""
+        attempt = 1
+        while True:
+            try:
+                return await self._complete_once(call)
+            except LLMError as exc:
+                if not await self._backoff(call, attempt, exc):
+                    raise
+            attempt += 1
+
+    async def _complete_once(self, call: LLMCall) -> Dict[str, Any]:
+        """One pass over the providers: the first that succeeds wins."""
+        order = self._ordered(call.model)
+        if self._hedge_delay_seconds > 0 and len(order) > 1:
+            return await self._complete_hedged(order, call)
+
+        errors: List[Exception] = []
+        for index, provider in enumerate(order):
+            if index:
+                self._failovers += 1
+                logger.warning(
+                    "LLM provider failed; failing over",
+                    extra={"from": order[index - 1].name, "to": provider.name, "error": str(errors[-1])},
+                )
+            try:
+                return await self._attempt(provider, call)
+            except (*PROVIDER_ERRORS, LimiterTimeout) as exc:
+                errors.append(exc)
+        last_error = _final_error(errors)
+        raise LLMError(str(last_error), provider=order[-1].name) from last_error
+
+    async def _complete_hedged(self, order: List[Provider], call: LLMCall) -> Dict[str, Any]:
+        """Race a backup provider against the primary once the hedge delay elapses."""
+        pending: Dict["asyncio.Task[Dict[str, Any]]", Provider] = {
+            asyncio.create_task(self._attempt(order[0], call)): order[0]
+        }
+        remaining = list(order[1:])
+        errors: List[Exception] = []
+        timeout: Optional[float] = self._hedge_delay_seconds
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slow: hedge with the next provider, then wait for either
+                    timeout = None
+                    if remaining:
+                        backup = remaining.pop(0)
+                        self._hedges += 1
+                        logger.info("Hedging slow LLM call", extra={"provider": backup.name})
+                        pending[asyncio.create_task(self._attempt(backup, call))] = backup
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        response = task.result()
+                    except (*PROVIDER_ERRORS, LimiterTimeout) as exc:
+                        errors.append(exc)
+                        continue
+                    if provider is not order[0]:
+                        self._hedge_wins += 1
+                    return response
+
+                if not pending and remaining:
+                    backup = remaining.pop(0)
+                    self._failovers += 1
+                    pending[asyncio.create_task(self._attempt(backup, call))] = backup
+        finally:
+            for task in pending:
+                task.cancel()
+
+        last_error = _final_error(errors)
+        raise LLMError(str(last_error), provider=order[-1].name) from last_error
+
+    async def stream(self, call: LLMCall) -> AsyncIterator[Dict[str, Any]]:
+        """Stream events, retrying with backoff only while nothing has been yielded."""
+        attempt = 1
+        while True:
+            yielded = False
+            try:
+                async for event in self._stream_once(call):
+                    yielded = True
+                    yield event
+                return
+            except LLMError as exc:
+                if yielded or not await self._backoff(call, attempt, exc):
+                    raise
+            attempt += 1
+
+    async def _stream_once(self, call: LLMCall) -> AsyncIterator[Dict[str, Any]]:
+        """Stream from the healthiest streaming provider, failing over before the first event."""
+        order = self._ordered(call.model)
+        errors: List[Exception] = []
+
+        for index, provider in enumerate(order):
+            if index:
+                self._failovers += 1
+            if not getattr(provider, "supports_streaming", False):
+                try:
+                    response = await self._attempt(provider, call)
+                except (*PROVIDER_ERRORS, LimiterTimeout) as exc:
+                    errors.append(exc)
+                    continue
+                for event in response_events(response):
+                    yield event
+                return
+
+            health = self._health_for(provider, call.model)
+            yielded = False
+            try:
+                breaker = self._claim(provider, call.model)
+                try:
+                    async with get_llm_limiter().slot(
+                        provider.model_for(call.model),
+                        call.priority,
+                        call.estimated_tokens(),
+                        deadline=call.deadline,
+                    ) as slot:
+                        started = time.monotonic()
+                        try:
+                            async for event in provider.stream(call):
+                                if event["type"] == "done":
+                                    health.record(time.monotonic() - started, ok=True)
+                                    breaker.record_success()
+                                    slot.record_usage(total_tokens(event["response"]))
+                                yielded = True
+                                yield event
+                        except PROVIDER_ERRORS as exc:
+                            health.record(time.monotonic() - started, ok=False)
+                            breaker.record_failure(exc)
+                            raise
+                finally:
+                    breaker.release()
+                return
+            except (*PROVIDER_ERRORS, LimiterTimeout) as exc:
+                if yielded:
+                    raise LLMError(str(exc), provider=provider.name) from exc
+                errors.append(exc)
+
+        last_error = _final_error(errors)
+        raise LLMError(str(last_error), provider=order[-1].name) from last_error
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "providers": {
+                key: {
+                    **health.snapshot(),
+                    "degraded": health.is_degraded(self._max_error_rate, self._max_p95_seconds),
+                }
+                for key, health in self._health.items()
+            },
+            "breakers": {key: breaker.snapshot() for key, breaker in self._breakers.items()},
+            "retries": self._retries,
+            "failovers": self._failovers,
+            "hedges": self._hedges,
+            "hedge_wins": self._hedge_wins,
+        }
+
+
+_router: Optional[LLMRouter] = None
+
+
+def get_llm_router() -> LLMRouter:
+    """Return the process-wide router configured from settings."""
+    global _router
+    if _router is None:
+        settings = get_settings()
+        _router = LLMRouter(
+            build_providers(),
+            window=settings.llm_health_window,
+            max_error_rate=settings.llm_degraded_error_rate,
+            max_p95_seconds=settings.llm_degraded_p95_seconds,
+            hedge_delay_seconds=settings.llm_hedge_delay_seconds,
+            retry_policy=RetryPolicy(
+                max_attempts=settings.llm_retry_max_attempts,
+                base_delay=settings.llm_retry_base_delay_seconds,
+                max_delay=settings.llm_retry_max_delay_seconds,
+            ),
+            breaker_failure_threshold=settings.llm_breaker_failure_threshold,
+            breaker_reset_seconds=settings.llm_breaker_reset_seconds,
+        )
+    return _router
+
+
+__all__ = ["LLMRouter", "ProviderHealth", "get_llm_router"]
@@ -0,0 +1,131 @@
+"""Coalesce concurrent identical LLM calls into a single upstream request.
+
+A caller only joins an in-flight call that serves it at least as well as its
+own would: one scheduled at the same or a higher priority, with a deadline
+no earlier than its own. Anyone else starts a fresh call, which later
+identical callers then join, so a user-priority request never waits behind
+a summarizer and nobody inherits a deadline tighter than theirs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..logging_config import logger
+from .deadline import DeadlineExceeded, run_within
+from .limiter import Priority
+
+
+@dataclass
+class _Flight:
+    task: "asyncio.Task[Dict[str, Any]]"
+    priority: Priority = Priority.EXECUTION
+    # time.monotonic() instant the upstream call gives up at (None = unbounded)
+    deadline: Optional[float] = None
+    waiters: int = 0
+    shared: bool = False
+
+    def serves(self, priority: Priority, deadline: Optional[float]) -> bool:
+        """Whether a caller with ``priority`` and ``deadline`` may wait on this call."""
+        if priority < self.priority:
+            return False
+        if self.deadline is None:
+            return True
+        return deadline is not None and deadline <= self.deadline
+
+
+class SingleFlight:
+    """Share one in-flight call per key among every concurrent caller.
+
+    Callers await the shared task through ``asyncio.shield`` so a caller that
+    times out or is cancelled only detaches itself; the upstream request is
+    cancelled only once no caller is left waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._abandoned = 0
+        self._declined = 0
+
+    async def do(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Dict[str, Any]]],
+        *,
+        priority: Priority = Priority.EXECUTION,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        flight = self._flights.get(key)
+        joined = flight is not None and flight.serves(priority, deadline)
+        if flight is not None and not joined:
+            # The in-flight call is less urgent or gives up sooner; lead a fresh one
+            self._declined += 1
+            logger.debug(
+                "Not coalescing identical LLM call",
+                extra={"priority": priority.name.lower(), "leader_priority": flight.priority.name.lower()},
+            )
+        if joined:
+            self._coalesced += 1
+            flight.shared = True
+            logger.debug("Coalescing identical LLM call", extra={"waiters": flight.waiters + 1})
+        else:
+            flight = _Flight(task=asyncio.ensure_future(factory()), priority=priority, deadline=deadline)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task, key=key: self._forget(key, _task))
+            self._leaders += 1
+
+        flight.waiters += 1
+        try:
+            if joined:
+                # A joiner may need the answer before the leader's deadline
+                result = await run_within(asyncio.shield(flight.task), deadline, what="coalesced LLM call")
+            else:
+                result = await asyncio.shield(flight.task)
+        except (asyncio.CancelledError, DeadlineExceeded):
+            if flight.task.done() or flight.waiters > 1:
+                raise
+            # Last interested caller left; nobody needs the upstream response
+            self._abandoned += 1
+            flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+        # Shared results are copied per caller so each can mutate its response freely
+        return copy.deepcopy(result) if flight.shared else result
+
+    def _forget(self, key: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every waiter has already gone
+            task.exception()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "abandoned": self._abandoned,
+            "declined": self._declined,
+        }
+
+
+_singleflight: Optional[SingleFlight] = None
+
+
+def get_singleflight() -> SingleFlight:
+    """Return the process-wide singleflight group for LLM completions."""
+    global _singleflight
+    if _singleflight is None:
+        _singleflight = SingleFlight()
+    return _singleflight
+
+
+__all__ = ["SingleFlight", "get_singleflight"]
@@ -0,0 +1,79 @@
+"""Offline token estimation for prompts, messages and tool declarations."""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Letters split into sub-word pieces; every digit, symbol and non-ASCII char counts alone
+_PIECE_PATTERN = re.compile(r"[A-Za-z]+|[0-9]|[^\sA-Za-z0-9]")
+_LETTERS_PER_TOKEN = 5
+
+# Role markers and separators the provider adds around each message
+_PER_MESSAGE_OVERHEAD = 4
+
+_TOOLS_ESTIMATE_CACHE_SIZE = 32
+# Keyed by the identity of each schema dict, like the Gemini tools block cache;
+# entries keep the dicts alive so their ids cannot be reused while cached.
+_tools_estimate_cache: "OrderedDict[Tuple[int, ...], Tuple[Tuple[Dict[str, Any], ...], int]]" = OrderedDict()
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Approximate the tokenizer's count for ``text`` without a vocabulary.
+
+    Tracks SentencePiece/BPE behaviour closely enough for budgeting: common
+    short words are one token, long words split every few letters, and digits,
+    punctuation and non-Latin characters are roughly one token each.
+    """
+    if not text:
+        return 0
+    count = 0
+    for piece in _PIECE_PATTERN.findall(text):
+        if piece[0].isascii() and piece[0].isalpha():
+            count += (len(piece) + _LETTERS_PER_TOKEN - 1) // _LETTERS_PER_TOKEN
+        else:
+            count += 1
+    return count
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    total = 0
+    for message in messages:
+        total += _PER_MESSAGE_OVERHEAD
+        content = message.get("content")
+        if isinstance(content, str):
+            total += estimate_tokens(content)
+        elif content is not None:
+            total += estimate_tokens(json.dumps(content))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function") or {}
+            total += estimate_tokens(function.get("name")) + estimate_tokens(function.get("arguments"))
+    return total
+
+
+def estimate_tools_tokens(tools: Optional[List[Dict[str, Any]]]) -> int:
+    """Estimate tool declarations, memoized by the identity of the schema dicts.
+
+    Tool schemas are module-level constants reused on every call, so the
+    estimate is computed once per tool list. Schemas must not be mutated in
+    place after they are first estimated.
+    """
+    if not tools:
+        return 0
+
+    identity = tuple(id(tool) for tool in tools)
+    cached = _tools_estimate_cache.get(identity)
+    if cached is not None:
+        _tools_estimate_cache.move_to_end(identity)
+        return cached[1]
+
+    count = sum(estimate_tokens(json.dumps(tool, separators=(",", ":"))) for tool in tools)
+    _tools_estimate_cache[identity] = (tuple(tools), count)
+    while len(_tools_estimate_cache) > _TOOLS_ESTIMATE_CACHE_SIZE:
+        _tools_estimate_cache.popitem(last=False)
+    return count
+
+
+__all__ = ["estimate_message_tokens", "estimate_tokens", "estimate_tools_tokens"]
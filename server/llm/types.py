@@ -0,0 +1,82 @@
+"""Shared request/response types for the LLM coordination layer."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .limiter import Priority
+from .tokens import estimate_message_tokens, estimate_tokens, estimate_tools_tokens
+
+
+class LLMError(RuntimeError):
+    """Raised when no provider could complete an LLM call."""
+
+    def __init__(self, message: str, *, provider: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.provider = provider
+
+
+@dataclass
+class LLMCall:
+    """A provider-neutral chat completion request (OpenAI-style messages and tools)."""
+
+    model: str
+    messages: List[Dict[str, Any]]
+    system: Optional[str] = None
+    api_key: Optional[str] = None
+    tools: Optional[List[Dict[str, Any]]] = None
+    priority: Priority = Priority.EXECUTION
+    # Accounting tag, e.g. "interaction_agent" or "execution_agent:<name>"
+    caller: Optional[str] = None
+    cache_ttl: Optional[float] = None
+    cache_static_prefix: bool = False
+    # Absolute time.monotonic() instant the caller needs an answer by
+    deadline: Optional[float] = None
+    _estimated_tokens: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def fingerprint(self) -> str:
+        """Hash everything that determines the response (priority, key and deadline excluded).
+
+        Calls with equal fingerprints may share one response; whether a caller
+        may wait on another's call also depends on their priorities and
+        deadlines (see :mod:`.singleflight`).
+        """
+        canonical = json.dumps(
+            {
+                "model": self.model,
+                "system": self.system,
+                "messages": self.messages,
+                "tools": self.tools,
+                "cache_static_prefix": self.cache_static_prefix,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def estimated_tokens(self) -> int:
+        """Approximate prompt size, computed on first use.
+
+        The budget check, every retry and every hedged attempt reuse the stored
+        value, so the prompt must not be changed after the call is built.
+        """
+        if self._estimated_tokens is None:
+            self._estimated_tokens = (
+                estimate_tokens(self.system)
+                + estimate_message_tokens(self.messages)
+                + estimate_tools_tokens(self.tools)
+            )
+        return self._estimated_tokens
+
+
+def total_tokens(response: Dict[str, Any]) -> Optional[int]:
+    """Return the normalized total token count of a response, if reported."""
+    total = (response.get("usage") or {}).get("total_tokens")
+    return total if isinstance(total, int) else None
+
+
+__all__ = ["LLMCall", "LLMError", "total_tokens"]
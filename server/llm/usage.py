@@ -0,0 +1,245 @@
+"""Per-call token and latency accounting for LLM requests, persisted to SQLite.
+
+Records are queued in memory and written in batches by a short-lived
+background thread, so recording never blocks the event loop on SQLite.
+Responses served from the local response cache are recorded as cache hits
+with no upstream tokens.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import get_settings
+from ..logging_config import logger
+
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+_DEFAULT_DB_PATH = _DATA_DIR / "llm_usage.db"
+
+# Prune rows past retention once every this many inserts
+_PRUNE_EVERY = 500
+
+
+@dataclass
+class UsageRecord:
+    """One upstream LLM call as seen by the caller that issued it."""
+
+    caller: str
+    provider: str
+    model: str
+    priority: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    total_tokens: int
+    latency_ms: float
+    ok: bool
+    streamed: bool = False
+    # Served from the local response cache; no upstream tokens were spent
+    cache_hit: bool = False
+    created_at: float = 0.0
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class UsageStore:
+    """Append-only usage log with rolling per-caller aggregates."""
+
+    def __init__(self, db_path: Path, retention_days: int = 7) -> None:
+        self._db_path = db_path
+        self._retention_seconds = max(retention_days, 1) * 86400
+        self._lock = threading.Lock()
+        self._inserts = 0
+        # Records waiting for the background writer
+        self._pending: List[Dict[str, Any]] = []
+        self._pending_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._ensure_directory()
+        self._ensure_schema()
+
+    def _ensure_directory(self) -> None:
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("llm usage directory creation failed", extra={"error": str(exc)})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        schema_sql = """
+        CREATE TABLE IF NOT EXISTS llm_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at REAL NOT NULL,
+            caller TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            prompt_tokens INTEGER NOT NULL,
+            completion_tokens INTEGER NOT NULL,
+            cached_tokens INTEGER NOT NULL,
+            total_tokens INTEGER NOT NULL,
+            latency_ms REAL NOT NULL,
+            ok INTEGER NOT NULL,
+            streamed INTEGER NOT NULL DEFAULT 0,
+            cache_hit INTEGER NOT NULL DEFAULT 0
+        );
+        """
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_llm_usage_created
+        ON llm_usage (created_at);
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(schema_sql)
+            conn.execute(index_sql)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(llm_usage)")}
+            if "cache_hit" not in columns:
+                conn.execute("ALTER TABLE llm_usage ADD COLUMN cache_hit INTEGER NOT NULL DEFAULT 0")
+
+    def record(self, record: UsageRecord) -> None:
+        """Queue a record for the background writer."""
+        if not record.created_at:
+            record.created_at = time.time()
+        payload = asdict(record)
+        payload["ok"] = int(record.ok)
+        payload["streamed"] = int(record.streamed)
+        payload["cache_hit"] = int(record.cache_hit)
+        with self._pending_lock:
+            self._pending.append(payload)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="llm-usage-writer", daemon=True)
+                self._writer.start()
+
+    # Drain queued records until none are left, then let the thread exit
+    def _write_pending(self) -> None:
+        while True:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    self._writer = None
+                    return
+            self._insert(batch)
+
+    def flush(self) -> None:
+        """Write queued records now (used before reading)."""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._insert(batch)
+
+    def _insert(self, batch: List[Dict[str, Any]]) -> None:
+        columns = ", ".join(batch[0].keys())
+        placeholders = ", ".join(":" + key for key in batch[0].keys())
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("BEGIN")
+                conn.executemany(f"INSERT INTO llm_usage ({columns}) VALUES ({placeholders})", batch)
+                previous, self._inserts = self._inserts, self._inserts + len(batch)
+                if previous // _PRUNE_EVERY != self._inserts // _PRUNE_EVERY:
+                    conn.execute(
+                        "DELETE FROM llm_usage WHERE created_at < ?",
+                        (batch[-1]["created_at"] - self._retention_seconds,),
+                    )
+        except sqlite3.Error as exc:
+            logger.warning("llm usage write failed", extra={"error": str(exc), "records": len(batch)})
+
+    def aggregate(self, window_seconds: float) -> Dict[str, Any]:
+        """Return totals and per (caller, model) aggregates over the trailing window."""
+        self.flush()
+        since = time.time() - window_seconds
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT caller, model, provider, prompt_tokens, completion_tokens, cached_tokens,"
+                " total_tokens, latency_ms, ok, cache_hit FROM llm_usage WHERE created_at >= ?",
+                (since,),
+            ).fetchall()
+
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        latencies: Dict[tuple, List[float]] = {}
+        for row in rows:
+            key = (row["caller"], row["model"])
+            group = groups.setdefault(
+                key,
+                {
+                    "caller": row["caller"],
+                    "model": row["model"],
+                    "providers": {},
+                    "calls": 0,
+                    "errors": 0,
+                    "cache_hits": 0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "cached_tokens": 0,
+                    "total_tokens": 0,
+                },
+            )
+            group["calls"] += 1
+            group["errors"] += 0 if row["ok"] else 1
+            group["cache_hits"] += row["cache_hit"]
+            group["providers"][row["provider"]] = group["providers"].get(row["provider"], 0) + 1
+            for column in ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens"):
+                group[column] += row[column]
+            latencies.setdefault(key, []).append(row["latency_ms"])
+
+        callers: List[Dict[str, Any]] = []
+        for key, group in groups.items():
+            values = latencies[key]
+            group["avg_prompt_tokens"] = round(group["prompt_tokens"] / group["calls"])
+            group["avg_latency_ms"] = round(sum(values) / len(values), 1)
+            group["p50_latency_ms"] = round(_percentile(values, 0.5), 1)
+            group["p95_latency_ms"] = round(_percentile(values, 0.95), 1)
+            callers.append(group)
+        callers.sort(key=lambda group: group["total_tokens"], reverse=True)
+
+        totals = {
+            column: sum(group[column] for group in callers)
+            for column in (
+                "calls",
+                "errors",
+                "cache_hits",
+                "prompt_tokens",
+                "completion_tokens",
+                "cached_tokens",
+                "total_tokens",
+            )
+        }
+        return {"totals": totals, "callers": callers}
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending.clear()
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM llm_usage")
+
+
+_usage_store: Optional[UsageStore] = None
+_factory_lock = threading.Lock()
+
+
+def get_usage_store() -> UsageStore:
+    """Return the process-wide usage store, creating it on first use."""
+    global _usage_store
+    if _usage_store is None:
+        with _factory_lock:
+            if _usage_store is None:
+                settings = get_settings()
+                _usage_store = UsageStore(_DEFAULT_DB_PATH, retention_days=settings.llm_usage_retention_days)
+    return _usage_store
+
+
+__all__ = ["UsageRecord", "UsageStore", "get_usage_store"]
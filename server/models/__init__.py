@@ -1,8 +1,23 @@
 from .chat import ChatHistoryClearResponse, ChatHistoryResponse, ChatMessage, ChatRequest
 from .gmail import GmailConnectPayload, GmailDisconnectPayload, GmailStatusPayload
-from .meta import HealthResponse, RootResponse, SetTimezoneRequest, SetTimezoneResponse
+from .meta import (
+    CallerUsage,
+    CancelExecutionsRequest,
+    CancelExecutionsResponse,
+    ExecutionMetricsResponse,
+    HealthResponse,
+    LLMMetricsResponse,
+    RootResponse,
+    SetTimezoneRequest,
+    SetTimezoneResponse,
+    UsageResponse,
+)
 
 __all__ = [
+    "CallerUsage",
+    "CancelExecutionsRequest",
+    "CancelExecutionsResponse",
+    "ExecutionMetricsResponse",
     "ChatMessage",
     "ChatRequest",
     "ChatHistoryResponse",
@@ -11,7 +26,9 @@ __all__ = [
     "GmailDisconnectPayload",
     "GmailStatusPayload",
     "HealthResponse",
+    "LLMMetricsResponse",
     "RootResponse",
     "SetTimezoneRequest",
     "SetTimezoneResponse",
+    "UsageResponse",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -18,6 +18,56 @@ class RootResponse(BaseModel):
     endpoints: List[str]
 
 
+class LLMMetricsResponse(BaseModel):
+    ok: bool = True
+    limiter: Dict[str, Dict[str, Any]]
+    router: Dict[str, Any]
+    singleflight: Dict[str, int]
+    response_cache: Dict[str, int]
+
+
+class ExecutionMetricsResponse(BaseModel):
+    ok: bool = True
+    pool: Dict[str, Any]
+    pending: List[Dict[str, Any]]
+
+
+class CancelExecutionsRequest(BaseModel):
+    request_id: Optional[str] = None
+    agent_name: Optional[str] = None
+    batch_id: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class CancelExecutionsResponse(BaseModel):
+    ok: bool = True
+    cancelled: List[Dict[str, str]]
+
+
+class CallerUsage(BaseModel):
+    caller: str
+    model: str
+    providers: Dict[str, int]
+    calls: int
+    errors: int
+    cache_hits: int = 0
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    total_tokens: int
+    avg_prompt_tokens: int
+    avg_latency_ms: float
+    p50_latency_ms: float
+    p95_latency_ms: float
+
+
+class UsageResponse(BaseModel):
+    ok: bool = True
+    window_minutes: int
+    totals: Dict[str, int]
+    callers: List[CallerUsage]
+
+
 class SetTimezoneRequest(BaseModel):
     timezone: str
 
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 import httpx
 
 from ..config import get_settings
+from ..http_utils import retry_after_seconds
 
 OpenRouterBaseURL = "https://openrouter.ai/api/v1"
 
@@ -13,6 +14,16 @@ OpenRouterBaseURL = "https://openrouter.ai/api/v1"
 class OpenRouterError(RuntimeError):
     """Raised when the OpenRouter API returns an error response."""
 
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 
 def _headers(*, api_key: Optional[str] = None) -> Dict[str, str]:
     settings = get_settings()
@@ -43,7 +54,11 @@ def _handle_response_error(exc: httpx.HTTPStatusError) -> None:
         detail = payload.get("error") or payload.get("message") or json.dumps(payload)
     except Exception:
         detail = response.text
-    raise OpenRouterError(f"OpenRouter request failed ({response.status_code}): {detail}") from exc
+    raise OpenRouterError(
+        f"OpenRouter request failed ({response.status_code}): {detail}",
+        status_code=response.status_code,
+        retry_after=retry_after_seconds(response),
+    ) from exc
 
 
 async def request_chat_completion(
@@ -1,8 +1,13 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from ..models import ChatHistoryClearResponse, ChatHistoryResponse, ChatRequest
-from ..services import get_conversation_log, get_trigger_service, handle_chat_request
+from ..services import (
+    get_conversation_log,
+    get_trigger_service,
+    handle_chat_request,
+    handle_chat_stream_request,
+)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -15,6 +20,14 @@ async def chat_send(
     return await handle_chat_request(payload)
 
 
+@router.post("/stream", response_class=StreamingResponse, summary="Submit a chat message and stream the reply as server-sent events")
+# Stream interaction-agent output (text deltas and user messages) as it is generated
+async def chat_stream(
+    payload: ChatRequest,
+):
+    return await handle_chat_stream_request(payload)
+
+
 @router.get("/history", response_model=ChatHistoryResponse)
 # Retrieve the conversation history from the log
 def chat_history() -> ChatHistoryResponse:
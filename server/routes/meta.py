@@ -1,14 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from ..config import Settings, get_settings
+from ..gemini_client import get_response_cache
+from ..agents.execution_agent.batch_manager import get_execution_batch_manager
 from ..models import (
+    CancelExecutionsRequest,
+    CancelExecutionsResponse,
+    ExecutionMetricsResponse,
     HealthResponse,
+    LLMMetricsResponse,
     RootResponse,
     SetTimezoneRequest,
     SetTimezoneResponse,
+    UsageResponse,
 )
+from ..llm import get_llm_limiter, get_llm_router, get_singleflight, get_usage_store
 from ..services import get_timezone_store
 
 router = APIRouter(tags=["meta"])
@@ -37,6 +45,49 @@ def meta(request: Request, settings: Settings = Depends(get_settings)) -> RootRe
     )
 
 
+@router.get("/meta/llm", response_model=LLMMetricsResponse)
+# Report LLM queue depth, budget headroom, per-provider latency/error health and cache hit rates
+def llm_metrics() -> LLMMetricsResponse:
+    return LLMMetricsResponse(
+        limiter=get_llm_limiter().metrics(),
+        router=get_llm_router().metrics(),
+        singleflight=get_singleflight().metrics(),
+        response_cache=get_response_cache().stats(),
+    )
+
+
+@router.get("/meta/executions", response_model=ExecutionMetricsResponse)
+# Report execution worker pool usage, queue depth and in-flight agent runs
+def execution_metrics() -> ExecutionMetricsResponse:
+    manager = get_execution_batch_manager()
+    return ExecutionMetricsResponse(
+        pool=manager.get_pool_metrics(),
+        pending=manager.get_pending_executions(),
+    )
+
+
+@router.post("/meta/executions/cancel", response_model=CancelExecutionsResponse)
+# Cancel queued or running execution agents by request id, agent name and/or batch (async: runs on the event loop)
+async def cancel_executions(payload: CancelExecutionsRequest) -> CancelExecutionsResponse:
+    try:
+        cancelled = get_execution_batch_manager().cancel(
+            request_id=payload.request_id,
+            agent_name=payload.agent_name,
+            batch_id=payload.batch_id,
+            reason=payload.reason or "cancelled by an administrator",
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return CancelExecutionsResponse(cancelled=cancelled)
+
+
+@router.get("/meta/usage", response_model=UsageResponse)
+# Report rolling token and latency aggregates per caller and model
+def llm_usage(window_minutes: int = Query(default=60, ge=1, le=7 * 24 * 60)) -> UsageResponse:
+    aggregates = get_usage_store().aggregate(window_minutes * 60)
+    return UsageResponse(window_minutes=window_minutes, **aggregates)
+
+
 @router.post("/meta/timezone", response_model=SetTimezoneResponse)
 # Set the user's timezone for proper email timestamp formatting
 def set_timezone(payload: SetTimezoneRequest) -> SetTimezoneResponse:
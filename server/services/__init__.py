@@ -7,7 +7,7 @@ from .conversation import (
     get_working_memory_log,
     schedule_summarization,
 )
-from .conversation.chat_handler import handle_chat_request
+from .conversation.chat_handler import handle_chat_request, handle_chat_stream_request
 from .execution import AgentRoster, ExecutionAgentLogStore, get_agent_roster, get_execution_agent_logs
 from .gmail import (
     GmailSeenStore,
@@ -26,6 +26,7 @@ __all__ = [
     "ConversationLog",
     "SummaryState",
     "handle_chat_request",
+    "handle_chat_stream_request",
     "get_conversation_log",
     "get_working_memory_log",
     "schedule_summarization",
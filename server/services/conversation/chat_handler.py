@@ -1,8 +1,9 @@
 import asyncio
-from typing import Optional, Union
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Union
 
 from fastapi import status
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 from ...agents.interaction_agent.runtime import InteractionAgentRuntime
 from ...logging_config import logger
@@ -47,3 +48,59 @@ async def handle_chat_request(payload: ChatRequest) -> Union[PlainTextResponse,
     asyncio.create_task(_run_interaction())
 
     return PlainTextResponse("", status_code=status.HTTP_202_ACCEPTED)
+
+
+# Render a single server-sent event frame
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# Stream the interaction agent's output for a chat request as server-sent events
+async def handle_chat_stream_request(payload: ChatRequest) -> Union[StreamingResponse, JSONResponse]:
+    """Handle a chat request and stream user-facing output as it is generated."""
+
+    user_message = _extract_latest_user_message(payload)
+    if user_message is None:
+        return error_response("Missing user message", status_code=status.HTTP_400_BAD_REQUEST)
+
+    user_content = user_message.content.strip()
+
+    logger.info("chat stream request", extra={"message_length": len(user_content)})
+
+    try:
+        runtime = InteractionAgentRuntime()
+    except ValueError as ve:
+        logger.error("configuration error", extra={"error": str(ve)})
+        return error_response(str(ve), status_code=status.HTTP_400_BAD_REQUEST)
+
+    queue: asyncio.Queue[Optional[Dict[str, Any]]] = asyncio.Queue()
+
+    async def _run_interaction() -> None:
+        try:
+            result = await runtime.execute(user_message=user_content, on_event=queue.put_nowait)
+            if result.success:
+                queue.put_nowait({"type": "done", "response": result.response})
+            else:
+                queue.put_nowait({"type": "error", "error": result.error or "Interaction failed"})
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.error("chat stream task failed", extra={"error": str(exc)})
+            queue.put_nowait({"type": "error", "error": str(exc)})
+        finally:
+            queue.put_nowait(None)
+
+    # The turn keeps running (and is logged) even if the client disconnects mid-stream
+    asyncio.create_task(_run_interaction())
+
+    async def _event_stream() -> AsyncIterator[str]:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            event_type = event.pop("type")
+            yield _format_sse(event_type, event)
+
+    return StreamingResponse(
+        _event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
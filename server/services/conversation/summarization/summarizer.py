@@ -5,7 +5,7 @@ from typing import List, Optional, TYPE_CHECKING
 
 from ....config import get_settings
 from ....logging_config import logger
-from ....gemini_client import GeminiError, request_chat_completion
+from ....llm import LLMError, Priority, request_chat_completion
 from .prompt_builder import SummaryPrompt, build_summarization_prompt
 from .state import LogEntry, SummaryState
 from .working_memory_log import get_working_memory_log
@@ -27,47 +27,38 @@ def _collect_entries(log) -> List[LogEntry]:
     return entries
 
 
-async def _call_gemini(prompt: SummaryPrompt, model: str, api_key: Optional[str]) -> str:
-    last_error: Exception | None = None
-    for attempt in range(2):
-        try:
-            response = await request_chat_completion(
-                model=model,
-                messages=prompt.messages,
-                system=prompt.system_prompt,
-                api_key=api_key,
-            )
-            choices = response.get("choices") or []
-            if not choices:
-                raise GeminiError("Gemini response missing choices")
-            message = choices[0].get("message") or {}
-            content = (message.get("content") or "").strip()
-            if content:
-                return content
-            raise GeminiError("Gemini response missing content")
-        except GeminiError as exc:
-            last_error = exc
-            if attempt == 0:
-                logger.warning(
-                    "conversation summarization attempt failed; retrying",
-                    extra={"error": str(exc)},
-                )
-                continue
-            logger.error(
-                "conversation summarization failed",
-                extra={"error": str(exc)},
-            )
-            break
-        except Exception as exc:  # pragma: no cover - defensive
-            last_error = exc
-            logger.error(
-                "conversation summarization unexpected failure",
-                extra={"error": str(exc)},
-            )
-            break
-    if last_error:
-        raise last_error
-    raise GeminiError("Conversation summarization failed")
+async def _call_gemini(
+    prompt: SummaryPrompt,
+    model: str,
+    api_key: Optional[str],
+    cache_ttl: Optional[float] = None,
+) -> str:
+    # Transient failures are retried with backoff by the LLM router
+    try:
+        response = await request_chat_completion(
+            model=model,
+            messages=prompt.messages,
+            system=prompt.system_prompt,
+            api_key=api_key,
+            priority=Priority.SUMMARIZER,
+            caller="summarizer",
+            cache_ttl=cache_ttl,
+        )
+    except LLMError as exc:
+        logger.error(
+            "conversation summarization failed",
+            extra={"error": str(exc)},
+        )
+        raise
+
+    choices = response.get("choices") or []
+    if not choices:
+        raise LLMError("LLM response missing choices")
+    message = choices[0].get("message") or {}
+    content = (message.get("content") or "").strip()
+    if not content:
+        raise LLMError("LLM response missing content")
+    return content
 
 
 async def summarize_conversation() -> bool:
@@ -107,7 +98,12 @@ async def summarize_conversation() -> bool:
         },
     )
 
-    summary_text = await _call_gemini(prompt, settings.summarizer_model, settings.gemini_api_key)
+    summary_text = await _call_gemini(
+        prompt,
+        settings.summarizer_model,
+        settings.gemini_api_key,
+        cache_ttl=settings.summarizer_cache_ttl_seconds,
+    )
     summary_body = summary_text if summary_text else state.summary_text
 
     refreshed_entries = _collect_entries(conversation_log)
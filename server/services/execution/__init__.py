@@ -1,11 +1,26 @@
 """Execution agent support services."""
 
-from .log_store import ExecutionAgentLogStore, get_execution_agent_logs
+from .log_backends import ExecutionLogBackend, FileLogBackend, SQLiteLogBackend
+from .log_store import (
+    ExecutionAgentLogStore,
+    ExecutionSummary,
+    get_execution_agent_logs,
+    import_legacy_execution_logs,
+)
+from .queue_store import ExecutionJob, ExecutionQueueStore, get_execution_queue
 from .roster import AgentRoster, get_agent_roster
 
 __all__ = [
     "ExecutionAgentLogStore",
+    "ExecutionLogBackend",
+    "FileLogBackend",
+    "SQLiteLogBackend",
+    "ExecutionSummary",
     "get_execution_agent_logs",
+    "import_legacy_execution_logs",
+    "ExecutionJob",
+    "ExecutionQueueStore",
+    "get_execution_queue",
     "AgentRoster",
     "get_agent_roster",
 ]
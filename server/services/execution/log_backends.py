@@ -0,0 +1,740 @@
+"""Storage backends for execution agent logs.
+
+:class:`SQLiteLogBackend` (the default) keeps every agent's entries in one
+table keyed by ``(agent, seq)``, with each entry tagged with the request it
+belongs to, so the last N requests or a request range is one indexed range
+query and a batch of entries is one transaction. Per-agent request counts
+and rolling summaries live in a small agents table.
+
+:class:`FileLogBackend` keeps the original one-journal-per-agent layout for
+development: ``<slug>.log`` holds XML-style lines and a sidecar offset index
+(``<slug>.idx``) has one little-endian uint64 per ``agent_request`` line,
+giving its byte offset in the log. Reading the last N requests is then one
+seek into the index and one into the log instead of a full parse. The index
+is appended with each request and rebuilt from the log whenever it is
+missing or does not match it (see :meth:`FileLogBackend.rebuild_index`).
+
+Both key agents by slug. Existing ``.log`` files are copied into SQLite by
+:mod:`.migrate_logs`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from html import escape, unescape
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+from ...logging_config import logger
+
+# (tag, timestamp, payload)
+LogEntry = Tuple[str, str, str]
+
+_ATTR_PATTERN = re.compile(r"(\w+)\s*=\s*\"([^\"]*)\"")
+
+_REQUEST_TAG = "agent_request"
+_REQUEST_PREFIX = f"<{_REQUEST_TAG}".encode("utf-8")
+_OFFSET = struct.Struct("<Q")
+
+# Agent locks in the file backend are striped so the set never grows
+_LOCK_STRIPES = 64
+
+# Bytes read per step when scanning a journal backwards for its last entries
+_TAIL_CHUNK_BYTES = 64 * 1024
+
+
+def _slugify(name: str) -> str:
+    """Convert agent name to filesystem-safe slug."""
+    slug = "".join(ch.lower() if ch.isalnum() else "-" for ch in name.strip()).strip("-")
+    while "--" in slug:
+        slug = slug.replace("--", "-")
+    return slug or "agent"
+
+
+def _encode_payload(payload: str) -> str:
+    """Encode payload for storage."""
+    normalized = payload.replace("\r\n", "\n").replace("\r", "\n")
+    collapsed = normalized.replace("\n", "\\n")
+    return escape(collapsed, quote=False)
+
+
+def _decode_payload(payload: str) -> str:
+    """Decode payload from storage."""
+    return unescape(payload).replace("\\n", "\n")
+
+
+def _format_line(tag: str, timestamp: str, payload: str) -> str:
+    """Render one journal line."""
+    return f"<{tag} timestamp=\"{timestamp}\">{_encode_payload(payload)}</{tag}>\n"
+
+
+def _parse_line(line: str) -> Optional[LogEntry]:
+    """Parse a single journal line."""
+    stripped = line.strip()
+    if not (stripped.startswith("<") and "</" in stripped):
+        return None
+
+    open_end = stripped.find(">")
+    close_start = stripped.rfind("</")
+    close_end = stripped.rfind(">")
+
+    if open_end == -1 or close_start == -1 or close_end == -1:
+        return None
+
+    open_tag_content = stripped[1:open_end]
+    if " " in open_tag_content:
+        tag, attr_string = open_tag_content.split(" ", 1)
+    else:
+        tag, attr_string = open_tag_content, ""
+
+    closing_tag = stripped[close_start + 2 : close_end]
+    if closing_tag != tag:
+        return None
+
+    attributes: Dict[str, str] = {
+        match.group(1): match.group(2) for match in _ATTR_PATTERN.finditer(attr_string)
+    }
+    timestamp = attributes.get("timestamp", "")
+    payload = _decode_payload(stripped[open_end + 1 : close_start])
+    return tag, timestamp, payload
+
+
+@dataclass
+class ExecutionSummary:
+    """Rolling summary of an agent's oldest ``summarized_requests`` requests."""
+
+    text: str = ""
+    summarized_requests: int = 0
+    updated_at: Optional[datetime] = None
+
+
+class ExecutionLogBackend(Protocol):
+    """Storage for per-agent log entries and rolling summaries.
+
+    Entries are grouped by request: request 0 also carries any entries
+    logged before the first request.
+    """
+
+    def append(self, agent_name: str, entries: Sequence[LogEntry]) -> None:
+        """Append ``entries`` in order, as one write where the backend allows."""
+
+    def read_entries(
+        self,
+        agent_name: str,
+        max_requests: Optional[int] = None,
+        start_request: int = 0,
+        stop_request: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """Entries of requests ``[start_request, stop_request)``, at most the last ``max_requests``."""
+
+    def read_recent(self, agent_name: str, limit: int) -> List[LogEntry]:
+        """The last ``limit`` entries, oldest first."""
+
+    def request_count(self, agent_name: str) -> int:
+        """Number of requests logged for the agent."""
+
+    def rebuild_index(self, agent_name: Optional[str] = None) -> Dict[str, int]:
+        """Repair request bookkeeping for one agent or all; returns request counts."""
+
+    def load_summary(self, agent_name: str) -> ExecutionSummary:
+        """The agent's rolling summary (empty when none was written)."""
+
+    def write_summary(self, agent_name: str, summary: ExecutionSummary) -> None:
+        """Replace the agent's rolling summary."""
+
+    def list_agents(self) -> List[str]:
+        """Slugs of every agent with log entries."""
+
+    def clear_all(self) -> None:
+        """Delete every agent's entries and summary."""
+
+    def import_agent(self, agent_name: str, entries: Sequence[LogEntry], summary: ExecutionSummary) -> None:
+        """Store a new agent's whole log and summary at once; raises on failure or if it has entries."""
+
+
+class FileLogBackend:
+    """One append-only XML-style journal per agent, with a request offset index."""
+
+    def __init__(self, base_dir: Path):
+        self._base_dir = base_dir
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        # Agents whose index was verified against their log since startup
+        self._indexed: set[str] = set()
+        self._ensure_directory()
+
+    def _ensure_directory(self) -> None:
+        try:
+            self._base_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:
+            logger.warning(f"Failed to create directory: {exc}")
+
+    def _lock_for(self, agent_name: str) -> threading.Lock:
+        """Get the lock stripe guarding an agent's files."""
+        return self._locks[hash(_slugify(agent_name)) % _LOCK_STRIPES]
+
+    def _log_path(self, agent_name: str) -> Path:
+        """Get log file path for an agent."""
+        return self._base_dir / f"{_slugify(agent_name)}.log"
+
+    def _index_path(self, agent_name: str) -> Path:
+        """Get request offset index path for an agent."""
+        return self._base_dir / f"{_slugify(agent_name)}.idx"
+
+    def _summary_path(self, agent_name: str) -> Path:
+        """Get rolling summary path for an agent."""
+        return self._base_dir / f"{_slugify(agent_name)}.summary"
+
+    def append(self, agent_name: str, entries: Sequence[LogEntry]) -> None:
+        """Append entries to the agent's journal in a single write."""
+        lines = [_format_line(tag, timestamp, str(payload)).encode("utf-8") for tag, timestamp, payload in entries]
+        if not lines:
+            return
+        request_offsets: List[int] = []
+        position = 0
+        for (tag, _, _), line in zip(entries, lines):
+            if tag == _REQUEST_TAG:
+                request_offsets.append(position)
+            position += len(line)
+
+        with self._lock_for(agent_name):
+            try:
+                log_path = self._log_path(agent_name)
+                if request_offsets:
+                    self._index_requests(agent_name, log_path, request_offsets)
+                with log_path.open("ab") as handle:
+                    handle.write(b"".join(lines))
+            except Exception as exc:
+                logger.error(f"Failed to append to log: {exc}")
+
+    # Record where the batch's request lines will be written (caller holds the agent lock)
+    def _index_requests(self, agent_name: str, log_path: Path, relative_offsets: List[int]) -> None:
+        if _slugify(agent_name) not in self._indexed:
+            self._request_count(agent_name)
+        base = log_path.stat().st_size if log_path.exists() else 0
+        # Written before the log lines: a crash in between leaves an offset
+        # past the end of the log, which the next check detects
+        with self._index_path(agent_name).open("ab") as handle:
+            handle.write(b"".join(_OFFSET.pack(base + offset) for offset in relative_offsets))
+
+    # Number of indexed requests, rebuilding the index first if it does not match the log
+    def _request_count(self, agent_name: str) -> int:
+        log_path = self._log_path(agent_name)
+        index_path = self._index_path(agent_name)
+        count = self._verified_count(log_path, index_path)
+        if count is None:
+            count = self._rebuild_index(log_path, index_path)
+        self._indexed.add(_slugify(agent_name))
+        return count
+
+    def _verified_count(self, log_path: Path, index_path: Path) -> Optional[int]:
+        """Return the index's request count if its last offset points at a request line."""
+        try:
+            log_size = log_path.stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+        try:
+            index_size = index_path.stat().st_size
+        except FileNotFoundError:
+            return 0 if log_size == 0 else None
+        if index_size % _OFFSET.size:
+            return None
+        count = index_size // _OFFSET.size
+        if count == 0:
+            return 0
+        last = self._offset_at(index_path, count - 1)
+        if last >= log_size:
+            return None
+        with log_path.open("rb") as handle:
+            handle.seek(last)
+            if handle.read(len(_REQUEST_PREFIX)) != _REQUEST_PREFIX:
+                return None
+        return count
+
+    def _offset_at(self, index_path: Path, position: int) -> int:
+        with index_path.open("rb") as handle:
+            handle.seek(position * _OFFSET.size)
+            return _OFFSET.unpack(handle.read(_OFFSET.size))[0]
+
+    def _rebuild_index(self, log_path: Path, index_path: Path) -> int:
+        """Scan the log for request lines and atomically replace the index."""
+        offsets: List[int] = []
+        position = 0
+        try:
+            with log_path.open("rb") as handle:
+                for line in handle:
+                    if line.lstrip().startswith(_REQUEST_PREFIX):
+                        offsets.append(position)
+                    position += len(line)
+        except FileNotFoundError:
+            pass
+        temp_path = index_path.with_suffix(".idx.tmp")
+        temp_path.write_bytes(b"".join(_OFFSET.pack(offset) for offset in offsets))
+        os.replace(temp_path, index_path)
+        logger.info(
+            "execution log index rebuilt",
+            extra={"log": log_path.name, "requests": len(offsets)},
+        )
+        return len(offsets)
+
+    def rebuild_index(self, agent_name: Optional[str] = None) -> Dict[str, int]:
+        """Rebuild the request index for one agent, or every agent; returns request counts."""
+        if agent_name is not None:
+            targets = [(agent_name, self._log_path(agent_name))]
+        else:
+            targets = [(path.stem, path) for path in sorted(self._base_dir.glob("*.log"))]
+        counts: Dict[str, int] = {}
+        for name, log_path in targets:
+            with self._lock_for(name):
+                counts[name] = self._rebuild_index(log_path, log_path.with_suffix(".idx"))
+                self._indexed.add(_slugify(name))
+        return counts
+
+    def request_count(self, agent_name: str) -> int:
+        """Number of requests in the agent's log."""
+        with self._lock_for(agent_name):
+            return self._request_count(agent_name)
+
+    def read_entries(
+        self,
+        agent_name: str,
+        max_requests: Optional[int] = None,
+        start_request: int = 0,
+        stop_request: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """Read entries of requests ``[start_request, stop_request)``, at most the last ``max_requests``."""
+        path = self._log_path(agent_name)
+        limited = max_requests is not None and max_requests > 0
+        with self._lock_for(agent_name):
+            try:
+                start, stop = 0, None
+                if limited or start_request > 0 or stop_request is not None:
+                    count = self._request_count(agent_name)
+                    first = max(start_request, count - max_requests) if limited else start_request
+                    index_path = self._index_path(agent_name)
+                    if first >= count:
+                        return []
+                    if first > 0:
+                        start = self._offset_at(index_path, first)
+                    if stop_request is not None and stop_request < count:
+                        if stop_request <= first:
+                            return []
+                        stop = self._offset_at(index_path, stop_request)
+                with path.open("rb") as handle:
+                    handle.seek(start)
+                    data = handle.read() if stop is None else handle.read(stop - start)
+            except FileNotFoundError:
+                return []
+            except Exception as exc:
+                logger.error(f"Failed to read log: {exc}")
+                return []
+        return self._parse_lines(data)
+
+    def read_recent(self, agent_name: str, limit: int) -> List[LogEntry]:
+        """Read the last ``limit`` entries, scanning back from the end of the journal."""
+        if limit <= 0:
+            return []
+        path = self._log_path(agent_name)
+        with self._lock_for(agent_name):
+            try:
+                with path.open("rb") as handle:
+                    position = handle.seek(0, os.SEEK_END)
+                    data = b""
+                    # One extra newline: the first line of a chunk may be partial
+                    while position > 0 and data.count(b"\n") <= limit:
+                        step = min(_TAIL_CHUNK_BYTES, position)
+                        position -= step
+                        handle.seek(position)
+                        data = handle.read(step) + data
+            except FileNotFoundError:
+                return []
+            except Exception as exc:
+                logger.error(f"Failed to read log: {exc}")
+                return []
+        if position > 0:
+            data = data.split(b"\n", 1)[1] if b"\n" in data else b""
+        return self._parse_lines(data)[-limit:]
+
+    def _parse_lines(self, data: bytes) -> List[LogEntry]:
+        entries: List[LogEntry] = []
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            parsed = _parse_line(line)
+            if parsed is not None:
+                entries.append(parsed)
+        return entries
+
+    def load_summary(self, agent_name: str) -> ExecutionSummary:
+        """Load the agent's rolling summary (empty when none was written)."""
+        with self._lock_for(agent_name):
+            try:
+                lines = self._summary_path(agent_name).read_text(encoding="utf-8").splitlines()
+            except FileNotFoundError:
+                return ExecutionSummary()
+            except Exception as exc:
+                logger.error(f"Failed to read execution summary: {exc}")
+                return ExecutionSummary()
+
+        summary = ExecutionSummary()
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            tag, _, payload = parsed
+            if tag == "summary_info":
+                try:
+                    data = json.loads(payload)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data.get("summarized_requests"), int):
+                    summary.summarized_requests = data["summarized_requests"]
+                if isinstance(data.get("updated_at"), str):
+                    try:
+                        summary.updated_at = datetime.fromisoformat(data["updated_at"])
+                    except ValueError:
+                        summary.updated_at = None
+            elif tag == "execution_summary":
+                summary.text = payload
+        return summary
+
+    def write_summary(self, agent_name: str, summary: ExecutionSummary) -> None:
+        """Atomically replace the agent's rolling summary."""
+        meta = json.dumps(
+            {
+                "summarized_requests": summary.summarized_requests,
+                "updated_at": summary.updated_at.isoformat() if summary.updated_at else None,
+            }
+        )
+        data = (
+            f"<summary_info>{_encode_payload(meta)}</summary_info>\n"
+            f"<execution_summary>{_encode_payload(summary.text)}</execution_summary>\n"
+        )
+        path = self._summary_path(agent_name)
+        temp_path = path.with_suffix(".summary.tmp")
+        with self._lock_for(agent_name):
+            try:
+                temp_path.write_text(data, encoding="utf-8")
+                os.replace(temp_path, path)
+            except Exception as exc:
+                logger.error(f"Failed to write execution summary: {exc}")
+                raise
+
+    def list_agents(self) -> List[str]:
+        """List all agents with logs."""
+        try:
+            return sorted(path.stem for path in self._base_dir.glob("*.log"))
+        except Exception as exc:
+            logger.error(f"Failed to list agents: {exc}")
+            return []
+
+    def clear_all(self) -> None:
+        """Clear all execution agent logs."""
+        try:
+            for pattern in ("*.log", "*.idx", "*.summary"):
+                for log_file in self._base_dir.glob(pattern):
+                    log_file.unlink()
+            self._indexed.clear()
+            logger.info("Cleared all execution agent logs")
+        except Exception as exc:
+            logger.error(f"Failed to clear execution logs: {exc}")
+
+    def import_agent(self, agent_name: str, entries: Sequence[LogEntry], summary: ExecutionSummary) -> None:
+        """Write a new agent's journal, then its summary (not atomic; development only)."""
+        log_path = self._log_path(agent_name)
+        if log_path.exists():
+            raise ValueError(f"execution log for {_slugify(agent_name)} already exists")
+        data = "".join(_format_line(tag, timestamp, str(payload)) for tag, timestamp, payload in entries)
+        with self._lock_for(agent_name):
+            log_path.write_text(data, encoding="utf-8")
+            self._rebuild_index(log_path, self._index_path(agent_name))
+            self._indexed.add(_slugify(agent_name))
+        if summary.text or summary.summarized_requests:
+            self.write_summary(agent_name, summary)
+
+
+class SQLiteLogBackend:
+    """Execution log entries and summaries in SQLite, range-queried by request."""
+
+    def __init__(self, db_path: Path):
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._ensure_directory()
+        self._ensure_schema()
+
+    def _ensure_directory(self) -> None:
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("execution log directory creation failed", extra={"error": str(exc)})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        entries_sql = """
+        CREATE TABLE IF NOT EXISTS execution_log_entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            agent TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            request INTEGER NOT NULL,
+            tag TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            payload TEXT NOT NULL
+        );
+        """
+        agents_sql = """
+        CREATE TABLE IF NOT EXISTS execution_log_agents (
+            agent TEXT PRIMARY KEY,
+            requests INTEGER NOT NULL DEFAULT 0,
+            next_seq INTEGER NOT NULL DEFAULT 0,
+            summary TEXT NOT NULL DEFAULT '',
+            summarized_requests INTEGER NOT NULL DEFAULT 0,
+            summary_updated_at TEXT
+        );
+        """
+        seq_index_sql = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_execution_log_entries_seq
+        ON execution_log_entries (agent, seq);
+        """
+        request_index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_execution_log_entries_request
+        ON execution_log_entries (agent, request, seq);
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(entries_sql)
+            conn.execute(agents_sql)
+            conn.execute(seq_index_sql)
+            conn.execute(request_index_sql)
+
+    def append(self, agent_name: str, entries: Sequence[LogEntry]) -> None:
+        """Insert entries in one transaction, numbering them after the agent's last entry."""
+        if not entries:
+            return
+        slug = _slugify(agent_name)
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT requests, next_seq FROM execution_log_agents WHERE agent = ?",
+                    (slug,),
+                ).fetchone()
+                requests, seq = (row["requests"], row["next_seq"]) if row else (0, 0)
+                requests, seq = self._insert_entries(conn, slug, entries, requests, seq)
+                conn.execute(
+                    "INSERT INTO execution_log_agents (agent, requests, next_seq) VALUES (?, ?, ?)"
+                    " ON CONFLICT(agent) DO UPDATE SET requests = excluded.requests, next_seq = excluded.next_seq",
+                    (slug, requests, seq),
+                )
+        except sqlite3.Error as exc:
+            logger.error("execution log write failed", extra={"agent": slug, "error": str(exc)})
+
+    def _insert_entries(
+        self,
+        conn: sqlite3.Connection,
+        slug: str,
+        entries: Sequence[LogEntry],
+        requests: int,
+        seq: int,
+    ) -> Tuple[int, int]:
+        """Insert entries after ``seq``; returns the agent's new request count and next seq."""
+        rows = []
+        for tag, timestamp, payload in entries:
+            if tag == _REQUEST_TAG:
+                request = requests
+                requests += 1
+            else:
+                request = max(requests - 1, 0)
+            rows.append((slug, seq, request, tag, timestamp, str(payload)))
+            seq += 1
+        conn.executemany(
+            "INSERT INTO execution_log_entries (agent, seq, request, tag, timestamp, payload)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return requests, seq
+
+    def import_agent(self, agent_name: str, entries: Sequence[LogEntry], summary: ExecutionSummary) -> None:
+        """Insert a new agent's entries and summary in one transaction; raises on failure."""
+        slug = _slugify(agent_name)
+        updated_at = summary.updated_at.isoformat() if summary.updated_at else None
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT next_seq FROM execution_log_agents WHERE agent = ?",
+                (slug,),
+            ).fetchone()
+            if row is not None and row["next_seq"] > 0:
+                raise ValueError(f"execution log for {slug} already exists")
+            requests, seq = self._insert_entries(conn, slug, entries, 0, 0)
+            conn.execute(
+                "INSERT INTO execution_log_agents"
+                " (agent, requests, next_seq, summary, summarized_requests, summary_updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(agent) DO UPDATE SET requests = excluded.requests,"
+                " next_seq = excluded.next_seq, summary = excluded.summary,"
+                " summarized_requests = excluded.summarized_requests,"
+                " summary_updated_at = excluded.summary_updated_at",
+                (slug, requests, seq, summary.text, summary.summarized_requests, updated_at),
+            )
+
+    def read_entries(
+        self,
+        agent_name: str,
+        max_requests: Optional[int] = None,
+        start_request: int = 0,
+        stop_request: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """Read entries of requests ``[start_request, stop_request)``, at most the last ``max_requests``."""
+        slug = _slugify(agent_name)
+        try:
+            with self._lock, self._connect() as conn:
+                first = start_request
+                if max_requests is not None and max_requests > 0:
+                    count = self._count(conn, slug)
+                    first = max(start_request, count - max_requests)
+                    if first >= count:
+                        return []
+                sql = "SELECT tag, timestamp, payload FROM execution_log_entries WHERE agent = ? AND request >= ?"
+                params: List[object] = [slug, first]
+                if stop_request is not None:
+                    sql += " AND request < ?"
+                    params.append(stop_request)
+                rows = conn.execute(sql + " ORDER BY request, seq", params).fetchall()
+        except sqlite3.Error as exc:
+            logger.error("execution log read failed", extra={"agent": slug, "error": str(exc)})
+            return []
+        return [(row["tag"], row["timestamp"], row["payload"]) for row in rows]
+
+    def read_recent(self, agent_name: str, limit: int) -> List[LogEntry]:
+        """Read the last ``limit`` entries."""
+        if limit <= 0:
+            return []
+        slug = _slugify(agent_name)
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT tag, timestamp, payload FROM execution_log_entries"
+                    " WHERE agent = ? ORDER BY seq DESC LIMIT ?",
+                    (slug, limit),
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.error("execution log read failed", extra={"agent": slug, "error": str(exc)})
+            return []
+        return [(row["tag"], row["timestamp"], row["payload"]) for row in reversed(rows)]
+
+    def _count(self, conn: sqlite3.Connection, slug: str) -> int:
+        row = conn.execute("SELECT requests FROM execution_log_agents WHERE agent = ?", (slug,)).fetchone()
+        return row["requests"] if row else 0
+
+    def request_count(self, agent_name: str) -> int:
+        """Number of requests logged for the agent."""
+        slug = _slugify(agent_name)
+        try:
+            with self._lock, self._connect() as conn:
+                return self._count(conn, slug)
+        except sqlite3.Error as exc:
+            logger.error("execution log read failed", extra={"agent": slug, "error": str(exc)})
+            return 0
+
+    def rebuild_index(self, agent_name: Optional[str] = None) -> Dict[str, int]:
+        """Recount requests from the stored entries; returns request counts."""
+        sql = (
+            "SELECT agent, SUM(tag = ?) AS requests, MAX(seq) + 1 AS next_seq"
+            " FROM execution_log_entries"
+        )
+        params: List[object] = [_REQUEST_TAG]
+        if agent_name is not None:
+            sql += " WHERE agent = ?"
+            params.append(_slugify(agent_name))
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(sql + " GROUP BY agent", params).fetchall()
+            conn.executemany(
+                "INSERT INTO execution_log_agents (agent, requests, next_seq) VALUES (?, ?, ?)"
+                " ON CONFLICT(agent) DO UPDATE SET requests = excluded.requests, next_seq = excluded.next_seq",
+                [(row["agent"], row["requests"], row["next_seq"]) for row in rows],
+            )
+        return {row["agent"]: row["requests"] for row in rows}
+
+    def load_summary(self, agent_name: str) -> ExecutionSummary:
+        """Load the agent's rolling summary (empty when none was written)."""
+        slug = _slugify(agent_name)
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT summary, summarized_requests, summary_updated_at"
+                    " FROM execution_log_agents WHERE agent = ?",
+                    (slug,),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.error("execution summary read failed", extra={"agent": slug, "error": str(exc)})
+            return ExecutionSummary()
+        if row is None:
+            return ExecutionSummary()
+        updated_at = None
+        if row["summary_updated_at"]:
+            try:
+                updated_at = datetime.fromisoformat(row["summary_updated_at"])
+            except ValueError:
+                updated_at = None
+        return ExecutionSummary(
+            text=row["summary"],
+            summarized_requests=row["summarized_requests"],
+            updated_at=updated_at,
+        )
+
+    def write_summary(self, agent_name: str, summary: ExecutionSummary) -> None:
+        """Replace the agent's rolling summary."""
+        slug = _slugify(agent_name)
+        updated_at = summary.updated_at.isoformat() if summary.updated_at else None
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO execution_log_agents (agent, summary, summarized_requests, summary_updated_at)"
+                    " VALUES (?, ?, ?, ?) ON CONFLICT(agent) DO UPDATE SET summary = excluded.summary,"
+                    " summarized_requests = excluded.summarized_requests,"
+                    " summary_updated_at = excluded.summary_updated_at",
+                    (slug, summary.text, summary.summarized_requests, updated_at),
+                )
+        except sqlite3.Error as exc:
+            logger.error("execution summary write failed", extra={"agent": slug, "error": str(exc)})
+            raise
+
+    def list_agents(self) -> List[str]:
+        """List all agents with log entries."""
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT agent FROM execution_log_agents WHERE next_seq > 0 ORDER BY agent"
+                ).fetchall()
+        except sqlite3.Error as exc:
+            logger.error("execution log agent listing failed", extra={"error": str(exc)})
+            return []
+        return [row["agent"] for row in rows]
+
+    def clear_all(self) -> None:
+        """Delete every agent's entries and summary."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM execution_log_entries")
+                conn.execute("DELETE FROM execution_log_agents")
+            logger.info("Cleared all execution agent logs")
+        except sqlite3.Error as exc:
+            logger.error("execution log clear failed", extra={"error": str(exc)})
+
+
+__all__ = [
+    "ExecutionLogBackend",
+    "ExecutionSummary",
+    "FileLogBackend",
+    "LogEntry",
+    "SQLiteLogBackend",
+]
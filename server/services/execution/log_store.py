@@ -1,117 +1,86 @@
-"""Execution agent log management with structured XML-style tags."""
+"""Execution agent log management with structured XML-style tags.
+
+:class:`ExecutionAgentLogStore` records what each execution agent was asked,
+did and answered, and renders it back into prompt transcripts. Storage is
+pluggable (see :mod:`.log_backends`): SQLite by default, or one journal
+file per agent with ``EXECUTION_LOG_BACKEND=file`` for development.
+
+Older requests can be folded into a rolling summary (see
+:mod:`.summarization`); the prompt history is then that summary plus the
+requests after it.
+"""
 
 from __future__ import annotations
 
-import re
+import asyncio
 import threading
-from html import escape, unescape
+from html import escape
 from pathlib import Path
-from typing import Dict, Iterator, List, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+from ...config import get_settings
 from ...logging_config import logger
 from ...utils.timezones import now_in_user_timezone
+from .log_backends import (
+    ExecutionLogBackend,
+    ExecutionSummary,
+    FileLogBackend,
+    LogEntry,
+    SQLiteLogBackend,
+)
 
 
 _DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
 _EXECUTION_LOG_DIR = _DATA_DIR / "execution_agents"
-
-
-def _slugify(name: str) -> str:
-    """Convert agent name to filesystem-safe slug."""
-    slug = "".join(ch.lower() if ch.isalnum() else "-" for ch in name.strip()).strip("-")
-    while "--" in slug:
-        slug = slug.replace("--", "-")
-    return slug or "agent"
-
-
-def _encode_payload(payload: str) -> str:
-    """Encode payload for storage."""
-    normalized = payload.replace("\r\n", "\n").replace("\r", "\n")
-    collapsed = normalized.replace("\n", "\\n")
-    return escape(collapsed, quote=False)
-
-
-def _decode_payload(payload: str) -> str:
-    """Decode payload from storage."""
-    return unescape(payload).replace("\\n", "\n")
-
-
-_ATTR_PATTERN = re.compile(r"(\w+)\s*=\s*\"([^\"]*)\"")
+_EXECUTION_LOG_DB_PATH = _DATA_DIR / "execution_logs.db"
+# Written into the journal directory once its logs were imported into SQLite
+_IMPORTED_MARKER = ".imported-to-sqlite"
 
 
 class ExecutionAgentLogStore:
     """Append-only journal for execution agents with XML-style tags."""
 
-    def __init__(self, base_dir: Path):
-        self._base_dir = base_dir
-        self._locks: dict[str, threading.Lock] = {}
-        self._global_lock = threading.Lock()
-        self._ensure_directory()
+    def __init__(self, backend: ExecutionLogBackend):
+        self._backend = backend
 
-    def _ensure_directory(self) -> None:
-        try:
-            self._base_dir.mkdir(parents=True, exist_ok=True)
-        except Exception as exc:
-            logger.warning(f"Failed to create directory: {exc}")
-
-    def _lock_for(self, agent_name: str) -> threading.Lock:
-        """Get or create a lock for an agent."""
-        slug = _slugify(agent_name)
-        with self._global_lock:
-            if slug not in self._locks:
-                self._locks[slug] = threading.Lock()
-            return self._locks[slug]
-
-    def _log_path(self, agent_name: str) -> Path:
-        """Get log file path for an agent."""
-        return self._base_dir / f"{_slugify(agent_name)}.log"
+    @property
+    def backend(self) -> ExecutionLogBackend:
+        return self._backend
 
     def _append(self, agent_name: str, tag: str, payload: str) -> None:
         """Append an entry with the given tag."""
-        encoded = _encode_payload(str(payload))
+        self.record_entries(agent_name, [(tag, payload)])
+
+    def record_entries(self, agent_name: str, entries: Sequence[Tuple[str, str]]) -> None:
+        """Append ``(tag, payload)`` entries together, stamped with the current time."""
         timestamp = now_in_user_timezone("%Y-%m-%d %H:%M:%S")
-        entry = f"<{tag} timestamp=\"{timestamp}\">{encoded}</{tag}>\n"
-
-        with self._lock_for(agent_name):
-            try:
-                with self._log_path(agent_name).open("a", encoding="utf-8") as handle:
-                    handle.write(entry)
-            except Exception as exc:
-                logger.error(f"Failed to append to log: {exc}")
-
-    def _parse_line(self, line: str) -> Optional[Tuple[str, str, str]]:
-        """Parse a single log line."""
-        stripped = line.strip()
-        if not (stripped.startswith("<") and "</" in stripped):
-            return None
-
-        open_end = stripped.find(">")
-        close_start = stripped.rfind("</")
-        close_end = stripped.rfind(">")
-
-        if open_end == -1 or close_start == -1 or close_end == -1:
-            return None
-
-        open_tag_content = stripped[1:open_end]
-        if " " in open_tag_content:
-            tag, attr_string = open_tag_content.split(" ", 1)
-        else:
-            tag, attr_string = open_tag_content, ""
-
-        closing_tag = stripped[close_start + 2 : close_end]
-        if closing_tag != tag:
-            return None
-
-        attributes: Dict[str, str] = {
-            match.group(1): match.group(2) for match in _ATTR_PATTERN.finditer(attr_string)
-        }
-        timestamp = attributes.get("timestamp", "")
-        payload = _decode_payload(stripped[open_end + 1 : close_start])
-        return tag, timestamp, payload
+        self._backend.append(agent_name, [(tag, timestamp, str(payload)) for tag, payload in entries])
 
     def record_request(self, agent_name: str, instructions: str) -> None:
         """Record an incoming request from the interaction agent."""
         self._append(agent_name, "agent_request", instructions)
+        self._notify_summarization(agent_name)
+
+    def _notify_summarization(self, agent_name: str) -> None:
+        if get_settings().execution_summary_threshold <= 0:
+            return
+
+        try:
+            from .summarization import schedule_execution_summarization
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug(
+                "execution summarization scheduler unavailable",
+                extra={"error": str(exc)},
+            )
+            return
+
+        try:
+            schedule_execution_summarization(agent_name)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning(
+                "failed to schedule execution summarization",
+                extra={"error": str(exc), "agent": agent_name},
+            )
 
     def record_action(self, agent_name: str, description: str) -> None:
         """Record an agent action (tool call)."""
@@ -121,31 +90,59 @@ class ExecutionAgentLogStore:
         """Record the response from a tool."""
         self._append(agent_name, "tool_response", f"{tool_name}: {response}")
 
+    def record_tool_execution(self, agent_name: str, tool_name: str, description: str, response: str) -> None:
+        """Record a tool call and its response in one write."""
+        self.record_entries(
+            agent_name,
+            [("agent_action", description), ("tool_response", f"{tool_name}: {response}")],
+        )
+
     def record_agent_response(self, agent_name: str, response: str) -> None:
         """Record the agent's final response."""
         self._append(agent_name, "agent_response", response)
 
-    def iter_entries(self, agent_name: str) -> Iterator[Tuple[str, str, str]]:
-        """Iterate over all log entries for an agent."""
-        path = self._log_path(agent_name)
-        with self._lock_for(agent_name):
-            try:
-                lines = path.read_text(encoding="utf-8").splitlines()
-            except FileNotFoundError:
-                lines = []
-            except Exception as exc:
-                logger.error(f"Failed to read log: {exc}")
-                lines = []
-
-        for line in lines:
-            parsed = self._parse_line(line)
-            if parsed is not None:
-                yield parsed
-
-    def load_transcript(self, agent_name: str) -> str:
-        """Load the full transcript for inclusion in system prompt."""
+    def request_count(self, agent_name: str) -> int:
+        """Number of requests in the agent's log."""
+        return self._backend.request_count(agent_name)
+
+    def rebuild_index(self, agent_name: Optional[str] = None) -> Dict[str, int]:
+        """Repair the request bookkeeping for one agent, or every agent; returns request counts."""
+        return self._backend.rebuild_index(agent_name)
+
+    def load_summary(self, agent_name: str) -> ExecutionSummary:
+        """Load the agent's rolling summary (empty when none was written)."""
+        return self._backend.load_summary(agent_name)
+
+    def write_summary(self, agent_name: str, summary: ExecutionSummary) -> None:
+        """Replace the agent's rolling summary."""
+        self._backend.write_summary(agent_name, summary)
+
+    def iter_entries(
+        self,
+        agent_name: str,
+        max_requests: Optional[int] = None,
+        *,
+        start_request: int = 0,
+        stop_request: Optional[int] = None,
+    ) -> Iterator[LogEntry]:
+        """Iterate over an agent's log entries, optionally a request range or the last ``max_requests``.
+
+        Request 0 also carries any entries logged before the first request.
+        """
+        yield from self._backend.read_entries(agent_name, max_requests, start_request, stop_request)
+
+    def load_transcript(
+        self,
+        agent_name: str,
+        max_requests: Optional[int] = None,
+        *,
+        start_request: int = 0,
+    ) -> str:
+        """Render entries from ``start_request`` on (at most the last ``max_requests``) for the prompt."""
         parts: List[str] = []
-        for tag, timestamp, payload in self.iter_entries(agent_name):
+        for tag, timestamp, payload in self.iter_entries(
+            agent_name, max_requests, start_request=start_request
+        ):
             escaped = escape(payload, quote=False)
             if timestamp:
                 parts.append(f"<{tag} timestamp=\"{timestamp}\">{escaped}</{tag}>")
@@ -153,32 +150,98 @@ class ExecutionAgentLogStore:
                 parts.append(f"<{tag}>{escaped}</{tag}>")
         return "\n".join(parts)
 
+    def load_history(self, agent_name: str, max_requests: Optional[int] = None) -> str:
+        """Render the rolling summary (if any) followed by the requests it does not cover.
+
+        ``max_requests`` only applies once the summary covers some requests;
+        until then the whole log is rendered.
+        """
+        summary = self.load_summary(agent_name)
+        transcript = self.load_transcript(
+            agent_name,
+            max_requests if summary.summarized_requests > 0 else None,
+            start_request=summary.summarized_requests,
+        )
+        if not summary.text.strip():
+            return transcript
+        rendered = f"<execution_summary>{escape(summary.text.strip(), quote=False)}</execution_summary>"
+        return f"{rendered}\n{transcript}" if transcript else rendered
+
     def load_recent(self, agent_name: str, limit: int = 10) -> list[tuple[str, str, str]]:
         """Load recent log entries."""
-        entries = list(self.iter_entries(agent_name))
-        return entries[-limit:] if entries else []
+        return self._backend.read_recent(agent_name, limit)
+
+    def recent_tool_names(self, agent_name: str, limit: int = 50) -> list[str]:
+        """Return names of tools the agent called, newest last, from its last ``limit`` requests."""
+        names: list[str] = []
+        for tag, _, payload in self.iter_entries(agent_name, max_requests=limit):
+            if tag == "tool_response":
+                name, sep, _ = payload.partition(":")
+                if sep and name:
+                    names.append(name.strip())
+        return names[-limit:]
 
     def list_agents(self) -> list[str]:
         """List all agents with logs."""
-        try:
-            return sorted(path.stem for path in self._base_dir.glob("*.log"))
-        except Exception as exc:
-            logger.error(f"Failed to list agents: {exc}")
-            return []
+        return self._backend.list_agents()
 
     def clear_all(self) -> None:
         """Clear all execution agent logs."""
-        try:
-            for log_file in self._base_dir.glob("*.log"):
-                log_file.unlink()
-            logger.info("Cleared all execution agent logs")
-        except Exception as exc:
-            logger.error(f"Failed to clear execution logs: {exc}")
+        self._backend.clear_all()
+
+
+def _build_backend() -> ExecutionLogBackend:
+    backend_name = get_settings().execution_log_backend.strip().lower()
+    if backend_name == "file":
+        return FileLogBackend(_EXECUTION_LOG_DIR)
+    if backend_name != "sqlite":
+        logger.warning(
+            "unknown execution log backend; using sqlite",
+            extra={"backend": backend_name},
+        )
+    return SQLiteLogBackend(_EXECUTION_LOG_DB_PATH)
 
 
-_execution_agent_logs = ExecutionAgentLogStore(_EXECUTION_LOG_DIR)
+_execution_agent_logs: Optional[ExecutionAgentLogStore] = None
+_factory_lock = threading.Lock()
 
 
 def get_execution_agent_logs() -> ExecutionAgentLogStore:
     """Get the singleton log store instance."""
+    global _execution_agent_logs
+    if _execution_agent_logs is None:
+        with _factory_lock:
+            if _execution_agent_logs is None:
+                _execution_agent_logs = ExecutionAgentLogStore(_build_backend())
     return _execution_agent_logs
+
+
+def _import_legacy_logs(backend: ExecutionLogBackend) -> None:
+    from .migrate_logs import migrate_file_logs
+
+    migrate_file_logs(FileLogBackend(_EXECUTION_LOG_DIR), backend)
+    (_EXECUTION_LOG_DIR / _IMPORTED_MARKER).touch()
+
+
+async def import_legacy_execution_logs() -> None:
+    """Import file-backend journals into SQLite once, off the event loop (run at startup)."""
+    backend = get_execution_agent_logs().backend
+    if not isinstance(backend, SQLiteLogBackend):
+        return
+    if (_EXECUTION_LOG_DIR / _IMPORTED_MARKER).exists() or not any(_EXECUTION_LOG_DIR.glob("*.log")):
+        return
+    try:
+        await asyncio.to_thread(_import_legacy_logs, backend)
+    except Exception as exc:
+        logger.error(
+            "execution log import failed; rerun python -m server.services.execution.migrate_logs",
+            extra={"error": str(exc)},
+        )
+
+
+__all__ = [
+    "ExecutionAgentLogStore",
+    "ExecutionSummary",
+    "get_execution_agent_logs",
+    "import_legacy_execution_logs",
+]
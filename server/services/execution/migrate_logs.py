@@ -0,0 +1,68 @@
+"""Copy execution agent journals from the file backend into SQLite.
+
+Each agent's entries and summary are written by one
+:meth:`~.log_backends.ExecutionLogBackend.import_agent` call (one transaction
+in SQLite), so an agent is either fully imported or absent, and an
+interrupted or failed run can simply be repeated: agents already present in
+the database are skipped. The journals are left in place. The server runs
+this once at startup when it finds journals that were never imported; run it
+by hand to retry after a failure::
+
+    python -m server.services.execution.migrate_logs
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Dict
+
+from ...logging_config import logger
+from .log_backends import ExecutionLogBackend, FileLogBackend, SQLiteLogBackend
+
+
+def migrate_file_logs(source: FileLogBackend, target: ExecutionLogBackend) -> Dict[str, int]:
+    """Import every journal in ``source`` missing from ``target``; returns requests imported per agent.
+
+    Raises on the first agent that cannot be written; agents imported before
+    it stay imported.
+    """
+    existing = set(target.list_agents())
+    imported: Dict[str, int] = {}
+    for agent in source.list_agents():
+        if agent in existing:
+            logger.info("execution log migration skipped agent", extra={"agent": agent})
+            continue
+        entries = source.read_entries(agent)
+        if not entries:
+            continue
+        target.import_agent(agent, entries, source.load_summary(agent))
+        imported[agent] = target.request_count(agent)
+        logger.info(
+            "execution log migrated",
+            extra={"agent": agent, "entries": len(entries), "requests": imported[agent]},
+        )
+    return imported
+
+
+def main() -> None:
+    from .log_store import _EXECUTION_LOG_DB_PATH, _EXECUTION_LOG_DIR
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, default=_EXECUTION_LOG_DIR, help="Directory of .log journals")
+    parser.add_argument("--database", type=Path, default=_EXECUTION_LOG_DB_PATH, help="SQLite database to fill")
+    args = parser.parse_args()
+
+    if not args.source.is_dir():
+        parser.error(f"no journal directory at {args.source}")
+    source = FileLogBackend(args.source)
+    target = SQLiteLogBackend(args.database)
+    imported = migrate_file_logs(source, target)
+    skipped = len(source.list_agents()) - len(imported)
+    for agent, requests in imported.items():
+        print(f"{agent}: {requests} requests")
+    print(f"Imported {len(imported)} agents into {args.database} ({skipped} already present)")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI invocation guard
+    main()
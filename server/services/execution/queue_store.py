@@ -0,0 +1,281 @@
+"""Durable execution-agent job queue persisted to SQLite.
+
+Each execution request is a row that moves ``queued`` -> ``running`` (under a
+renewable lease) -> ``completed`` -> ``delivered``. A crash or deploy leaves
+rows behind instead of losing them: expired leases go back to ``queued``,
+completed-but-undelivered results are re-sent, and idempotency keys stop a
+retried submission from running twice. Delivery is at-least-once.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from ...config import get_settings
+from ...logging_config import logger
+
+
+_DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+_DEFAULT_DB_PATH = _DATA_DIR / "execution_queue.db"
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+DELIVERED = "delivered"
+
+
+@dataclass
+class ExecutionJob:
+    """One persisted execution request and, once finished, its result."""
+
+    request_id: str
+    idempotency_key: str
+    agent_name: str
+    instructions: str
+    batch_id: str
+    priority: int
+    status: str
+    attempts: int
+    lease_owner: Optional[str]
+    lease_expires_at: Optional[float]
+    success: Optional[bool]
+    response: Optional[str]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, DELIVERED)
+
+
+class ExecutionQueueStore:
+    """SQLite-backed execution queue with leases and idempotency keys."""
+
+    def __init__(self, db_path: Path, retention_days: int = 7) -> None:
+        self._db_path = db_path
+        self._retention_seconds = max(retention_days, 1) * 86400
+        self._lock = threading.Lock()
+        self._ensure_directory()
+        self._ensure_schema()
+
+    def _ensure_directory(self) -> None:
+        try:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("execution queue directory creation failed", extra={"error": str(exc)})
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self) -> None:
+        schema_sql = """
+        CREATE TABLE IF NOT EXISTS execution_jobs (
+            request_id TEXT PRIMARY KEY,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            agent_name TEXT NOT NULL,
+            instructions TEXT NOT NULL,
+            batch_id TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            success INTEGER,
+            response TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        """
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_execution_jobs_status
+        ON execution_jobs (status, lease_expires_at);
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(schema_sql)
+            conn.execute(index_sql)
+
+    def enqueue(
+        self,
+        *,
+        agent_name: str,
+        instructions: str,
+        batch_id: str,
+        priority: int,
+        request_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[ExecutionJob, bool]:
+        """Insert a queued job; returns ``(job, created)``.
+
+        When ``idempotency_key`` already exists the stored job is returned
+        unchanged with ``created`` False.
+        """
+        request_id = request_id or str(uuid.uuid4())
+        now = time.time()
+        payload = {
+            "request_id": request_id,
+            "idempotency_key": idempotency_key or request_id,
+            "agent_name": agent_name,
+            "instructions": instructions,
+            "batch_id": batch_id,
+            "priority": int(priority),
+            "status": QUEUED,
+            "created_at": now,
+            "updated_at": now,
+        }
+        columns = ", ".join(payload.keys())
+        placeholders = ", ".join(":" + key for key in payload.keys())
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO execution_jobs ({columns}) VALUES ({placeholders})",
+                payload,
+            )
+            row = conn.execute(
+                "SELECT * FROM execution_jobs WHERE idempotency_key = ?",
+                (payload["idempotency_key"],),
+            ).fetchone()
+        return self._row_to_job(row), cursor.rowcount > 0
+
+    def fetch(self, request_id: str) -> Optional[ExecutionJob]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM execution_jobs WHERE request_id = ?", (request_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, request_id: str, owner: str, lease_seconds: float) -> bool:
+        """Move a queued job to running under ``owner``'s lease; False if it was not queued."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE execution_jobs SET status = ?, attempts = attempts + 1, lease_owner = ?,"
+                " lease_expires_at = ?, updated_at = ? WHERE request_id = ? AND status = ?",
+                (RUNNING, owner, now + lease_seconds, now, request_id, QUEUED),
+            )
+            return cursor.rowcount > 0
+
+    def heartbeat(self, owner: str, request_ids: Iterable[str], lease_seconds: float) -> int:
+        """Extend the leases ``owner`` holds on ``request_ids``; returns how many were renewed."""
+        ids = list(request_ids)
+        if not ids:
+            return 0
+        now = time.time()
+        placeholders = ", ".join("?" for _ in ids)
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE execution_jobs SET lease_expires_at = ?, updated_at = ?"
+                f" WHERE lease_owner = ? AND status = ? AND request_id IN ({placeholders})",
+                (now + lease_seconds, now, owner, RUNNING, *ids),
+            )
+            return cursor.rowcount
+
+    def complete(
+        self,
+        request_id: str,
+        owner: str,
+        success: bool,
+        response: str,
+        error: Optional[str],
+    ) -> None:
+        """Store the result of a job that never started or whose lease ``owner`` holds."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE execution_jobs SET status = ?, success = ?, response = ?, error = ?,"
+                " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE request_id = ? AND (status = ? OR (status = ? AND lease_owner = ?))",
+                (COMPLETED, int(success), response, error, now, request_id, QUEUED, RUNNING, owner),
+            )
+
+    def mark_delivered(self, request_ids: Iterable[str]) -> None:
+        ids = list(request_ids)
+        if not ids:
+            return
+        placeholders = ", ".join("?" for _ in ids)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE execution_jobs SET status = ?, updated_at = ?"
+                f" WHERE status = ? AND request_id IN ({placeholders})",
+                (DELIVERED, time.time(), COMPLETED, *ids),
+            )
+
+    def release_expired(self, max_attempts: int) -> Tuple[int, int]:
+        """Requeue running jobs whose lease lapsed; fail those out of attempts.
+
+        Returns ``(requeued, abandoned)``.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            abandoned = conn.execute(
+                "UPDATE execution_jobs SET status = ?, success = 0, error = 'Interrupted',"
+                " response = 'Execution was interrupted ' || attempts || ' times and was not retried again',"
+                " lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (COMPLETED, now, RUNNING, now, max_attempts),
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE execution_jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL,"
+                " updated_at = ? WHERE status = ? AND lease_expires_at < ?",
+                (QUEUED, now, RUNNING, now),
+            ).rowcount
+        if requeued or abandoned:
+            logger.warning(
+                "execution leases expired",
+                extra={"requeued": requeued, "abandoned": abandoned},
+            )
+        return requeued, abandoned
+
+    def list_by_status(self, status: str) -> List[ExecutionJob]:
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM execution_jobs WHERE status = ? ORDER BY priority, created_at",
+                (status,),
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def prune(self) -> int:
+        """Drop delivered jobs, and queued ones nobody adopted, past retention."""
+        cutoff = time.time() - self._retention_seconds
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM execution_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DELIVERED, QUEUED, cutoff),
+            ).rowcount
+
+    def clear_all(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM execution_jobs")
+
+    def _row_to_job(self, row: sqlite3.Row) -> ExecutionJob:
+        data = dict(row)
+        if data["success"] is not None:
+            data["success"] = bool(data["success"])
+        return ExecutionJob(**data)
+
+
+_execution_queue: Optional[ExecutionQueueStore] = None
+_factory_lock = threading.Lock()
+
+
+def get_execution_queue() -> ExecutionQueueStore:
+    """Return the process-wide execution queue store, creating it on first use."""
+    global _execution_queue
+    if _execution_queue is None:
+        with _factory_lock:
+            if _execution_queue is None:
+                settings = get_settings()
+                _execution_queue = ExecutionQueueStore(
+                    _DEFAULT_DB_PATH, retention_days=settings.execution_queue_retention_days
+                )
+    return _execution_queue
+
+
+__all__ = ["ExecutionJob", "ExecutionQueueStore", "get_execution_queue"]
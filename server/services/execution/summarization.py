@@ -0,0 +1,232 @@
+"""Rolling summarization of per-agent execution logs.
+
+Mirrors the conversation working memory: each agent keeps a persisted
+summary of its oldest requests plus an unsummarized tail. Once an agent has
+``execution_summary_threshold`` unsummarized requests beyond the
+``execution_summary_tail_requests`` kept verbatim, the oldest batch is merged
+into the summary in the background at summarizer priority. Agent prompts
+then carry the summary and the tail (see ``ExecutionAgentLogStore.load_history``).
+
+Log entries are clipped and the batch is halved until the prompt fits the
+summarizer's budget, so one oversized batch cannot stall the summary. An
+agent whose pass fails anyway is retried with exponential backoff rather
+than on every new request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from textwrap import dedent
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...config import get_settings
+from ...llm import LLMError, Priority, request_chat_completion
+from ...llm.budget import message_budget
+from ...llm.tokens import estimate_message_tokens
+from ...logging_config import logger
+from .log_store import ExecutionSummary, get_execution_agent_logs
+
+_SYSTEM_PROMPT = dedent(
+    """
+    You maintain the long-term memory of an execution agent: a worker that carries out tasks
+    (email, reminders, device support) on behalf of one assistant. Rewrite its memory so it can
+    continue its work without rereading old logs. Use exactly this structure:
+
+    Standing instructions:
+    - <Ongoing goals, schedules, recipients, formats, or constraints the agent was given.>
+
+    Completed work:
+    - <YYYY-MM-DD HH:MM> — <what was done and the outcome>. Keep identifiers verbatim
+      (message/thread/draft ids, trigger ids, order numbers, email addresses).
+
+    Open items:
+    - <Anything requested but not finished, awaiting a reply, or failed and worth retrying.>
+
+    Facts learned:
+    - <Contacts, preferences, account details, and tool quirks or recurring errors.>
+
+    If a section has no content, output a single bullet "- No items."
+
+    RULES:
+    1. Rebuild the whole memory each time, merging the new log entries into the existing memory.
+    2. Drop items that are finished and no longer relevant; never invent facts.
+    3. Use absolute timestamps from the logs, earliest first within each section.
+    4. Be concise but keep every detail needed to act again (ids, addresses, exact wording asked for).
+    """
+).strip()
+
+
+# Per-entry character limits tried in turn when a batch does not fit the budget
+_ENTRY_CHAR_LIMITS = (2000, 500, 120)
+
+# Failed passes are retried after this long, doubling per consecutive failure up to the cap
+_RETRY_BASE_SECONDS = 60.0
+_RETRY_MAX_SECONDS = 3600.0
+
+
+def _clip(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}… [{len(text) - limit} characters trimmed]"
+
+
+def _format_entries(entries: List[Tuple[str, str, str]], entry_chars: int = _ENTRY_CHAR_LIMITS[0]) -> str:
+    lines: List[str] = []
+    for tag, timestamp, payload in entries:
+        label = tag.replace("_", " ")
+        stamp = f"{timestamp} " if timestamp else ""
+        lines.append(f"{stamp}{label}: {_clip(payload.strip(), entry_chars) or '(empty)'}")
+    return "\n".join(lines) if lines else "(no new logs)"
+
+
+def _build_prompt(
+    agent_name: str,
+    previous_summary: str,
+    entries: List[Tuple[str, str, str]],
+    entry_chars: int = _ENTRY_CHAR_LIMITS[0],
+) -> List[Dict[str, str]]:
+    content = (
+        f"Agent: {agent_name}\n\n"
+        f"Existing memory:\n{previous_summary.strip() or 'None'}\n\n"
+        f"New log entries to merge:\n{_format_entries(entries, entry_chars)}"
+    )
+    return [{"role": "user", "content": content}]
+
+
+def _fit_batch(
+    agent_name: str,
+    summary: ExecutionSummary,
+    batch_requests: int,
+    budget: int,
+) -> Tuple[int, List[Tuple[str, str, str]], List[Dict[str, str]]]:
+    """Pick the largest batch (then the loosest clipping) whose prompt fits ``budget``.
+
+    Returns the batch's end request, its entries and the prompt; the
+    smallest, tightest prompt is returned if nothing fits.
+    """
+    log_store = get_execution_agent_logs()
+    start = summary.summarized_requests
+    while True:
+        cutoff = start + batch_requests
+        entries = list(log_store.iter_entries(agent_name, start_request=start, stop_request=cutoff))
+        limits = _ENTRY_CHAR_LIMITS if batch_requests == 1 else _ENTRY_CHAR_LIMITS[:1]
+        for entry_chars in limits:
+            messages = _build_prompt(agent_name, summary.text, entries, entry_chars)
+            if estimate_message_tokens(messages) <= budget:
+                return cutoff, entries, messages
+        if batch_requests == 1:
+            return cutoff, entries, messages
+        batch_requests = max(batch_requests // 2, 1)
+
+
+async def summarize_execution_log(agent_name: str) -> bool:
+    """Fold the agent's oldest unsummarized requests into its summary; True if it ran."""
+    settings = get_settings()
+    threshold = settings.execution_summary_threshold
+    if threshold <= 0:
+        return False
+
+    log_store = get_execution_agent_logs()
+    summary = log_store.load_summary(agent_name)
+    total = log_store.request_count(agent_name)
+    tail = max(settings.execution_summary_tail_requests, 0)
+    unsummarized = total - summary.summarized_requests
+    if unsummarized < threshold + tail:
+        return False
+
+    budget = message_budget(settings.summarizer_model, system=_SYSTEM_PROMPT)
+    cutoff, entries, messages = _fit_batch(agent_name, summary, threshold, budget)
+
+    logger.info(
+        "execution summarization started",
+        extra={
+            "agent": agent_name,
+            "requests_total": total,
+            "unsummarized": unsummarized,
+            "batch_requests": cutoff - summary.summarized_requests,
+            "batch_entries": len(entries),
+        },
+    )
+
+    try:
+        response = await request_chat_completion(
+            model=settings.summarizer_model,
+            messages=messages,
+            system=_SYSTEM_PROMPT,
+            api_key=settings.gemini_api_key,
+            priority=Priority.SUMMARIZER,
+            caller="execution_summarizer",
+            cache_ttl=settings.summarizer_cache_ttl_seconds,
+        )
+    except LLMError as exc:
+        logger.error(
+            "execution summarization failed",
+            extra={"agent": agent_name, "error": str(exc)},
+        )
+        raise
+
+    choices = response.get("choices") or []
+    content = ((choices[0].get("message") or {}).get("content") or "").strip() if choices else ""
+    if not content:
+        raise LLMError("LLM response missing content")
+
+    log_store.write_summary(
+        agent_name,
+        ExecutionSummary(
+            text=content,
+            summarized_requests=cutoff,
+            updated_at=datetime.now(timezone.utc),
+        ),
+    )
+    logger.info(
+        "execution summarization completed",
+        extra={"agent": agent_name, "summarized_requests": cutoff, "remaining": total - cutoff},
+    )
+    return True
+
+
+_pending: Set[str] = set()
+_running: Optional[asyncio.Task] = None
+# agent -> (consecutive failures, time.monotonic() before which it is not retried)
+_failures: Dict[str, Tuple[int, float]] = {}
+
+
+def schedule_execution_summarization(agent_name: str) -> None:
+    """Queue a background summarization pass for ``agent_name`` if not already queued."""
+    global _running
+    failure = _failures.get(agent_name)
+    if failure is not None and failure[1] > time.monotonic():
+        return
+    _pending.add(agent_name)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.debug("execution summarization skipped (no running event loop)")
+        return
+
+    if _running is None or _running.done():
+        _running = loop.create_task(_run_worker())
+
+
+async def _run_worker() -> None:
+    # One agent at a time; an agent far behind is summarized batch by batch
+    while _pending:
+        agent_name = _pending.pop()
+        try:
+            while await summarize_execution_log(agent_name):
+                pass
+        except Exception as exc:
+            failures = _failures.get(agent_name, (0, 0.0))[0] + 1
+            delay = min(_RETRY_BASE_SECONDS * 2 ** (failures - 1), _RETRY_MAX_SECONDS)
+            _failures[agent_name] = (failures, time.monotonic() + delay)
+            logger.error(
+                "execution summarization worker failed",
+                extra={"agent": agent_name, "error": str(exc), "failures": failures, "retry_in_seconds": delay},
+            )
+        else:
+            _failures.pop(agent_name, None)
+
+
+__all__ = ["schedule_execution_summarization", "summarize_execution_log"]
@@ -6,8 +6,10 @@ import asyncio
 from datetime import datetime, timezone
 from typing import Optional, Set
 
-from ..agents.execution_agent.batch_manager import ExecutionBatchManager
+from ..agents.execution_agent.batch_manager import get_execution_batch_manager
+from ..agents.execution_agent.pool import ExecutionRejected
 from ..agents.execution_agent.runtime import ExecutionResult
+from ..llm import Priority
 from ..logging_config import logger
 from .triggers import TriggerRecord, get_trigger_service
 
@@ -71,9 +73,17 @@ class TriggerScheduler:
         if not due_triggers:
             return
 
-        for trigger in due_triggers:
+        manager = get_execution_batch_manager()
+        for index, trigger in enumerate(due_triggers):
             if trigger.id in self._in_flight:
                 continue
+            if not manager.can_accept(Priority.TRIGGER):
+                # Leave the rest due; they are picked up again on a later poll
+                logger.warning(
+                    "Execution pool saturated; deferring due triggers",
+                    extra={"deferred": len(due_triggers) - index},
+                )
+                break
             self._in_flight.add(trigger.id)
             asyncio.create_task(self._execute_trigger(trigger), name=f"trigger-{trigger.id}")
 
@@ -89,16 +99,25 @@ class TriggerScheduler:
                     "scheduled_for": trigger.next_trigger,
                 },
             )
-            execution_manager = ExecutionBatchManager()
-            result = await execution_manager.execute_agent(
+            result = await get_execution_batch_manager().execute_agent(
                 trigger.agent_name,
                 instructions,
+                priority=Priority.TRIGGER,
+                batch_key=f"trigger:{trigger.id}",
+                # One job per scheduled occurrence, so a re-fire after a restart adopts it
+                idempotency_key=f"trigger:{trigger.id}:{trigger.next_trigger}",
             )
             if result.success:
                 self._handle_success(trigger, fired_at)
             else:
                 error_text = result.error or result.response
                 self._handle_failure(trigger, fired_at, error_text)
+        except ExecutionRejected as exc:
+            # Not run at all: keep it due so a later poll retries it
+            logger.warning(
+                "Trigger deferred",
+                extra={"trigger_id": trigger.id, "agent": trigger.agent_name, "reason": str(exc)},
+            )
         except Exception as exc:  # pragma: no cover - defensive
             self._handle_failure(trigger, _utc_now(), str(exc))
             logger.exception(
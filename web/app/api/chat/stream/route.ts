@@ -0,0 +1,48 @@
+export const runtime = 'nodejs';
+
+type ChatMessage = { role: string; content: string };
+
+export async function POST(req: Request) {
+  let body: any;
+  try {
+    body = await req.json();
+  } catch (e) {
+    console.error('[chat-stream-proxy] invalid json', e);
+    return new Response('Invalid JSON', { status: 400 });
+  }
+
+  const { messages } = body || {};
+  if (!Array.isArray(messages) || messages.length === 0) {
+    return new Response('Missing messages', { status: 400 });
+  }
+
+  const serverBase = process.env.PY_SERVER_URL || 'http://localhost:8001';
+  const serverPath = process.env.PY_CHAT_STREAM_PATH || '/api/v1/chat/stream';
+  const url = `${serverBase.replace(/\/$/, '')}${serverPath}`;
+
+  const payload = {
+    system: '',
+    messages: messages
+      .filter((m: any) => typeof m?.role === 'string')
+      .map((m: any): ChatMessage => ({ role: m.role, content: typeof m.content === 'string' ? m.content : '' })),
+    stream: true,
+  };
+
+  try {
+    const upstream = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(payload),
+    });
+    return new Response(upstream.body, {
+      status: upstream.status,
+      headers: {
+        'Content-Type': upstream.headers.get('content-type') || 'text/event-stream',
+        'Cache-Control': 'no-cache',
+      },
+    });
+  } catch (e: any) {
+    console.error('[chat-stream-proxy] upstream error', e);
+    return new Response(e?.message || 'Upstream error', { status: 502 });
+  }
+}
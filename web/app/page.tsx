@@ -1,6 +1,6 @@
 'use client';
 
-import { useCallback, useEffect, useState, useMemo } from 'react';
+import { useCallback, useEffect, useRef, useState, useMemo } from 'react';
 import SettingsModal, { useSettings } from '@/components/SettingsModal';
 import SupportHistory from '@/components/SupportHistory';
 import OverridesPanel, { Overrides } from '@/components/OverridesPanel';
@@ -61,6 +61,24 @@ const formatEscapeCharacters = (text: string): string => {
     .replace(/\\\\/g, '\\');
 };
 
+type StreamEvent = { event: string; data: any };
+
+// Parse one server-sent event frame ("event: x\ndata: {...}")
+const parseSseFrame = (frame: string): StreamEvent | null => {
+  let event = 'message';
+  const dataLines: string[] = [];
+  for (const line of frame.split('\n')) {
+    if (line.startsWith('event:')) event = line.slice(6).trim();
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+  }
+  if (dataLines.length === 0) return null;
+  try {
+    return { event, data: JSON.parse(dataLines.join('\n')) };
+  } catch {
+    return null;
+  }
+};
+
 const isRenderableMessage = (entry: any) =>
   typeof entry?.role === 'string' &&
   typeof entry?.content === 'string' &&
@@ -155,6 +173,7 @@ export default function Page() {
   const [messages, setMessages] = useState<ChatBubble[]>([]);
   const [error, setError] = useState<string | null>(null);
   const [isWaitingForResponse, setIsWaitingForResponse] = useState(false);
+  const streamingRef = useRef(false);
   const [activeTab, setActiveTab] = useState<TabType>('ai-support');
   const [ringStatus, setRingStatus] = useState<RingStatus | null>(null);
   const [ringStatusLoading, setRingStatusLoading] = useState(true);
@@ -390,6 +409,8 @@ export default function Page() {
   }, [loadRingStatus]);
 
   const loadHistory = useCallback(async () => {
+    // Skip background refreshes while a streamed reply is being rendered
+    if (streamingRef.current) return;
     try {
       const res = await fetch('/api/chat/history', { cache: 'no-store' });
       if (!res.ok) return;
@@ -447,6 +468,76 @@ export default function Page() {
   const canSubmit = input.trim().length > 0;
   const inputPlaceholder = 'Ask about your ring, health data, or get support...';
 
+  // Stream the reply over SSE; returns false when streaming is unavailable
+  const streamReply = useCallback(async (text: string): Promise<boolean> => {
+    let res: Response;
+    try {
+      res = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ messages: [{ role: 'user', content: text }] }),
+      });
+    } catch {
+      return false;
+    }
+    if (!res.ok || !res.body) return false;
+
+    streamingRef.current = true;
+    let bubbleId = `assistant-stream-${Date.now()}`;
+    let draft = '';
+
+    const upsertDraft = (value: string) => {
+      const bubble: ChatBubble = { id: bubbleId, role: 'assistant', text: formatEscapeCharacters(value) };
+      setMessages(prev => {
+        const index = prev.findIndex(msg => msg.id === bubble.id);
+        if (index === -1) return [...prev, bubble];
+        const next = [...prev];
+        next[index] = bubble;
+        return next;
+      });
+    };
+
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    try {
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n');
+
+        let boundary = buffer.indexOf('\n\n');
+        while (boundary !== -1) {
+          const parsed = parseSseFrame(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf('\n\n');
+          if (!parsed) continue;
+
+          if (parsed.event === 'delta') {
+            draft += parsed.data?.text || '';
+            upsertDraft(draft);
+            setIsWaitingForResponse(false);
+          } else if (parsed.event === 'message') {
+            upsertDraft(parsed.data?.text || '');
+            setIsWaitingForResponse(false);
+            // Each user-facing message gets its own bubble
+            bubbleId = `assistant-stream-${Date.now()}`;
+            draft = '';
+          } else if (parsed.event === 'error') {
+            setError(parsed.data?.error || 'Failed to generate a response');
+          }
+        }
+      }
+    } catch (err) {
+      console.error('Chat stream interrupted', err);
+    } finally {
+      streamingRef.current = false;
+      setIsWaitingForResponse(false);
+      await loadHistory();
+    }
+    return true;
+  }, [loadHistory]);
+
   const sendMessage = useCallback(
     async (text: string) => {
       const trimmed = text.trim();
@@ -462,6 +553,8 @@ export default function Page() {
       };
       setMessages(prev => [...prev, userMessage]);
 
+      if (await streamReply(trimmed)) return;
+
       try {
         const res = await fetch('/api/chat', {
           method: 'POST',
@@ -519,7 +612,7 @@ export default function Page() {
         setTimeout(pollForAssistantResponse, 1000);
       }
     },
-    [loadHistory],
+    [loadHistory, streamReply],
   );
 
   const handleClearHistory = useCallback(async () => {